@@ -5,12 +5,25 @@
 
 import errno
 import os
+import random
 import socket
 import sys
 import time
 from datetime import datetime
 from types import TracebackType
-from typing import IO, Any, Callable, ContextManager, Dict, Generator, Optional, Tuple, Type, Union
+from typing import (
+    IO,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 from llnl.util import lang, tty
 
@@ -32,6 +45,10 @@
     "LockPermissionError",
     "LockROFileError",
     "CantCreateLockError",
+    "LockStatistics",
+    "enable_statistics",
+    "disable_statistics",
+    "set_polling",
 ]
 
 
@@ -173,6 +190,127 @@ def _attempts_str(wait_time, nattempts):
     return " after {} and {}".format(lang.pretty_seconds(wait_time), attempts)
 
 
+#: Schemes for the intervals between attempts to take a contended lock
+POLLING_SCHEMES = ("fixed", "adaptive")
+
+#: Scheme used by all the locks of this process, see ``set_polling()``
+_polling = "fixed"
+
+
+def set_polling(scheme: str) -> None:
+    """Set how locks poll a contended lock file.
+
+    With ``"fixed"`` polling, all the processes waiting on a lock poll it at the same,
+    stepwise increasing, intervals. With ``"adaptive"`` polling, intervals grow
+    exponentially with random jitter, so that waiting processes do not poll in
+    lockstep, and the longer they wait the less often they poll. This reduces the
+    number of ``fcntl`` calls hitting network filesystems under heavy contention.
+    """
+    global _polling
+    if scheme not in POLLING_SCHEMES:
+        raise ValueError(f"unknown lock polling scheme: {scheme}")
+    _polling = scheme
+
+
+class LockRecord:
+    """Wait and hold times of the acquisitions of a single lock."""
+
+    def __init__(self, desc: str) -> None:
+        self.desc = desc
+        #: acquisitions of the underlying POSIX lock, including upgrades and downgrades
+        self.acquired = 0
+        #: acquisitions that needed more than one attempt
+        self.contended = 0
+        self.attempts = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.hold_time = 0.0
+        self.max_hold_time = 0.0
+        #: number of contended acquisitions, per holder of the lock ("pid@host")
+        self.holders: Dict[str, int] = {}
+
+    def waited(self, wait_time: float, nattempts: int, holder: Optional[str]) -> None:
+        self.attempts += nattempts
+        self.wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+        if nattempts > 1:
+            self.contended += 1
+            if holder:
+                self.holders[holder] = self.holders.get(holder, 0) + 1
+
+    def held(self, hold_time: float) -> None:
+        self.hold_time += hold_time
+        self.max_hold_time = max(self.max_hold_time, hold_time)
+
+
+class LockStatistics:
+    """Statistics on the locks taken by a process, see ``enable_statistics()``.
+
+    Locks are identified by their path and byte range.
+    """
+
+    def __init__(self) -> None:
+        self.locks: Dict[Tuple[str, int, int], LockRecord] = {}
+
+    def record(self, lock: "Lock") -> LockRecord:
+        """Return the record of a lock, creating it if needed."""
+        key = (lock.path, lock._start, lock._length)
+        record = self.locks.get(key)
+        if record is None:
+            record = self.locks[key] = LockRecord(lock.desc.strip(" ()"))
+        return record
+
+    def report(self) -> List[str]:
+        """Lines of a report on the locks, the longest waited on first."""
+        lines = []
+        records = sorted(self.locks.items(), key=lambda item: item[1].wait_time, reverse=True)
+        for (path, start, length), rec in records:
+            desc = f" ({rec.desc})" if rec.desc else ""
+            lines.append(f"{path}[{start}:{length}]{desc}")
+            lines.append(
+                f"    acquired {plural(rec.acquired, 'time')}, {rec.contended} contended, "
+                f"in {plural(rec.attempts, 'attempt')}, {plural(rec.timeouts, 'timeout')}"
+            )
+            lines.append(
+                f"    waited {lang.pretty_seconds(rec.wait_time)} "
+                f"(max {lang.pretty_seconds(rec.max_wait_time)}), "
+                f"held {lang.pretty_seconds(rec.hold_time)} "
+                f"(max {lang.pretty_seconds(rec.max_hold_time)})"
+            )
+            for holder, count in sorted(rec.holders.items(), key=lambda item: -item[1]):
+                lines.append(f"    held by {holder} in {plural(count, 'contended acquisition')}")
+        return lines
+
+
+#: Statistics of the locks of this process, when enabled
+_statistics: Optional[LockStatistics] = None
+
+
+def enable_statistics() -> LockStatistics:
+    """Start recording, for every lock taken by this process, the time spent waiting
+    for it and holding it, the number of attempts to take it and, for whole file locks,
+    the processes holding it while it was waited on.
+
+    To identify holders, exclusive whole file locks write the pid and host of their
+    process in the lock file, as they do in debug mode.
+
+    Return:
+        the statistics, which are updated until ``disable_statistics()`` is called
+    """
+    global _statistics
+    if _statistics is None:
+        _statistics = LockStatistics()
+    return _statistics
+
+
+def disable_statistics() -> Optional[LockStatistics]:
+    """Stop recording lock statistics, and return those recorded so far, if any."""
+    global _statistics
+    statistics, _statistics = _statistics, None
+    return statistics
+
+
 class LockType:
     READ = 0
     WRITE = 1
@@ -268,6 +406,9 @@ def __init__(
         self.host: Optional[str] = None
         self.old_host: Optional[str] = None
 
+        # when the POSIX lock was taken (only used with lock statistics)
+        self._acquired_at: Optional[float] = None
+
     @staticmethod
     def _poll_interval_generator(
         _wait_times: Optional[Tuple[float, float, float]] = None
@@ -294,6 +435,25 @@ def _poll_interval_generator(
             num_requests += 1
             yield wait_time
 
+    @staticmethod
+    def _adaptive_poll_interval_generator(
+        _bounds: Optional[Tuple[float, float]] = None, _random: Optional[random.Random] = None
+    ) -> Generator[float, None, None]:
+        """This implements a backoff scheme with "decorrelated jitter" for polling a
+        contended resource.
+
+        Each suggested wait time is drawn uniformly between the minimum (.01s) and
+        three times the previous one, and is at most 2 seconds. Short waits are thus
+        detected quickly, while processes waiting for a long time poll rarely, and
+        at different times from each other.
+        """
+        lower, upper = _bounds or (1e-2, 2.0)
+        rng = _random or random.Random()
+        wait_time = lower
+        while True:
+            wait_time = min(upper, rng.uniform(lower, 3 * wait_time))
+            yield wait_time
+
     def __repr__(self) -> str:
         """Formal representation of the lock."""
         rep = "{0}(".format(self.__class__.__name__)
@@ -340,26 +500,73 @@ def _lock(self, op: int, timeout: Optional[float] = None) -> Tuple[float, int]:
             )
         )
 
-        poll_intervals = iter(Lock._poll_interval_generator())
+        if _polling == "adaptive":
+            poll_intervals = iter(Lock._adaptive_poll_interval_generator())
+        else:
+            poll_intervals = iter(Lock._poll_interval_generator())
         start_time = time.time()
         num_attempts = 0
+        holder = None
         while (not timeout) or (time.time() - start_time) < timeout:
             num_attempts += 1
             if self._poll_lock(op):
                 total_wait_time = time.time() - start_time
+                self._record_acquired(total_wait_time, num_attempts, holder)
                 return total_wait_time, num_attempts
 
+            if num_attempts == 1 and _statistics is not None:
+                holder = self._read_holder()
             time.sleep(next(poll_intervals))
 
         # TBD: Is an extra attempt after timeout needed/appropriate?
         num_attempts += 1
         if self._poll_lock(op):
             total_wait_time = time.time() - start_time
+            self._record_acquired(total_wait_time, num_attempts, holder)
             return total_wait_time, num_attempts
 
         total_wait_time = time.time() - start_time
+        if _statistics is not None:
+            record = _statistics.record(self)
+            record.waited(total_wait_time, num_attempts, holder)
+            record.timeouts += 1
         raise LockTimeoutError(op_str.lower(), self.path, total_wait_time, num_attempts)
 
+    def _record_acquired(self, wait_time: float, nattempts: int, holder: Optional[str]) -> None:
+        """Record a successful acquisition in the lock statistics, if enabled."""
+        if _statistics is None:
+            return
+        record = _statistics.record(self)
+        record.acquired += 1
+        record.waited(wait_time, nattempts, holder)
+
+        # upgrades and downgrades do not release the lock in between
+        if self._acquired_at is None:
+            self._acquired_at = time.monotonic()
+
+    def _record_released(self) -> None:
+        """Record how long the lock was held in the lock statistics, if enabled."""
+        acquired_at, self._acquired_at = self._acquired_at, None
+        if _statistics is not None and acquired_at is not None:
+            _statistics.record(self).held(time.monotonic() - acquired_at)
+
+    def _whole_file(self) -> bool:
+        return self._start == 0 and self._length == 0
+
+    def _read_holder(self) -> Optional[str]:
+        """Return the pid and host written in the lock file by its holder, if any.
+
+        Only whole file locks are considered, as byte range locks share their file."""
+        if self._file is None or not self._whole_file():
+            return None
+        try:
+            self._file.seek(0)
+            line = self._file.read(256)
+            pid, host = line.strip().split(",")
+            return "{0}@{1}".format(pid.rpartition("=")[2], host.rpartition("=")[2])
+        except (OSError, ValueError):
+            return None
+
     def _poll_lock(self, op: int) -> bool:
         """Attempt to acquire the lock in a non-blocking manner. Return whether
         the locking attempt succeeds
@@ -390,6 +597,10 @@ def _poll_lock(self, op: int) -> bool:
                 if module_op == fcntl.LOCK_EX:
                     self._write_log_debug_data()
 
+            # statistics need the PID/host of holders of contended locks
+            elif _statistics is not None and module_op == fcntl.LOCK_EX and self._whole_file():
+                self._write_log_debug_data()
+
             return True
 
         except IOError as e:
@@ -456,6 +667,7 @@ def _unlock(self) -> None:
         """
         assert self._file is not None, "cannot unlock without the file being set"
         fcntl.lockf(self._file.fileno(), fcntl.LOCK_UN, self._length, self._start, os.SEEK_SET)
+        self._record_released()
         FILE_TRACKER.release_by_fh(self._file)
         self._file = None
         self._reads = 0
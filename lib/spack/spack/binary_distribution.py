@@ -1304,6 +1304,41 @@ def _delete_staged_downloads(download_result):
     download_result["specfile_stage"].destroy()
 
 
+def _check_tarball_checksum(download_result, tarfile_path: str, expected: str) -> None:
+    """Raise NoChecksumException, and clean up the downloads, if the sha256 checksum
+    of a downloaded tarball does not match the expected one."""
+    local_checksum = spack.util.crypto.checksum(hashlib.sha256, tarfile_path)
+
+    # if the checksums don't match don't install
+    if local_checksum != expected:
+        size, contents = fsys.filesummary(tarfile_path)
+        _delete_staged_downloads(download_result)
+        raise NoChecksumException(tarfile_path, size, contents, "sha256", expected, local_checksum)
+
+
+def verify_download(download_result) -> None:
+    """Verify the checksum of a tarball obtained with ``download_tarball`` ahead of its
+    extraction, so that ``extract_tarball`` does not need to do it again.
+
+    Only tarballs in the current build cache layouts can be verified ahead of time,
+    older ones are still verified at extraction.
+
+    Raises:
+        NoChecksumException: if the checksum of the tarball is wrong
+    """
+    spec_dict, layout_version = _get_valid_spec_file(
+        download_result["specfile_stage"].save_filename, CURRENT_BUILD_CACHE_LAYOUT_VERSION
+    )
+    if layout_version < 1:
+        return
+    _check_tarball_checksum(
+        download_result,
+        download_result["tarball_stage"].save_filename,
+        spec_dict["binary_cache_checksum"]["hash"],
+    )
+    download_result["checksum_verified"] = True
+
+
 def _get_valid_spec_file(path: str, max_supported_layout: int) -> Tuple[Dict, int]:
     """Read and validate a spec file, returning the spec dict with its layout version, or raising
     InvalidMetadataFile if invalid."""
@@ -1862,17 +1897,9 @@ def extract_tarball(spec, download_result, force=False, timer=timer.NULL_TIMER):
                 "or configure the mirror with signed: false."
             )
 
-        # compute the sha256 checksum of the tarball
-        local_checksum = spack.util.crypto.checksum(hashlib.sha256, tarfile_path)
-        expected = bchecksum["hash"]
-
-        # if the checksums don't match don't install
-        if local_checksum != expected:
-            size, contents = fsys.filesummary(tarfile_path)
-            _delete_staged_downloads(download_result)
-            raise NoChecksumException(
-                tarfile_path, size, contents, "sha256", expected, local_checksum
-            )
+        # compute the sha256 checksum of the tarball, unless already verified
+        if not download_result.get("checksum_verified"):
+            _check_tarball_checksum(download_result, tarfile_path, bchecksum["hash"])
     try:
         with closing(tarfile.open(tarfile_path, "r")) as tar:
             # Remove install prefix from tarfil to extract directly into spec.prefix
@@ -35,15 +35,17 @@
 import inspect
 import io
 import multiprocessing
+import multiprocessing.connection
 import os
 import re
+import signal
 import sys
 import traceback
 import types
 from collections import defaultdict
 from enum import Flag, auto
 from itertools import chain
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 import llnl.util.tty as tty
 from llnl.string import plural
@@ -1128,7 +1130,7 @@ def _setup_pkg_and_run(
 
         pkg = serialized_pkg.restore()
 
-        if not kwargs.get("fake", False):
+        if not kwargs.get("fake", False) and kwargs.get("setup_env", True):
             kwargs["unmodified_env"] = os.environ.copy()
             kwargs["env_modifications"] = setup_package(
                 pkg, dirty=kwargs.get("dirty", False), context=Context.from_string(context)
@@ -1196,78 +1198,286 @@ def _setup_pkg_and_run(
             input_multiprocess_fd.close()
 
 
-def start_build_process(pkg, function, kwargs):
-    """Create a child process to do part of a spack build.
+class ProcessHandle:
+    """Handle on a build child process started by :func:`spawn_build_process`.
 
-    Args:
+    The parent process can poll the handle to find out whether the child has
+    sent back its result, and must call :meth:`complete` exactly once to
+    collect the result (or raise the child's error) and reap the process.
+    """
 
-        pkg (spack.package_base.PackageBase): package whose environment we should set up the
-            child process for.
-        function (typing.Callable): argless function to run in the child
-            process.
+    def __init__(self, pkg, process, read_pipe):
+        self.pkg = pkg
+        self.process = process
+        self.read_pipe = read_pipe
+
+    def poll(self) -> bool:
+        """Return ``True`` if the child has sent its result or has exited."""
+        return self.read_pipe.poll() or not self.process.is_alive()
+
+    def terminate(self) -> None:
+        """Terminate the child process, if it is still running."""
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.read_pipe.close()
+
+    def complete(self):
+        """Wait for the child to finish and return its result.
+
+        Raises:
+            StopPhase: if the child stopped the build early on request
+            ChildError: if the build failed in the child process
+            InstallError: if the child process died unexpectedly
+        """
+        p = self.process
 
-    Usage::
+        def exitcode_msg(p):
+            typ = "exit" if p.exitcode >= 0 else "signal"
+            return f"{typ} {abs(p.exitcode)}"
 
-        def child_fun():
-            # do stuff
-        build_env.start_build_process(pkg, child_fun)
+        try:
+            child_result = self.read_pipe.recv()
+        except EOFError:
+            p.join()
+            raise InstallError(f"The process has stopped unexpectedly ({exitcode_msg(p)})")
+        finally:
+            self.read_pipe.close()
 
-    The child process is run with the build environment set up by
-    spack.build_environment.  This allows package authors to have full
-    control over the environment, etc. without affecting other builds
-    that might be executed in the same spack call.
+        p.join()
 
-    If something goes wrong, the child process catches the error and
-    passes it to the parent wrapped in a ChildError.  The parent is
-    expected to handle (or re-raise) the ChildError.
+        # If returns a StopPhase, raise it
+        if isinstance(child_result, StopPhase):
+            # do not print
+            raise child_result
+
+        # let the caller know which package went wrong.
+        if isinstance(child_result, InstallError):
+            child_result.pkg = self.pkg
+
+        if isinstance(child_result, ChildError):
+            # If the child process raised an error, print its output here rather
+            # than waiting until the call to SpackError.die() in main(). This
+            # allows exception handling output to be logged from within Spack.
+            # see spack.main.SpackCommand.
+            child_result.print_context()
+            raise child_result
+
+        # Fallback. Usually caught beforehand in EOFError above.
+        if p.exitcode != 0:
+            raise InstallError(f"The process failed unexpectedly ({exitcode_msg(p)})")
+
+        return child_result
+
+
+def _serve_build_processes(test_state, requests, requests_write) -> None:
+    """Main loop of the process of a :class:`BuildProcessServer`, forking a build
+    process for each request, and reporting its exit code once it is done."""
+    # Only the client may write requests, so that the server stops when it is closed
+    requests_write.close()
+
+    # Interrupts are handled by the installer, which terminates the build processes
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    test_state.restore()
+
+    # Load what every build process needs, so that they inherit it
+    import spack.package  # noqa: F401
+
+    spack.repo.PATH.provider_index
+    spack.repo.PATH.tag_index
+    spack.repo.PATH.patch_index
+
+    fork = multiprocessing.get_context("fork")
+    children: Dict[int, Tuple[multiprocessing.process.BaseProcess, object]] = {}
+    while True:
+        ready = multiprocessing.connection.wait([requests, *children])
+        for sentinel in ready:
+            if sentinel is requests:
+                continue
+            process, status = children.pop(sentinel)
+            process.join()
+            status.send(process.exitcode)
+            status.close()
 
-    This uses `multiprocessing.Process` to create the child process. The
-    mechanism used to create the process differs on different operating
-    systems and for different versions of Python. In some cases "fork"
-    is used (i.e. the "fork" system call) and some cases it starts an
-    entirely new Python interpreter process (in the docs this is referred
-    to as the "spawn" start method). Breaking it down by OS:
+        if requests not in ready:
+            continue
+        try:
+            args, status = requests.recv()
+        except EOFError:
+            break
+        process = fork.Process(target=_run_served_build_process, args=args)
+        process.start()
+        status.send(process.pid)
+        children[process.sentinel] = (process, status)
+
+        # The build process owns the pipes and file descriptors now
+        for arg in args[3:]:
+            if arg is not None:
+                arg.close()
+
+    for process, status in children.values():
+        process.join()
+        status.send(process.exitcode)
+        status.close()
+
+
+def _run_served_build_process(*args) -> None:
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    _setup_pkg_and_run(*args)
+
+
+class _ServedProcess:
+    """Build process forked by a :class:`BuildProcessServer`, with the part of the
+    ``multiprocessing.Process`` interface used by :class:`ProcessHandle`."""
+
+    def __init__(self, status):
+        self.status = status
+        try:
+            self.pid = status.recv()
+        except EOFError:
+            status.close()
+            raise InstallError("The build process server has stopped unexpectedly")
+        self.exitcode: Optional[int] = None
+
+    def _update(self, block: bool) -> None:
+        if self.exitcode is not None or not (block or self.status.poll()):
+            return
+        try:
+            self.exitcode = self.status.recv()
+        except EOFError:
+            self.exitcode = -signal.SIGKILL
+        self.status.close()
 
-    - Linux always uses fork.
-    - Mac OS uses fork before Python 3.8 and "spawn" for 3.8 and after.
-    - Windows always uses the "spawn" start method.
+    def is_alive(self) -> bool:
+        self._update(block=False)
+        return self.exitcode is None
 
-    For more information on `multiprocessing` child process creation
-    mechanisms, see https://docs.python.org/3/library/multiprocessing.html#contexts-and-start-methods
+    def join(self) -> None:
+        self._update(block=True)
+
+    def terminate(self) -> None:
+        if self.is_alive():
+            try:
+                os.kill(self.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+class BuildProcessServer:
+    """Warm process forking build processes on request, like a ``forkserver``.
+
+    Spack modules, configuration and repository indexes are loaded once, by the
+    server, rather than by every build process, which is especially costly when
+    build processes are spawned rather than forked. Each build process is still a
+    fresh fork of the server, so that builds are isolated from each other.
+
+    The server captures the state of the calling process when it is created. The
+    configuration and the environment variables are sent again with each request,
+    so that builds see the changes made since then, e.g. compilers added to the
+    configuration by earlier builds.
+    """
+
+    def __init__(self):
+        read, self.requests = multiprocessing.Pipe(duplex=False)
+        self.process = multiprocessing.Process(
+            target=_serve_build_processes,
+            args=(spack.subprocess_context.TestState(), read, self.requests),
+        )
+        self.process.start()
+        read.close()
+
+    def start(self, args: tuple) -> _ServedProcess:
+        """Fork a build process running ``_setup_pkg_and_run(*args)``."""
+        status_read, status_write = multiprocessing.Pipe(duplex=False)
+        try:
+            self.requests.send((args, status_write))
+        except OSError as e:
+            raise InstallError(f"The build process server has stopped unexpectedly: {e}")
+        finally:
+            status_write.close()
+        return _ServedProcess(status_read)
+
+    def close(self) -> None:
+        """Stop the server, once the build processes it started are done."""
+        self.requests.close()
+        self.process.join()
+
+
+def use_build_process_server() -> bool:
+    """Whether builds should be forked by a :class:`BuildProcessServer`. By default
+    only when build processes would otherwise be spawned, not forked."""
+    if sys.platform == "win32":
+        return False
+    default = multiprocessing.get_start_method() != "fork"
+    return spack.config.get("config:warm_build_processes", default)
+
+
+def spawn_build_process(
+    pkg, function, kwargs, forward_stdin=True, server: Optional[BuildProcessServer] = None
+) -> ProcessHandle:
+    """Create a child process to do part of a spack build, without waiting for it.
+
+    This is the non-blocking counterpart of :func:`start_build_process`, which
+    allows the caller to keep several builds in flight at once.
+
+    Args:
+
+        pkg (spack.package_base.PackageBase): package whose environment we should set up the
+            child process for.
+        function (typing.Callable): argless function to run in the child
+            process.
+        kwargs (dict): arguments forwarded to ``function``. The build environment is set
+            up in the child process unless ``kwargs["setup_env"]`` is ``False``
+        forward_stdin (bool): whether the child may read from the terminal, e.g. to toggle
+            verbosity. Only one child at a time should be given the terminal.
+        server: server forking the child process, if any, instead of this process
+
+    Returns:
+        handle on the child process, whose ``complete()`` method returns the result
     """
     read_pipe, write_pipe = multiprocessing.Pipe(duplex=False)
     input_multiprocess_fd = None
     jobserver_fd1 = None
     jobserver_fd2 = None
 
-    serialized_pkg = spack.subprocess_context.PackageInstallContext(pkg)
+    # A server restored the global state already, for all its build processes
+    serialized_pkg = spack.subprocess_context.PackageInstallContext(
+        pkg, global_state=server is None
+    )
 
     try:
         # Forward sys.stdin when appropriate, to allow toggling verbosity
-        if sys.platform != "win32" and sys.stdin.isatty() and hasattr(sys.stdin, "fileno"):
+        if (
+            forward_stdin
+            and sys.platform != "win32"
+            and sys.stdin.isatty()
+            and hasattr(sys.stdin, "fileno")
+        ):
             input_fd = os.dup(sys.stdin.fileno())
             input_multiprocess_fd = MultiProcessFd(input_fd)
         mflags = os.environ.get("MAKEFLAGS", False)
         if mflags:
-            m = re.search(r"--jobserver-[^=]*=(\d),(\d)", mflags)
+            m = re.search(r"--jobserver-[^=]*=(\d+),(\d+)", mflags)
             if m:
-                jobserver_fd1 = MultiProcessFd(int(m.group(1)))
-                jobserver_fd2 = MultiProcessFd(int(m.group(2)))
-
-        p = multiprocessing.Process(
-            target=_setup_pkg_and_run,
-            args=(
-                serialized_pkg,
-                function,
-                kwargs,
-                write_pipe,
-                input_multiprocess_fd,
-                jobserver_fd1,
-                jobserver_fd2,
-            ),
+                # Pass duplicates, so that the jobserver stays open in the parent
+                # for the builds started after this one.
+                jobserver_fd1 = MultiProcessFd(os.dup(int(m.group(1))))
+                jobserver_fd2 = MultiProcessFd(os.dup(int(m.group(2))))
+
+        args = (
+            serialized_pkg,
+            function,
+            kwargs,
+            write_pipe,
+            input_multiprocess_fd,
+            jobserver_fd1,
+            jobserver_fd2,
         )
-
-        p.start()
+        if server:
+            p = server.start(args)
+        else:
+            p = multiprocessing.Process(target=_setup_pkg_and_run, args=args)
+            p.start()
 
         # We close the writable end of the pipe now to be sure that p is the
         # only process which owns a handle for it. This ensures that when p
@@ -1280,44 +1490,55 @@ def child_fun():
         raise
 
     finally:
-        # Close the input stream in the parent process
-        if input_multiprocess_fd is not None:
-            input_multiprocess_fd.close()
+        # Close the input stream and the jobserver duplicates in the parent process
+        for multiprocess_fd in (input_multiprocess_fd, jobserver_fd1, jobserver_fd2):
+            if multiprocess_fd is not None:
+                multiprocess_fd.close()
 
-    def exitcode_msg(p):
-        typ = "exit" if p.exitcode >= 0 else "signal"
-        return f"{typ} {abs(p.exitcode)}"
+    return ProcessHandle(pkg, p, read_pipe)
 
-    try:
-        child_result = read_pipe.recv()
-    except EOFError:
-        p.join()
-        raise InstallError(f"The process has stopped unexpectedly ({exitcode_msg(p)})")
 
-    p.join()
+def start_build_process(pkg, function, kwargs, server: Optional[BuildProcessServer] = None):
+    """Create a child process to do part of a spack build.
 
-    # If returns a StopPhase, raise it
-    if isinstance(child_result, StopPhase):
-        # do not print
-        raise child_result
+    Args:
 
-    # let the caller know which package went wrong.
-    if isinstance(child_result, InstallError):
-        child_result.pkg = pkg
+        pkg (spack.package_base.PackageBase): package whose environment we should set up the
+            child process for.
+        function (typing.Callable): argless function to run in the child
+            process.
+        server: server forking the child process, if any, instead of this process
 
-    if isinstance(child_result, ChildError):
-        # If the child process raised an error, print its output here rather
-        # than waiting until the call to SpackError.die() in main(). This
-        # allows exception handling output to be logged from within Spack.
-        # see spack.main.SpackCommand.
-        child_result.print_context()
-        raise child_result
+    Usage::
 
-    # Fallback. Usually caught beforehand in EOFError above.
-    if p.exitcode != 0:
-        raise InstallError(f"The process failed unexpectedly ({exitcode_msg(p)})")
+        def child_fun():
+            # do stuff
+        build_env.start_build_process(pkg, child_fun)
 
-    return child_result
+    The child process is run with the build environment set up by
+    spack.build_environment.  This allows package authors to have full
+    control over the environment, etc. without affecting other builds
+    that might be executed in the same spack call.
+
+    If something goes wrong, the child process catches the error and
+    passes it to the parent wrapped in a ChildError.  The parent is
+    expected to handle (or re-raise) the ChildError.
+
+    This uses `multiprocessing.Process` to create the child process. The
+    mechanism used to create the process differs on different operating
+    systems and for different versions of Python. In some cases "fork"
+    is used (i.e. the "fork" system call) and some cases it starts an
+    entirely new Python interpreter process (in the docs this is referred
+    to as the "spawn" start method). Breaking it down by OS:
+
+    - Linux always uses fork.
+    - Mac OS uses fork before Python 3.8 and "spawn" for 3.8 and after.
+    - Windows always uses the "spawn" start method.
+
+    For more information on `multiprocessing` child process creation
+    mechanisms, see https://docs.python.org/3/library/multiprocessing.html#contexts-and-start-methods
+    """
+    return spawn_build_process(pkg, function, kwargs, server=server).complete()
 
 
 CONTEXT_BASES = (spack.package_base.PackageBase, spack.build_systems._checks.BaseBuilder)
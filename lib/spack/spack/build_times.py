@@ -0,0 +1,130 @@
+# Copyright 2013-2024 Lawrence Livermore National Security, LLC and other
+# Spack Project Developers. See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+"""Persistent record of how long past installations took.
+
+The installer harvests the timer JSON written in each install prefix into a
+small database kept next to the install database, so that it is shared by all
+the users of an install tree, and uses it to estimate how long the installation
+of a spec will take. Durations are kept per package name and version,
+separately for builds from sources and installs from binary caches.
+"""
+from typing import Dict, Optional
+
+import llnl.util.tty as tty
+
+import spack.spec
+import spack.store
+import spack.util.file_cache
+import spack.util.spack_json as sjson
+
+#: Key of the build times database in its file cache
+CACHE_KEY = "build_times.json"
+
+#: Weight of a new measurement in the running estimate for a package version
+SMOOTHING = 0.5
+
+#: Durations in seconds, per kind of install ("build" or "cache"), package name and version
+BuildTimesData = Dict[str, Dict[str, Dict[str, float]]]
+
+
+def _kind(cache: bool) -> str:
+    return "cache" if cache else "build"
+
+
+class BuildTimes:
+    """Estimates of installation durations, backed by a file in the database directory
+    of the install tree, unless another file cache is given."""
+
+    def __init__(self, cache: Optional[spack.util.file_cache.FileCache] = None):
+        self._cache = cache
+        self._data: Optional[BuildTimesData] = None
+        self._measured: BuildTimesData = {}
+
+    @property
+    def cache(self) -> spack.util.file_cache.FileCache:
+        if self._cache is None:
+            self._cache = spack.util.file_cache.FileCache(spack.store.STORE.db.database_directory)
+        return self._cache
+
+    def _read(self) -> BuildTimesData:
+        try:
+            if not self.cache.init_entry(CACHE_KEY):
+                return {}
+            with self.cache.read_transaction(CACHE_KEY) as f:
+                return sjson.load(f)
+        except Exception as e:
+            tty.debug(f"Cannot read the build times database: {e}")
+            return {}
+
+    @property
+    def data(self) -> BuildTimesData:
+        if self._data is None:
+            self._data = self._read()
+        return self._data
+
+    def estimate(self, spec: "spack.spec.Spec", cache: bool = False) -> Optional[float]:
+        """Estimated duration, in seconds, of the installation of a spec.
+
+        The duration of the same version is preferred, otherwise the average over
+        all the recorded versions of the package is returned.
+
+        Args:
+            spec: concrete spec to be installed
+            cache: whether the spec is installed from a binary cache
+
+        Return:
+            the estimate, or ``None`` if the package was never installed this way
+        """
+        versions = self.data.get(_kind(cache), {}).get(spec.name)
+        if not versions:
+            return None
+        version = str(spec.version)
+        if version in versions:
+            return versions[version]
+        return sum(versions.values()) / len(versions)
+
+    def default_estimate(self, cache: bool = False) -> float:
+        """Estimated duration of the installation of a package never installed before,
+        i.e. the average over all recorded installations, or one second."""
+        packages = self.data.get(_kind(cache), {})
+        durations = [t for versions in packages.values() for t in versions.values()]
+        return sum(durations) / len(durations) if durations else 1.0
+
+    def record(self, spec: "spack.spec.Spec", seconds: float, cache: bool = False) -> None:
+        """Record the measured duration of an installation, to be saved with ``save()``.
+
+        Args:
+            spec: spec that was installed
+            seconds: duration of the installation
+            cache: whether the spec was installed from a binary cache
+        """
+        versions = self._measured.setdefault(_kind(cache), {}).setdefault(spec.name, {})
+        versions[str(spec.version)] = seconds
+
+    def _merge(self, data: BuildTimesData) -> BuildTimesData:
+        for kind, packages in self._measured.items():
+            for name, versions in packages.items():
+                recorded = data.setdefault(kind, {}).setdefault(name, {})
+                for version, seconds in versions.items():
+                    old = recorded.get(version)
+                    recorded[version] = (
+                        seconds if old is None else SMOOTHING * seconds + (1 - SMOOTHING) * old
+                    )
+        return data
+
+    def save(self) -> None:
+        """Merge the recorded durations into the database on disk."""
+        if not self._measured:
+            return
+        try:
+            self.cache.init_entry(CACHE_KEY)
+            with self.cache.write_transaction(CACHE_KEY) as (old, new):
+                data = self._merge(sjson.load(old) if old else {})
+                sjson.dump(data, new)
+        except Exception as e:
+            tty.debug(f"Cannot update the build times database: {e}")
+            return
+        self._data = data
+        self._measured = {}
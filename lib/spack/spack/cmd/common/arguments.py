@@ -579,6 +579,14 @@ def add_concretizer_args(subparser):
         default=None,
         help="allow concretizer to select deprecated versions",
     )
+    subgroup.add_argument(
+        "--no-result-cache",
+        action=ConfigSetAction,
+        dest="concretizer:result_cache",
+        const=False,
+        default=None,
+        help="do not use the results of previous solves, even if they are cached",
+    )
 
 
 def add_connection_args(subparser, add_help):
@@ -9,12 +9,17 @@
 import llnl.util.lang
 import llnl.util.tty as tty
 import llnl.util.tty.color as color
+from llnl.util.tty.colify import colify
 
 import spack.bootstrap
 import spack.cmd as cmd
+import spack.database
 import spack.environment as ev
 import spack.repo
+import spack.spec
 import spack.store
+import spack.variant as vt
+import spack.version as vn
 from spack.cmd.common import arguments
 from spack.database import InstallStatuses
 
@@ -305,20 +310,125 @@ def root_decorator(spec, string):
         tty.msg("Installed packages")
 
 
-def find(parser, args):
-    q_args = query_arguments(args)
-    results = args.specs(**q_args)
+def rows_suffice(args, env, constraint_specs) -> bool:
+    """Whether the installed specs can be listed from the rows of their database records,
+    without materializing specs: outside of environments, with the default format, and
+    with constraints on package names, versions and hashes only."""
+    if env or args.json or args.format or args.deps or args.loaded:
+        return False
+    if args.show_flags or args.show_full_compiler or args.unknown or args.tags:
+        return False
+    if args.start_date or args.end_date:
+        return False
+    return all(spack.database.is_simple_query(s) for s in constraint_specs)
+
+
+def _row_group_key(group):
+    architecture, compiler = group
+    return (architecture or (), (compiler[0], vn.ver(compiler[1])) if compiler else ())
+
+
+def _row_key(row):
+    return (row.name, vn.ver(row.version), row.namespace or "", row.hash)
 
+
+def display_rows(rows, args):
+    """Display database rows as ``spack.cmd.display_specs()`` displays their specs with
+    the default format, grouped by architecture and compiler with all headers."""
+    hlen = None if args.very_long else 7
+
+    def fmt(row):
+        string = ""
+        if args.long or args.very_long:
+            string += color.colorize("@K{%s}" % row.hash[:hlen]) + " "
+        if args.namespaces and row.namespace:
+            string += f"{row.namespace}.{row.name}"
+        else:
+            string += row.name
+        if row.version:
+            version = color.cescape(row.version)
+            string += color.colorize(f"{spack.spec.VERSION_COLOR}@@{version}@.")
+        if args.variants and row.variants:
+            variants = vt.VariantMap(None)
+            for name, value in row.variants.items():
+                variants[name] = vt.MultiValuedVariant.from_node_dict(name, value)
+            string += color.colorize(f"{spack.spec.VARIANT_COLOR}{color.cescape(str(variants))}@.")
+        return string
+
+    def format_list(rows):
+        formatted = [(fmt(row), row) for row in rows]
+        if not args.paths:
+            colify((f[0] for f in formatted), indent=0)
+            return
+        max_width = max(len(f[0]) for f in formatted)
+        path_fmt = "%%-%ds%%s" % (max_width + 2)
+        sys.stdout.write("".join(path_fmt % (f, row.prefix) + "\n" for f, row in formatted))
+
+    if not args.groups:
+        format_list(sorted(rows, key=_row_key))
+        sys.stdout.flush()
+        return
+
+    groups = {}
+    for row in rows:
+        groups.setdefault((row.architecture, row.compiler), []).append(row)
+
+    for i, group in enumerate(sorted(groups, key=_row_group_key)):
+        if i > 0:
+            print()
+        architecture, compiler = group
+        header = "%s{%s} / %s{%s}" % (
+            spack.spec.ARCHITECTURE_COLOR,
+            "-".join(architecture) if architecture else "no arch",
+            spack.spec.COMPILER_COLOR,
+            "@".join(compiler) if compiler else "no compiler",
+        )
+        tty.hline(color.colorize(header), char="-")
+        format_list(sorted(groups[group], key=_row_key))
+    sys.stdout.flush()
+
+
+def find_rows(args, q_args, constraint_specs):
+    """Query and display the rows of the database records matching the constraints."""
+    rows = {}
+    for spec in constraint_specs or [any]:
+        for row in spack.store.STORE.db.query_rows(
+            spec,
+            installed=q_args["installed"],
+            explicit=q_args["explicit"],
+            install_tree=q_args["install_tree"],
+        ):
+            rows[row.hash] = row
+    results = list(rows.values())
+
+    if not results and args.constraint:
+        constraint_str = " ".join(str(s) for s in constraint_specs)
+        tty.die(f"No package matches the query: {constraint_str}")
+
+    display_rows(results, args)
+    if sys.stdout.isatty() and args.groups:
+        spack.cmd.print_how_many_pkgs(results, "installed")
+
+
+def find(parser, args):
     env = ev.active_environment()
     if not env and args.only_roots:
         tty.die("-r / --only-roots requires an active environment")
 
-    decorator = make_env_decorator(env) if env else lambda s, f: f
-
     # use groups by default except with format.
     if args.groups is None:
         args.groups = not args.format
 
+    q_args = query_arguments(args)
+    constraint_specs = spack.cmd.parse_specs(args.constraint)
+    if rows_suffice(args, env, constraint_specs):
+        find_rows(args, q_args, constraint_specs)
+        return
+
+    results = args.specs(**q_args)
+
+    decorator = make_env_decorator(env) if env else lambda s, f: f
+
     # Exit early with an error code if no package matches the constraint
     if not results and args.constraint:
         constraint_str = " ".join(str(s) for s in args.constraint_specs)
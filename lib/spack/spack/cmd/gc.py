@@ -11,6 +11,7 @@
 import spack.deptypes as dt
 import spack.environment as ev
 import spack.store
+import spack.util.cpus
 
 description = "remove specs that are now no longer needed"
 section = "build"
@@ -41,7 +42,7 @@ def setup_parser(subparser):
         help="do not remove installed build-only dependencies of roots\n"
         "(default is to keep only link & run dependencies)",
     )
-    spack.cmd.common.arguments.add_common_arguments(subparser, ["yes_to_all"])
+    spack.cmd.common.arguments.add_common_arguments(subparser, ["yes_to_all", "jobs"])
 
 
 def roots_from_environments(args, active_env):
@@ -105,4 +106,5 @@ def gc(parser, args):
         if not args.yes_to_all:
             spack.cmd.common.confirmation.confirm_action(specs, "uninstalled", "uninstall")
 
-        spack.cmd.uninstall.do_uninstall(specs, force=False)
+        jobs = spack.util.cpus.determine_number_of_jobs(parallel=True)
+        spack.cmd.uninstall.do_uninstall(specs, force=False, jobs=jobs)
@@ -66,6 +66,10 @@ def install_kwargs_from_args(args):
         "unsigned": args.unsigned,
         "install_deps": ("dependencies" in args.things_to_install),
         "install_package": ("package" in args.things_to_install),
+        "concurrent_packages": args.concurrent_packages,
+        "cooperative": args.cooperative,
+        "events": args.events,
+        "fetch_ahead": args.fetch_ahead,
     }
 
 
@@ -88,6 +92,37 @@ def setup_parser(subparser):
         help="phase to stop after when installing (default None)",
     )
     arguments.add_common_arguments(subparser, ["jobs"])
+    subparser.add_argument(
+        "-p",
+        "--concurrent-packages",
+        type=int,
+        default=None,
+        metavar="N",
+        help="maximum number of packages to build, or extract from binary caches, "
+        "at the same time\n\n"
+        "default is the value of config:concurrent_packages, or 1 if not set",
+    )
+    subparser.add_argument(
+        "--cooperative",
+        action="store_true",
+        default=None,
+        help="share the work with other installers into the same store, e.g. on other nodes\n\n"
+        "default is the value of config:cooperative_install, or false if not set",
+    )
+    subparser.add_argument(
+        "--fetch-ahead",
+        type=int,
+        default=None,
+        metavar="N",
+        help="fetch the sources of all the packages to build, N at a time, while installing\n\n"
+        "default is the value of config:fetch_ahead, or 0 (fetch when building) if not set",
+    )
+    subparser.add_argument(
+        "--events",
+        default=None,
+        metavar="FILE",
+        help="append installer events to FILE, as JSON lines, for monitoring",
+    )
     subparser.add_argument(
         "--overwrite",
         action="store_true",
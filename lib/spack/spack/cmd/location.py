@@ -9,10 +9,12 @@
 
 import spack.builder
 import spack.cmd
+import spack.database
 import spack.environment as ev
 import spack.paths
 import spack.repo
 import spack.stage
+import spack.store
 from spack.cmd.common import arguments
 
 description = "print out locations of packages and spack directories"
@@ -128,6 +130,13 @@ def location(parser, args):
     # install_dir command matches against installed specs.
     if args.install_dir:
         env = ev.active_environment()
+        # A single installation matching a name, version or hash is found in the
+        # rows of the database, without reading any spec
+        if env is None and spack.database.is_simple_query(specs[0]):
+            rows = spack.store.STORE.db.query_rows(specs[0])
+            if len(rows) == 1 and rows[0].prefix:
+                print(rows[0].prefix)
+                return
         spec = spack.cmd.disambiguate_spec(specs[0], env, first=args.find_first)
         print(spec.prefix)
         return
@@ -3,12 +3,29 @@
 #
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
 
+import llnl.util.tty as tty
+
+import spack.cmd.common.arguments
 import spack.store
+import spack.util.cpus
+import spack.util.timer as timer
 
 description = "rebuild Spack's package database"
 section = "admin"
 level = "long"
 
 
+def setup_parser(subparser):
+    spack.cmd.common.arguments.add_common_arguments(subparser, ["jobs"])
+
+
 def reindex(parser, args):
-    spack.store.STORE.reindex()
+    # Reading the install tree is bound by file system latency, so use as many jobs as
+    # builds by default
+    jobs = spack.util.cpus.determine_number_of_jobs(parallel=True)
+    reindex_timer = timer.Timer()
+    spack.store.STORE.reindex(jobs=jobs, timer=reindex_timer)
+    reindex_timer.stop()
+
+    tty.msg(f"Reindexed {spack.store.STORE.root} with {jobs} jobs:")
+    reindex_timer.write_tty()
@@ -15,7 +15,7 @@
 import spack.package_base
 import spack.spec
 import spack.store
-import spack.traverse as traverse
+import spack.util.cpus
 from spack.cmd.common import arguments
 from spack.database import InstallStatuses
 
@@ -63,7 +63,7 @@ def setup_parser(subparser):
         "the environment description",
     )
     arguments.add_common_arguments(
-        subparser, ["recurse_dependents", "yes_to_all", "installed_specs"]
+        subparser, ["recurse_dependents", "yes_to_all", "jobs", "installed_specs"]
     )
     subparser.add_argument(
         "-a",
@@ -132,27 +132,11 @@ def find_matching_specs(
 
 
 def installed_dependents(specs: List[spack.spec.Spec]) -> List[spack.spec.Spec]:
-    # Note: the combination of arguments (in particular order=breadth
-    # and root=False) ensures dependents and matching_specs are non-overlapping;
-    # In the extreme case of "spack uninstall --all" we get the entire database as
-    # input; in that case we return an empty list.
-
-    def is_installed(spec):
-        record = spack.store.STORE.db.query_local_by_spec_hash(spec.dag_hash())
-        return record and record.installed
-
-    specs = traverse.traverse_nodes(
-        specs,
-        root=False,
-        order="breadth",
-        cover="nodes",
-        deptype=("link", "run"),
-        direction="parents",
-        key=lambda s: s.dag_hash(),
-    )
-
-    with spack.store.STORE.db.read_transaction():
-        return [spec for spec in specs if is_installed(spec)]
+    # Note: dependents are returned in breadth first order, and never include the
+    # input specs, so dependents and matching_specs are non-overlapping; In the extreme
+    # case of "spack uninstall --all" we get the entire database as input; in that case
+    # we return an empty list.
+    return spack.store.STORE.db.installed_dependents(specs, deptype=("link", "run"))
 
 
 def dependent_environments(
@@ -190,16 +174,8 @@ def _remove_from_env(spec, env):
         pass  # ignore non-root specs
 
 
-def do_uninstall(specs: List[spack.spec.Spec], force: bool = False):
-    # TODO: get rid of the call-sites that use this function,
-    # so that we don't have to do a dance of list -> set -> list -> set
-    hashes_to_remove = set(s.dag_hash() for s in specs)
-
-    for s in traverse.traverse_nodes(
-        specs, order="topo", direction="children", root=True, cover="nodes", deptype="all"
-    ):
-        if s.dag_hash() in hashes_to_remove:
-            spack.package_base.PackageBase.uninstall_by_spec(s, force=force)
+def do_uninstall(specs: List[spack.spec.Spec], force: bool = False, jobs: int = 1):
+    spack.package_base.PackageBase.uninstall_by_specs(specs, force=force, jobs=jobs)
 
 
 def get_uninstall_list(args, specs: List[spack.spec.Spec], env: Optional[ev.Environment]):
@@ -282,8 +258,10 @@ def uninstall_specs(args, specs):
     if not args.yes_to_all:
         confirmation.confirm_action(uninstall_list, "uninstalled", "uninstall")
 
-    # Uninstall everything on the list
-    do_uninstall(uninstall_list, args.force)
+    # Uninstall everything on the list. Removing prefixes is bound by file system
+    # latency, so use as many jobs as builds by default
+    jobs = spack.util.cpus.determine_number_of_jobs(parallel=True)
+    do_uninstall(uninstall_list, args.force, jobs=jobs)
 
     if env:
         with env.write_transaction():
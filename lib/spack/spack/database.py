@@ -18,11 +18,17 @@
 provides a cache and a sanity checking mechanism for what is in the
 filesystem.
 """
+import bisect
+import collections.abc
 import contextlib
 import datetime
+import hashlib
+import math
+import mmap
 import os
 import pathlib
 import socket
+import struct
 import sys
 import time
 from json import JSONDecoder
@@ -32,7 +38,10 @@
     Container,
     Dict,
     Generator,
+    Iterable,
+    Iterator,
     List,
+    MutableMapping,
     NamedTuple,
     Optional,
     Set,
@@ -54,10 +63,12 @@
 
 import spack.deptypes as dt
 import spack.hash_types as ht
+import spack.repo
 import spack.spec
 import spack.traverse as tr
 import spack.util.lock as lk
 import spack.util.spack_json as sjson
+import spack.util.timer as timer
 import spack.version as vn
 from spack.directory_layout import DirectoryLayoutError, InconsistentInstallDirectoryError
 from spack.error import SpackError
@@ -101,6 +112,10 @@
 #: ensure a failed install is properly tracked).
 _DEFAULT_PKG_LOCK_TIMEOUT = None
 
+#: The journal of a database is compacted into a new ``index.json`` when it would grow
+#: larger than this fraction of the size of the current ``index.json``
+_JOURNAL_COMPACTION_RATIO = 0.5
+
 #: Types of dependencies tracked by the database
 #: We store by DAG hash, so we track the dependencies that the DAG hash includes.
 _TRACKED_DEPENDENCIES = ht.dag_hash.depflag
@@ -131,6 +146,17 @@ def _now() -> float:
     return time.time()
 
 
+def _timestamp(date: Optional[datetime.datetime], default: float) -> float:
+    """Seconds since the epoch of a date, or ``default`` if the date is not given.
+    Dates out of the range of timestamps (e.g. ``datetime.min``) map to infinities."""
+    if not date:
+        return default
+    try:
+        return date.timestamp()
+    except (ValueError, OverflowError, OSError):
+        return -math.inf if date.year < 1970 else math.inf
+
+
 def _autospec(function):
     """Decorator that automatically converts the argument of a single-arg
     function to a Spec."""
@@ -262,6 +288,680 @@ def from_dict(cls, spec, dictionary):
         return InstallRecord(spec, **d)
 
 
+class RecordRow(NamedTuple):
+    """Fields of a record needed to select it by package name, version, hash and status,
+    and to list it, which are read without materializing the spec of the record when
+    records are read lazily from a record table."""
+
+    hash: str
+    name: str
+    version: str
+    namespace: Optional[str]
+    #: platform, operating system and target
+    architecture: Optional[Tuple[str, str, str]]
+    #: name and version of the compiler
+    compiler: Optional[Tuple[str, str]]
+    #: install prefix, or prefix of an external
+    prefix: Optional[str]
+    #: values of the variants, as in the node dict of the spec
+    variants: Dict[str, Any]
+    installed: bool
+    deprecated: bool
+    explicit: bool
+    origin: Optional[str]
+
+    def install_type_matches(self, installed) -> bool:
+        """Same as ``InstallRecord.install_type_matches()``."""
+        installed = InstallStatuses.canonicalize(installed)
+        if self.installed:
+            return InstallStatuses.INSTALLED in installed
+        elif self.deprecated:
+            return InstallStatuses.DEPRECATED in installed
+        else:
+            return InstallStatuses.MISSING in installed
+
+
+def _row_from_record(key: str, rec: InstallRecord) -> RecordRow:
+    spec = rec.spec
+    arch, compiler = spec.architecture, spec.compiler
+    return RecordRow(
+        hash=key,
+        name=spec.name,
+        version=str(spec.version),
+        namespace=spec.namespace,
+        architecture=(arch.platform, arch.os, str(arch.target)) if arch else None,
+        compiler=(compiler.name, str(compiler.version)) if compiler else None,
+        prefix=rec.path or spec.external_path,
+        variants=dict(v.yaml_entry() for v in spec.variants.values()),
+        installed=rec.installed,
+        deprecated=bool(rec.deprecated_for),
+        explicit=rec.explicit,
+        origin=rec.origin,
+    )
+
+
+def _row_from_dict(key: str, data: Dict[str, Any]) -> RecordRow:
+    node = data["spec"]
+    arch, compiler = node.get("arch"), node.get("compiler")
+    architecture = None
+    if arch:
+        target = arch["target"]
+        target = target["name"] if isinstance(target, dict) else target
+        architecture = (arch["platform"], arch["platform_os"], target)
+    path = data.get("path")
+    external = node.get("external") or {}
+    return RecordRow(
+        hash=key,
+        name=node["name"],
+        version=node.get("version", ""),
+        namespace=node.get("namespace"),
+        architecture=architecture,
+        compiler=(compiler["name"], compiler.get("version", "")) if compiler else None,
+        prefix=path if path and path != "None" else external.get("path"),
+        variants={
+            name: value
+            for name, value in node.get("parameters", {}).items()
+            if name not in spack.spec.FlagMap.valid_compiler_flags()
+        },
+        installed=data.get("installed", False),
+        deprecated=bool(data.get("deprecated_for")),
+        explicit=data.get("explicit", False),
+        origin=data.get("origin"),
+    )
+
+
+def is_simple_query(query_spec) -> bool:
+    """Whether a query spec constrains at most the package name, the version and the hash
+    of the records, which ``Database.query_rows()`` checks without materializing specs."""
+    if query_spec is any:
+        return True
+    return (
+        not query_spec.namespace
+        and query_spec.architecture is None
+        and query_spec.compiler is None
+        and not query_spec.variants
+        and not any(query_spec.compiler_flags.values())
+        and not query_spec.external_path
+        and not query_spec.edges_to_dependencies()
+    )
+
+
+class QueryIndex:
+    """In-memory indexes of the records of a database, by package name, by explicit
+    flag and by installation time, to narrow down the records a query has to check, and
+    of the dependents of each record, to walk the dependents of some records without
+    going through all the others.
+
+    Keys are kept in insertion order, so that queries return records in a stable order.
+    """
+
+    def __init__(self, data: MutableMapping[str, InstallRecord]):
+        #: Records indexed, keyed by DAG hash
+        self.data = data
+
+        #: Keys of the records of each package name
+        self.by_name: Dict[str, Dict[str, None]] = {}
+
+        #: Keys of the records installed explicitly
+        self.explicit: Dict[str, None] = {}
+
+        # Installation times, and keys, of all the records sorted by installation time.
+        # Built on demand, since queries by installation time are rare.
+        self._times: Optional[List[float]] = None
+        self._keys_by_time: List[str] = []
+
+        # Keys of the dependents of each record, with the types of their dependency on
+        # it. Built on demand, and then kept up to date as records are added and removed.
+        self._dependents: Optional[Dict[str, Dict[str, dt.DepFlag]]] = None
+
+        for key, name, explicit, _ in _record_summaries(data):
+            self._add(key, name, explicit)
+
+    def _add(self, key: str, name: str, explicit: bool) -> None:
+        self.by_name.setdefault(name, {})[key] = None
+        if explicit:
+            self.explicit[key] = None
+        else:
+            self.explicit.pop(key, None)
+
+    def add(self, key: str, rec: InstallRecord) -> None:
+        """Index a new record, or a record whose explicit flag or installation time changed.
+        New records are indexed once their dependencies are connected."""
+        self._add(key, rec.spec.name, rec.explicit)
+        self._times = None
+        if self._dependents is not None:
+            for dep_key, depflag in _record_dependencies(rec):
+                self._dependents.setdefault(dep_key, {})[key] = depflag
+
+    def remove(self, key: str, rec: InstallRecord) -> None:
+        """Remove a record from the indexes."""
+        keys = self.by_name.get(rec.spec.name, {})
+        keys.pop(key, None)
+        if not keys:
+            self.by_name.pop(rec.spec.name, None)
+        self.explicit.pop(key, None)
+        self._times = None
+        if self._dependents is not None:
+            for dep_key, _ in _record_dependencies(rec):
+                dependents = self._dependents.get(dep_key, {})
+                dependents.pop(key, None)
+                if not dependents:
+                    self._dependents.pop(dep_key, None)
+
+    def dependents(self, key: str, depflag: dt.DepFlag = dt.ALL) -> List[str]:
+        """Keys of the records depending on the record with the given key, through a
+        dependency of any of the given types."""
+        if self._dependents is None:
+            self._dependents = {}
+            for dependent, dep_key, flag in _dependency_edges(self.data):
+                self._dependents.setdefault(dep_key, {})[dependent] = flag
+        return [k for k, flag in self._dependents.get(key, {}).items() if flag & depflag]
+
+    def installed_between(self, start: float, end: float) -> List[str]:
+        """Keys of the records installed strictly after ``start`` and before ``end``,
+        given as seconds since the epoch."""
+        if self._times is None:
+            by_time = sorted((t, key) for key, _, _, t in _record_summaries(self.data))
+            self._times = [t for t, _ in by_time]
+            self._keys_by_time = [key for _, key in by_time]
+        lo = bisect.bisect_right(self._times, start)
+        hi = bisect.bisect_left(self._times, end)
+        return self._keys_by_time[lo:hi]
+
+
+def _record_summaries(
+    data: MutableMapping[str, InstallRecord]
+) -> Iterator[Tuple[str, str, bool, float]]:
+    """Key, package name, explicit flag and installation time of every record, without
+    materializing the records that are read lazily."""
+    if isinstance(data, LazyRecords):
+        return data.summaries()
+    return ((key, rec.spec.name, rec.explicit, rec.installation_time) for key, rec in data.items())
+
+
+def _record_dependencies(rec: InstallRecord) -> Iterator[Tuple[str, dt.DepFlag]]:
+    """Keys of the dependencies of a record, with the types of the dependencies."""
+    for edge in rec.spec.edges_to_dependencies(depflag=_TRACKED_DEPENDENCIES):
+        yield edge.spec.dag_hash(), edge.depflag
+
+
+def _dependency_edges(
+    data: MutableMapping[str, InstallRecord]
+) -> Iterator[Tuple[str, str, dt.DepFlag]]:
+    """Key of the dependent, key of the dependency and types of every dependency of the
+    records, without materializing the records that are read lazily."""
+    if isinstance(data, LazyRecords):
+        return data.dependency_edges()
+    return (
+        (key, dep_key, depflag)
+        for key, rec in data.items()
+        for dep_key, depflag in _record_dependencies(rec)
+    )
+
+
+class RecordTable:
+    """Binary copy of the records of a database, from which any single record can be read
+    without reading the others.
+
+    The file starts with a magic string and a JSON header, followed by a table with a
+    fixed size entry per record, in the order of index.json, then by the positions of
+    the entries sorted by hash, the dependencies and dependents of the records, the types
+    of these dependencies, the JSON dictionary of each record, and finally the JSON list
+    of the prefixes of the installed records. Each entry of the table holds the hash,
+    package name, explicit flag and installation time of its record, which is all queries
+    need to narrow down the records to read, and the position of the dictionary,
+    dependencies and dependents of the record. Dependencies on records of upstream
+    databases, which are not in the table, are listed in the header.
+    """
+
+    MAGIC = b"spack-db-records\n"
+
+    #: Version of the layout of the file, which readers must match
+    FORMAT = 2
+
+    #: Length of the JSON header
+    _HEADER_SIZE = struct.Struct("<I")
+
+    #: Hash, offset and length of the dictionary, installation time, explicit flag, index
+    #: of the package name in the header, and offset and numbers of the dependencies and
+    #: dependents, of a record
+    _ENTRY = struct.Struct("<32sQIdBIIII")
+
+    #: Position of an entry in the table
+    _POSITION = struct.Struct("<I")
+
+    #: Types of a dependency
+    _DEPFLAG = struct.Struct("<B")
+
+    #: Length of the hashes of the records
+    _KEY_SIZE = 32
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]):
+        self.buffer = buffer
+        if buffer[: len(self.MAGIC)] != self.MAGIC:
+            raise ValueError("not a table of database records")
+        pos = len(self.MAGIC)
+        (size,) = self._HEADER_SIZE.unpack_from(buffer, pos)
+        pos += self._HEADER_SIZE.size
+        self.header: Dict[str, Any] = sjson.load(buffer[pos : pos + size].decode("utf-8"))
+        if self.header.get("format") != self.FORMAT:
+            raise ValueError("unsupported format of the table of database records")
+        self._names: List[str] = self.header["names"]
+        self._count: int = self.header["count"]
+        self._entries = pos + size
+        self._sorted = self._entries + self._count * self._ENTRY.size
+        self._edges = self._sorted + self._count * self._POSITION.size
+        self._depflags = self._edges + self.header["edges"] * self._POSITION.size
+        self._records = self._depflags + self.header["edges"] * self._DEPFLAG.size
+        self.sorted_keys = _SortedKeys(self)
+
+    @classmethod
+    def read(cls, path: str) -> "RecordTable":
+        """Map the table in the given file in memory."""
+        with open(path, "rb") as f:
+            # Windows cannot replace files that are mapped in memory
+            if sys.platform == "win32":
+                return cls(f.read())
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def write(
+        cls,
+        stream,
+        header: Dict[str, Any],
+        installs: Dict[str, Dict[str, Any]],
+        installed_prefixes: Iterable[str],
+    ) -> None:
+        """Write the dictionaries of the records to a binary stream.
+
+        Args:
+            stream: binary stream
+            header: additional data about the records
+            installs: dictionaries of the records, keyed by hash, in the current format
+            installed_prefixes: prefixes of the installed records
+        """
+        keys = list(installs)
+        position = {key: i for i, key in enumerate(keys)}
+        spec_reader = reader(_DB_VERSION)
+        dependencies: List[List[Tuple[int, dt.DepFlag]]] = []
+        dependents: List[List[Tuple[int, dt.DepFlag]]] = [[] for _ in keys]
+        upstream_edges = []
+        for i, key in enumerate(keys):
+            if len(key) != cls._KEY_SIZE:
+                raise ValueError(f"invalid hash of a database record: {key}")
+            deps = spec_reader.read_specfile_dep_specs(
+                installs[key]["spec"].get("dependencies", [])
+            )
+            dependencies.append([])
+            for _, h, deptypes, _, _ in deps:
+                depflag = dt.canonicalize(deptypes)
+                if not depflag & _TRACKED_DEPENDENCIES:
+                    continue
+                # Dependencies in upstream databases are not in the table
+                if h not in position:
+                    upstream_edges.append([i, h, depflag])
+                    continue
+                dependencies[-1].append((position[h], depflag))
+                dependents[position[h]].append((i, depflag))
+
+        names: Dict[str, int] = {}
+        entries, edges, records = [], [], []
+        offset = 0
+        for i, key in enumerate(keys):
+            rec = installs[key]
+            data = sjson.dump(rec).encode("utf-8")
+            entries.append(
+                cls._ENTRY.pack(
+                    key.encode("ascii"),
+                    offset,
+                    len(data),
+                    rec["installation_time"],
+                    rec["explicit"],
+                    names.setdefault(rec["spec"]["name"], len(names)),
+                    len(edges),
+                    len(dependencies[i]),
+                    len(dependents[i]),
+                )
+            )
+            edges.extend(dependencies[i])
+            edges.extend(dependents[i])
+            records.append(data)
+            offset += len(data)
+        prefixes = sjson.dump(list(installed_prefixes)).encode("utf-8")
+
+        header = dict(header)
+        header.update(
+            format=cls.FORMAT,
+            names=list(names),
+            count=len(entries),
+            edges=len(edges),
+            upstream_edges=upstream_edges,
+            prefixes=[offset, len(prefixes)],
+        )
+        header_data = sjson.dump(header).encode("utf-8")
+        stream.write(cls.MAGIC)
+        stream.write(cls._HEADER_SIZE.pack(len(header_data)))
+        stream.write(header_data)
+        stream.write(b"".join(entries))
+        by_key = sorted(range(len(keys)), key=keys.__getitem__)
+        stream.write(b"".join(cls._POSITION.pack(i) for i in by_key))
+        stream.write(b"".join(cls._POSITION.pack(j) for j, _ in edges))
+        stream.write(b"".join(cls._DEPFLAG.pack(depflag) for _, depflag in edges))
+        stream.write(b"".join(records))
+        stream.write(prefixes)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _entry(self, i: int) -> Tuple[bytes, int, int, float, int, int, int, int, int]:
+        return self._ENTRY.unpack_from(self.buffer, self._entries + i * self._ENTRY.size)
+
+    def key(self, i: int) -> str:
+        """Hash of the i-th record."""
+        pos = self._entries + i * self._ENTRY.size
+        return self.buffer[pos : pos + self._KEY_SIZE].decode("ascii")
+
+    def sorted_position(self, i: int) -> int:
+        """Position in the table of the i-th record in the order of the hashes."""
+        return self._POSITION.unpack_from(self.buffer, self._sorted + i * self._POSITION.size)[0]
+
+    def find(self, key: str) -> Optional[int]:
+        """Position of the record with the given hash in the table, if any."""
+        i = bisect.bisect_left(self.sorted_keys, key)
+        if i < self._count and self.sorted_keys[i] == key:
+            return self.sorted_position(i)
+        return None
+
+    def keys_with_prefix(self, prefix: str) -> List[str]:
+        """Hashes of the records starting with the given prefix, in the order of the table."""
+        result = []
+        for i in range(bisect.bisect_left(self.sorted_keys, prefix), self._count):
+            key = self.sorted_keys[i]
+            if not key.startswith(prefix):
+                break
+            result.append((self.sorted_position(i), key))
+        return [key for _, key in sorted(result)]
+
+    def summary(self, i: int) -> Tuple[str, str, bool, float]:
+        """Hash, package name, explicit flag and installation time of the i-th record."""
+        key, _, _, installation_time, explicit, name, _, _, _ = self._entry(i)
+        return key.decode("ascii"), self._names[name], bool(explicit), installation_time
+
+    def _edges_of(self, pos: int, count: int) -> Tuple[int, ...]:
+        return struct.unpack_from(
+            f"<{count}I", self.buffer, self._edges + pos * self._POSITION.size
+        )
+
+    def dependencies(self, i: int) -> Tuple[int, ...]:
+        """Positions of the dependencies of the i-th record."""
+        _, _, _, _, _, _, pos, ndeps, _ = self._entry(i)
+        return self._edges_of(pos, ndeps)
+
+    def dependents(self, i: int) -> Tuple[int, ...]:
+        """Positions of the dependents of the i-th record."""
+        _, _, _, _, _, _, pos, ndeps, ndependents = self._entry(i)
+        return self._edges_of(pos + ndeps, ndependents)
+
+    def dependency_types(self, i: int) -> List[Tuple[int, dt.DepFlag]]:
+        """Positions of the dependencies of the i-th record, with the types of the
+        dependencies."""
+        _, _, _, _, _, _, pos, ndeps, _ = self._entry(i)
+        depflags = self.buffer[self._depflags + pos : self._depflags + pos + ndeps]
+        return list(zip(self._edges_of(pos, ndeps), depflags))
+
+    def get(self, key: str) -> Dict[str, Any]:
+        """Dictionary of the record with the given hash."""
+        i = self.find(key)
+        if i is None:
+            raise KeyError(key)
+        _, offset, size, _, _, _, _, _, _ = self._entry(i)
+        pos = self._records + offset
+        return sjson.load(self.buffer[pos : pos + size].decode("utf-8"))
+
+    def installed_prefixes(self) -> Set[str]:
+        """Prefixes of the installed records."""
+        offset, size = self.header["prefixes"]
+        pos = self._records + offset
+        return set(sjson.load(self.buffer[pos : pos + size].decode("utf-8")))
+
+    def __reduce__(self):
+        return RecordTable, (bytes(self.buffer),)
+
+
+class _SortedKeys(collections.abc.Sequence):
+    """Sorted hashes of the records of a table, read on demand."""
+
+    def __init__(self, table: RecordTable):
+        self.table = table
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __getitem__(self, i):
+        return self.table.key(self.table.sorted_position(i))
+
+
+class LazyRecords(collections.abc.MutableMapping):
+    """Records of a database read from a record table, each one materialized, along with
+    its spec, only when accessed.
+
+    Since the specs of a database know their dependents, accessing a record reads the
+    records depending on it, transitively, and the dependencies of all of them.
+
+    Args:
+        table: table of the records
+        materialize: function reading the records with the given dictionaries, keyed by
+            hash, into the records already read, passed as first argument
+    """
+
+    def __init__(
+        self,
+        table: RecordTable,
+        materialize: Callable[[Dict[str, InstallRecord], Dict[str, Dict[str, Any]]], None],
+    ):
+        self.table = table
+        self._materialize = materialize
+        self._records: Dict[str, InstallRecord] = {}
+        # Records whose dependents were all read
+        self._complete: Set[str] = set()
+        # Records removed from, and added to, those of the table
+        self._removed: Set[str] = set()
+        self._added: Set[str] = set()
+
+    def _load(self, i: int) -> None:
+        """Read the i-th record of the table, the records depending on it, transitively,
+        and the dependencies of all of them, unless they were already read."""
+        up, stack = {i}, [i]
+        while stack:
+            for j in self.table.dependents(stack.pop()):
+                key = self.table.key(j)
+                if j not in up and key not in self._removed and key not in self._complete:
+                    up.add(j)
+                    stack.append(j)
+
+        read, stack = set(up), list(up)
+        while stack:
+            for j in self.table.dependencies(stack.pop()):
+                if j not in read and self.table.key(j) not in self._records:
+                    read.add(j)
+                    stack.append(j)
+
+        keys = [self.table.key(j) for j in read]
+        self._materialize(
+            self._records, {key: self.table.get(key) for key in keys if key not in self._records}
+        )
+        self._complete.update(self.table.key(j) for j in up)
+
+    def __contains__(self, key) -> bool:
+        if key in self._records:
+            return True
+        return key not in self._removed and self.table.find(key) is not None
+
+    def __getitem__(self, key: str) -> InstallRecord:
+        if key in self._complete:
+            return self._records[key]
+        i = None if key in self._removed else self.table.find(key)
+        if i is None:
+            raise KeyError(key)
+        self._load(i)
+        return self._records[key]
+
+    def __setitem__(self, key: str, rec: InstallRecord) -> None:
+        self._records[key] = rec
+        self._complete.add(key)
+        if key in self._removed:
+            self._removed.discard(key)
+        elif self.table.find(key) is None:
+            self._added.add(key)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._records.pop(key, None)
+        self._complete.discard(key)
+        if key in self._added:
+            self._added.discard(key)
+        else:
+            self._removed.add(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self.table)):
+            key = self.table.key(i)
+            if key not in self._removed:
+                yield key
+        yield from list(self._added)
+
+    def __len__(self) -> int:
+        return len(self.table) - len(self._removed) + len(self._added)
+
+    def keys_with_prefix(self, prefix: str) -> List[str]:
+        """Hashes of the records starting with the given prefix."""
+        keys = [k for k in self.table.keys_with_prefix(prefix) if k not in self._removed]
+        return keys + [k for k in self._added if k.startswith(prefix)]
+
+    def dependency_edges(self) -> Iterator[Tuple[str, str, dt.DepFlag]]:
+        """Key of the dependent, key of the dependency and types of every dependency of
+        the records."""
+        table = self.table
+        for i in range(len(table)):
+            key = table.key(i)
+            if key in self._removed:
+                continue
+            for j, depflag in table.dependency_types(i):
+                yield key, table.key(j), depflag
+        for i, dep_key, depflag in table.header.get("upstream_edges", []):
+            if table.key(i) not in self._removed:
+                yield table.key(i), dep_key, depflag
+        for key in list(self._added):
+            for dep_key, depflag in _record_dependencies(self._records[key]):
+                yield key, dep_key, depflag
+
+    def summaries(self) -> Iterator[Tuple[str, str, bool, float]]:
+        """Hash, package name, explicit flag and installation time of each record."""
+        for i in range(len(self.table)):
+            key = self.table.key(i)
+            if key in self._removed:
+                continue
+            rec = self._records.get(key)
+            if rec is None:
+                yield self.table.summary(i)
+            else:
+                yield key, rec.spec.name, rec.explicit, rec.installation_time
+        for key in list(self._added):
+            rec = self._records[key]
+            yield key, rec.spec.name, rec.explicit, rec.installation_time
+
+    def row(self, key: str) -> RecordRow:
+        """Row of a record, read from the table if the record was not materialized."""
+        rec = self._records.get(key)
+        if rec is not None:
+            return _row_from_record(key, rec)
+        return _row_from_dict(key, self.table.get(key))
+
+    def to_dict(self, key: str, include_fields=DEFAULT_INSTALL_RECORD_FIELDS) -> Dict[str, Any]:
+        """Dictionary of a record, read from the table if the record was not materialized."""
+        rec = self._records.get(key)
+        if rec is not None:
+            return rec.to_dict(include_fields=include_fields)
+        return self.table.get(key)
+
+
+class UpstreamIndex:
+    """Merged view of the records of the upstream databases of a database, to look up
+    hashes and package names across all of them at once instead of one upstream after
+    the other.
+
+    Upstreams are read again, and only their part of the view is rebuilt, when the
+    modification time or size of their index.json, or of its journal, changed.
+    """
+
+    def __init__(self, upstream_dbs: List["Database"]):
+        self.upstream_dbs = upstream_dbs
+
+        # Generation of the records of each upstream that was indexed, and package
+        # name of each of its records, keyed by hash
+        self._generations: List[Optional[int]] = [None] * len(upstream_dbs)
+        self._names: List[Dict[str, str]] = [{} for _ in upstream_dbs]
+
+        #: Positions of the upstreams having a record with a given hash, in order
+        self.by_hash: Dict[str, List[int]] = {}
+
+        #: Hashes of the records of each package name, in any upstream
+        self.by_name: Dict[str, Dict[str, None]] = {}
+
+    def refresh(self) -> None:
+        """Read again the upstreams whose files changed, and index the records of the
+        upstreams that were read since they were last indexed."""
+        for i, db in enumerate(self.upstream_dbs):
+            if db._file_stamp() != db._read_stamp:
+                db._read()
+            if db._generation != self._generations[i]:
+                self._unindex(i)
+                self._index(i)
+
+    def _unindex(self, i: int) -> None:
+        for key, name in self._names[i].items():
+            layers = self.by_hash[key]
+            layers.remove(i)
+            if not layers:
+                del self.by_hash[key]
+                keys = self.by_name[name]
+                keys.pop(key, None)
+                if not keys:
+                    del self.by_name[name]
+        self._names[i] = {}
+
+    def _index(self, i: int) -> None:
+        db = self.upstream_dbs[i]
+        names = {key: name for key, name, _, _ in _record_summaries(db._data)}
+        for key, name in names.items():
+            bisect.insort(self.by_hash.setdefault(key, []), i)
+            self.by_name.setdefault(name, {})[key] = None
+        self._names[i] = names
+        self._generations[i] = db._generation
+
+    def get(self, key: str) -> Optional[Tuple["Database", InstallRecord]]:
+        """First upstream having a record with the given hash, and the record, if any."""
+        for i in self.by_hash.get(key, ()):
+            db = self.upstream_dbs[i]
+            rec = db._data.get(key)
+            if rec is not None:
+                return db, rec
+        return None
+
+    def candidates(self, query_spec: "spack.spec.Spec") -> Optional[List["Database"]]:
+        """Upstreams that may have records matching the query spec, or None if any of
+        them may."""
+        if query_spec.concrete:
+            layers = set(self.by_hash.get(query_spec.dag_hash(), ()))
+        elif query_spec.name in self.by_name:
+            layers = {i for key in self.by_name[query_spec.name] for i in self.by_hash[key]}
+        else:
+            # Either no name, or a virtual one, matched by the records of its providers
+            return None
+        return [db for i, db in enumerate(self.upstream_dbs) if i in layers]
+
+
 class ForbiddenLockError(SpackError):
     """Raised when an upstream DB attempts to acquire a lock"""
 
@@ -588,6 +1288,149 @@ def _path(self, spec: "spack.spec.Spec") -> pathlib.Path:
         return self.dir / f"{spec.name}-{spec.dag_hash()}"
 
 
+def work_queue_path(root_dir: Union[str, pathlib.Path]) -> pathlib.Path:
+    """Returns the path of the shared work queue file, given the root directory.
+
+    Args:
+        root_dir: root directory containing the database directory
+    """
+    return pathlib.Path(root_dir) / _DB_DIRNAME / "work_queue.json"
+
+
+class WorkQueue:
+    """Shared queue of the installations in progress in a store, through which
+    installers running on different nodes of a cluster cooperate.
+
+    Before installing a spec, a cooperating installer claims it in the queue, so
+    that installers on other nodes move on to other specs instead of contending
+    for its prefix lock, and it drops the claim once the installation is done. The
+    outcome is not kept in the queue, since installed specs are recorded in the DB,
+    and failures by the :class:`FailureTracker`.
+
+    The queue is a JSON file alongside the install DB, maps DAG hashes to the
+    claims on their installation, and is only accessed under a write lock. A claim
+    is considered abandoned, and can be taken over, once the prefix of its spec is
+    no longer locked and it is older than ``grace`` seconds.
+    """
+
+    #: Seconds an installer waits when all the specs it could install are claimed
+    poll_interval = 1.0
+
+    def __init__(
+        self,
+        root_dir: Union[str, pathlib.Path],
+        prefix_locker: SpecLocker,
+        default_timeout: Optional[float],
+        grace: float = 60.0,
+    ):
+        self.path = work_queue_path(root_dir)
+        self.prefix_locker = prefix_locker
+        self.grace = grace
+        self.lock = lk.Lock(
+            str(self.path.with_suffix(".lock")), default_timeout=default_timeout, desc="work queue"
+        )
+
+        #: Identifies this installer in the queue
+        self.worker = f"{socket.getfqdn()}:{os.getpid()}"
+
+        #: DAG hashes of the specs claimed by this installer
+        self.claimed: Set[str] = set()
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Generator[Dict[str, Dict[str, Any]], None, None]:
+        """Yields the entries of the queue under a write lock, and writes them back."""
+        with lk.WriteTransaction(self.lock):
+            try:
+                with open(self.path) as f:
+                    entries = sjson.load(f)
+            except (OSError, ValueError):
+                entries = {}
+
+            yield entries
+
+            temp_file = f"{self.path}.{socket.getfqdn()}.{os.getpid()}.temp"
+            with open(temp_file, "w") as f:
+                sjson.dump(entries, f)
+            fs.rename(temp_file, str(self.path))
+
+    def _abandoned(self, spec: "spack.spec.Spec", entry: Dict[str, Any]) -> bool:
+        if time.time() - entry["time"] < self.grace:
+            return False
+        return not self.prefix_locker.raw_lock(spec, timeout=1e-9).is_write_locked()
+
+    def claim(self, spec: "spack.spec.Spec") -> bool:
+        """Claims a spec before installing it.
+
+        Args:
+            spec: concrete spec about to be installed
+
+        Returns:
+            ``False`` if another installer is installing the spec, ``True`` otherwise
+        """
+        dag_hash = spec.dag_hash()
+        if dag_hash in self.claimed:
+            return True
+
+        with self._transaction() as entries:
+            entry = entries.get(dag_hash)
+            if (
+                entry is not None
+                and entry["status"] == "claimed"
+                and entry["worker"] != self.worker
+                and not self._abandoned(spec, entry)
+            ):
+                return False
+
+            entries[dag_hash] = {
+                "name": spec.name,
+                "status": "claimed",
+                "worker": self.worker,
+                "time": time.time(),
+            }
+
+        self.claimed.add(dag_hash)
+        return True
+
+    def complete(self, spec: "spack.spec.Spec", installed: bool) -> None:
+        """Drops the claim of this installer on a spec, once its installation is done.
+
+        Args:
+            spec: concrete spec whose installation is done
+            installed: whether the spec was installed successfully
+        """
+        dag_hash = spec.dag_hash()
+        if dag_hash not in self.claimed:
+            return
+
+        with self._transaction() as entries:
+            # The claim may have been taken over by another installer
+            entry = entries.get(dag_hash)
+            if entry is not None and entry["worker"] == self.worker:
+                del entries[dag_hash]
+        self.claimed.discard(dag_hash)
+        tty.debug(f"Dropped the claim on {spec.short_spec} [installed={installed}]")
+
+    def release_all(self) -> None:
+        """Drops the claims of this installer on the specs it did not install."""
+        if not self.claimed:
+            return
+
+        with self._transaction() as entries:
+            for dag_hash in self.claimed:
+                entry = entries.get(dag_hash)
+                if entry is not None and entry["worker"] == self.worker:
+                    del entries[dag_hash]
+        self.claimed.clear()
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the entries of the queue, keyed by DAG hash."""
+        try:
+            with lk.ReadTransaction(self.lock), open(self.path) as f:
+                return sjson.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
 class Database:
     #: Fields written for each install record
     record_fields: Tuple[str, ...] = DEFAULT_INSTALL_RECORD_FIELDS
@@ -598,6 +1441,9 @@ def __init__(
         upstream_dbs: Optional[List["Database"]] = None,
         is_upstream: bool = False,
         lock_cfg: LockConfiguration = DEFAULT_LOCK_CFG,
+        journal: bool = False,
+        binary_index: bool = False,
+        snapshot_cache: Optional[str] = None,
     ) -> None:
         """Database for Spack installations.
 
@@ -611,12 +1457,31 @@ def __init__(
         If that does not exist, it will create a database when needed by scanning the entire
         store root for ``spec.json`` files according to Spack's directory layout.
 
+        If ``journal`` is enabled, write transactions append the records they changed to
+        a ``journal.jsonl`` file next to ``index.json``, instead of rewriting the whole
+        index, and readers replay the journal on top of ``index.json``. The journal is
+        compacted into a new ``index.json`` once it grows large. Journals are always
+        replayed when reading, whether or not they are enabled for writing.
+
+        If ``binary_index`` is enabled, a binary copy of ``index.json``, ``index.bin``, is
+        written along with it. Readers prefer ``index.bin`` when it is up to date, and read
+        from it, and build the spec of, only the records they access.
+
+        If a ``snapshot_cache`` directory is given, processes that have to read
+        ``index.json`` leave a binary copy of it in that directory, which later processes
+        read instead, as long as the modification time and size of ``index.json``, and its
+        verifier, did not change. This helps the users of databases that do not write
+        ``index.bin``, e.g. upstreams, or databases they cannot write.
+
         Args:
             root: root directory where to create the database directory.
             upstream_dbs: upstream databases for this repository.
             is_upstream: whether this repository is an upstream.
             lock_cfg: configuration for the locks to be used by this repository.
                 Relevant only if the repository is not an upstream.
+            journal: whether write transactions append to a journal of changes.
+            binary_index: whether to write a binary copy of the index, read lazily.
+            snapshot_cache: directory where to keep binary copies of the index, if any.
         """
         self.root = root
         self.database_directory = os.path.join(self.root, _DB_DIRNAME)
@@ -624,6 +1489,8 @@ def __init__(
         # Set up layout of database files within the db dir
         self._index_path = os.path.join(self.database_directory, "index.json")
         self._verifier_path = os.path.join(self.database_directory, "index_verifier")
+        self._journal_path = os.path.join(self.database_directory, "journal.jsonl")
+        self._table_path = os.path.join(self.database_directory, "index.bin")
         self._lock_path = os.path.join(self.database_directory, "lock")
 
         # Create needed directories and files
@@ -641,6 +1508,29 @@ def __init__(
         # case, so we defer the cleanup to when we begin the next transaction
         self._state_is_inconsistent = False
 
+        # Id of the journal of the index.json last read or written, or None if writes
+        # to that index.json are not journaled, and number of bytes of the journal
+        # already applied to the records in memory
+        self.journal = journal and _use_uuid
+        self._journal_id: Optional[str] = None
+        self._journal_offset = 0
+        self._index_size = 0
+
+        # Keys of the records changed since the database was last read or written,
+        # or None if the whole database has to be written
+        self._changed_keys: Optional[Set[str]] = set()
+
+        self.binary_index = binary_index and _use_uuid
+
+        # Binary copy of index.json in the snapshot cache, if any, named after the path of
+        # index.json, and record table the records are read lazily from
+        self.snapshot_cache = snapshot_cache
+        self._snapshot_path: Optional[str] = None
+        if snapshot_cache:
+            index_id = hashlib.sha256(os.path.abspath(self._index_path).encode()).hexdigest()
+            self._snapshot_path = os.path.join(snapshot_cache, f"{index_id[:32]}.bin")
+        self._records_path = self._table_path
+
         # initialize rest of state.
         self.db_lock_timeout = lock_cfg.database_timeout
         tty.debug("DATABASE LOCK TIMEOUT: {0}s".format(str(self.db_lock_timeout)))
@@ -655,15 +1545,28 @@ def __init__(
                 desc="database",
                 enable=lock_cfg.enable,
             )
-        self._data: Dict[str, InstallRecord] = {}
+        self._data: MutableMapping[str, InstallRecord] = {}
 
         # For every installed spec we keep track of its install prefix, so that
         # we can answer the simple query whether a given path is already taken
-        # before installing a different spec.
-        self._installed_prefixes: Set[str] = set()
+        # before installing a different spec. None until read, if the records
+        # were read from a record table.
+        self._prefixes: Optional[Set[str]] = set()
+
+        # Indexes of the records, to answer queries on abstract specs without
+        # checking every record.
+        self._indexes: Optional[QueryIndex] = None
 
         self.upstream_dbs = list(upstream_dbs) if upstream_dbs else []
 
+        # Merged view of the records of the upstreams, built on first use
+        self._upstreams: Optional[UpstreamIndex] = None
+
+        # Modification times and sizes of the files of the database when it was last
+        # read, if it is an upstream, and number of times records were read from them
+        self._read_stamp: Optional[Tuple[Optional[Tuple[int, int]], ...]] = None
+        self._generation = 0
+
         # whether there was an error at the start of a read transaction
         self._error = None
 
@@ -675,6 +1578,41 @@ def __init__(
         self._write_transaction_impl = lk.WriteTransaction
         self._read_transaction_impl = lk.ReadTransaction
 
+    @property
+    def _installed_prefixes(self) -> Set[str]:
+        if self._prefixes is None:
+            assert isinstance(self._data, LazyRecords)
+            self._prefixes = self._data.table.installed_prefixes()
+        return self._prefixes
+
+    @_installed_prefixes.setter
+    def _installed_prefixes(self, prefixes: Set[str]) -> None:
+        self._prefixes = prefixes
+
+    def _upstream_index(self) -> UpstreamIndex:
+        """Merged view of the records of the upstream databases."""
+        if self._upstreams is None:
+            self._upstreams = UpstreamIndex(self.upstream_dbs)
+            self._upstreams.refresh()
+        return self._upstreams
+
+    def _file_stamp(self) -> Tuple[Optional[Tuple[int, int]], ...]:
+        """Modification time and size of index.json and of its journal, if they exist."""
+        stamp = []
+        for path in (self._index_path, self._journal_path):
+            try:
+                stat = os.stat(path)
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _query_indexes(self) -> QueryIndex:
+        """Indexes of the current records, rebuilt if the records were replaced."""
+        if self._indexes is None or self._indexes.data is not self._data:
+            self._indexes = QueryIndex(self._data)
+        return self._indexes
+
     def write_transaction(self):
         """Get a write lock context manager for use in a `with` block."""
         return self._write_transaction_impl(self.lock, acquire=self._read, release=self._write)
@@ -683,16 +1621,28 @@ def read_transaction(self):
         """Get a read lock context manager for use in a `with` block."""
         return self._read_transaction_impl(self.lock, acquire=self._read)
 
-    def _write_to_file(self, stream):
+    def _record_dicts(self) -> Dict[str, Dict[str, Any]]:
+        """Dictionaries of all the records, keyed by hash."""
+        data = self._data
+        if isinstance(data, LazyRecords):
+            # Records that were not materialized are copied from the table
+            return {k: data.to_dict(k, include_fields=self.record_fields) for k in data}
+        return {k: v.to_dict(include_fields=self.record_fields) for k, v in self._data.items()}
+
+    def _write_to_file(
+        self,
+        stream,
+        journal_id: Optional[str] = None,
+        installs: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
         """Write out the database in JSON format to the stream passed
-        as argument.
+        as argument, along with the id of the journal of changes to it, if any.
 
         This function does not do any locking or transactions.
         """
         # map from per-spec hash code to installation record.
-        installs = dict(
-            (k, v.to_dict(include_fields=self.record_fields)) for k, v in self._data.items()
-        )
+        if installs is None:
+            installs = self._record_dicts()
 
         # database includes installation list and version.
 
@@ -709,6 +1659,8 @@ def _write_to_file(self, stream):
                 "installs": installs,
             }
         }
+        if journal_id is not None:
+            database["database"]["journal"] = journal_id
 
         try:
             sjson.dump(database, stream)
@@ -740,9 +1692,8 @@ def db_for_spec_hash(self, hash_key):
             if hash_key in self._data:
                 return self
 
-        for db in self.upstream_dbs:
-            if hash_key in db._data:
-                return db
+        upstream = self._upstream_index().get(hash_key) if self.upstream_dbs else None
+        return upstream[0] if upstream else None
 
     def query_by_spec_hash(
         self, hash_key: str, data: Optional[Dict[str, InstallRecord]] = None
@@ -760,11 +1711,36 @@ def query_by_spec_hash(
             with self.read_transaction():
                 if hash_key in self._data:
                     return False, self._data[hash_key]
-        for db in self.upstream_dbs:
-            if hash_key in db._data:
-                return True, db._data[hash_key]
+        upstream = self._upstream_index().get(hash_key) if self.upstream_dbs else None
+        if upstream:
+            return True, upstream[1]
         return False, None
 
+    def query_by_spec_hashes(
+        self, hash_keys: Iterable[str]
+    ) -> Dict[str, Tuple[bool, InstallRecord]]:
+        """Get the records of many hashes at once, in a single read transaction.
+
+        Like ``query_by_spec_hash``, the local database is checked first, then
+        the upstream databases, in order.
+
+        Return:
+            dictionary mapping each hash with a record to a tuple telling whether
+            the spec is installed upstream, and its InstallRecord. Hashes that are
+            unknown to all the databases are omitted.
+        """
+        result: Dict[str, Tuple[bool, InstallRecord]] = {}
+        with self.read_transaction():
+            upstreams = self._upstream_index() if self.upstream_dbs else None
+            for hash_key in hash_keys:
+                if hash_key in self._data:
+                    result[hash_key] = (False, self._data[hash_key])
+                    continue
+                upstream = upstreams.get(hash_key) if upstreams else None
+                if upstream:
+                    result[hash_key] = (True, upstream[1])
+        return result
+
     def query_local_by_spec_hash(self, hash_key):
         """Get a spec by hash in the local database
 
@@ -819,8 +1795,9 @@ def _read_from_file(self, filename):
         """
         try:
             with open(filename, "r") as f:
-                # In the future we may use a stream of JSON objects, hence `raw_decode` for compat.
-                fdata, _ = JSONDecoder().raw_decode(f.read())
+                text = f.read()
+            # In the future we may use a stream of JSON objects, hence `raw_decode` for compat.
+            fdata, _ = JSONDecoder().raw_decode(text)
         except Exception as e:
             raise CorruptDatabaseError("error parsing database:", str(e)) from e
 
@@ -910,11 +1887,173 @@ def invalid_record(hash_key, error):
 
         self._data = data
         self._installed_prefixes = installed_prefixes
+        self._indexes = QueryIndex(data)
+        self._journal_id = db.get("journal")
+        self._journal_offset = 0
+        self._index_size = len(text)
+        self._changed_keys = set()
+
+    def _read_table(self, path: str) -> Optional[RecordTable]:
+        """Map the record table in the given file, or return None if it cannot be read."""
+        try:
+            return RecordTable.read(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            tty.debug(f"Cannot read the database records from {path}: {e}")
+            return None
+
+    def _use_table(self, table: RecordTable, path: str) -> None:
+        """Read the records lazily from the given record table."""
+        header = table.header
+        self._data = LazyRecords(table, self._materialize)
+        self._prefixes = None
+        self._indexes = None
+        self._journal_id = header.get("journal")
+        self._journal_offset = 0
+        self._index_size = header.get("index_size", 0)
+        self._changed_keys = set()
+        self._records_path = path
+
+    def _read_from_table(self, verifier: str) -> bool:
+        """Read the records lazily from the record table, if it is a copy of the index.json
+        with the given verifier.
+
+        Does not do any locking.
+
+        Return:
+            whether the records were read
+        """
+        if not verifier:
+            return False
+        table = self._read_table(self._table_path)
+        if table is None:
+            return False
+
+        header = table.header
+        if header.get("verifier") != verifier or header.get("version") != str(_DB_VERSION):
+            return False
+
+        self._use_table(table, self._table_path)
+        return True
+
+    def _index_stat(self) -> Dict[str, Any]:
+        """Path, modification time and size of index.json, which a snapshot of it has to
+        match to be read instead of it."""
+        stat = os.stat(self._index_path)
+        return {
+            "index": os.path.abspath(self._index_path),
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
 
-    def reindex(self, directory_layout):
+    def _read_from_cached_snapshot(self, verifier: str, index_stat: Dict[str, Any]) -> bool:
+        """Read the records lazily from the snapshot of index.json in the snapshot cache,
+        if it is a copy of the current index.json.
+
+        Does not do any locking.
+
+        Return:
+            whether the records were read
+        """
+        assert self._snapshot_path is not None
+        table = self._read_table(self._snapshot_path)
+        if table is None:
+            return False
+
+        header = table.header
+        expected = dict(index_stat, verifier=verifier, version=str(_DB_VERSION))
+        if any(header.get(key) != value for key, value in expected.items()):
+            return False
+
+        self._use_table(table, self._snapshot_path)
+        return True
+
+    def _write_cached_snapshot(
+        self, header: Dict[str, Any], installs: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """Write a snapshot of index.json in the snapshot cache. Since snapshots are only an
+        optimization, failures are reported only in debug output."""
+        assert self.snapshot_cache is not None and self._snapshot_path is not None
+        try:
+            fs.mkdirp(self.snapshot_cache)
+            self._write_table(self._snapshot_path, header, installs)
+        except OSError as e:
+            tty.debug(f"Cannot write a snapshot of {self._index_path}: {e}")
+
+    def _materialize(
+        self, records: Dict[str, InstallRecord], installs: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """Read records, and their specs, from their dictionaries in a record table, into
+        the records already read, which include all the dependencies of the new ones."""
+        spec_reader = reader(_DB_VERSION)
+
+        # Same passes as when reading index.json
+        for hash_key, rec in installs.items():
+            try:
+                spec = self._read_spec_from_dict(spec_reader, hash_key, installs)
+                records[hash_key] = InstallRecord.from_dict(spec, rec)
+            except Exception as e:
+                raise self._invalid_table_record(hash_key, e) from e
+
+        for hash_key in installs:
+            try:
+                self._assign_dependencies(spec_reader, hash_key, installs, records)
+            except MissingDependenciesError:
+                raise
+            except Exception as e:
+                raise self._invalid_table_record(hash_key, e) from e
+
+        for hash_key in installs:
+            records[hash_key].spec._mark_root_concrete()
+
+    def _invalid_table_record(self, hash_key: str, error: Exception) -> "CorruptDatabaseError":
+        return CorruptDatabaseError(
+            f"Invalid record in Spack database: hash: {hash_key}, cause: "
+            f"{type(error).__name__}: {error}",
+            self._records_path,
+        )
+
+    def _read_snapshot(self, verifier: str) -> None:
+        """Read the records from the record table, or from the snapshot cache, if they are up
+        to date, or from index.json otherwise."""
+        self._generation += 1
+        if self._read_from_table(verifier):
+            return
+
+        if self._snapshot_path is None:
+            self._read_from_file(self._index_path)
+            return
+
+        # Get the modification time of index.json before reading it, so that a snapshot can
+        # only be outdated by the time it is written, and never match a newer index.json
+        try:
+            index_stat = self._index_stat()
+        except OSError:
+            index_stat = None
+        if index_stat is not None and self._read_from_cached_snapshot(verifier, index_stat):
+            return
+
+        self._read_from_file(self._index_path)
+        if index_stat is not None:
+            header = dict(
+                index_stat,
+                verifier=verifier,
+                version=str(_DB_VERSION),
+                journal=self._journal_id,
+                index_size=self._index_size,
+            )
+            self._write_cached_snapshot(header, self._record_dicts())
+
+    def reindex(self, directory_layout, jobs: int = 1, timer: timer.BaseTimer = timer.NULL_TIMER):
         """Build database index from scratch based on a directory layout.
 
         Locks the DB if it isn't locked already.
+
+        Args:
+            directory_layout: layout of the installations to be indexed
+            jobs: number of directories searched, and spec files read, concurrently
+            timer: timer of the ``discover``, ``read``, ``assemble`` and ``write`` phases
         """
         if self.is_upstream:
             raise UpstreamDatabaseLockingError("Cannot reindex an upstream database")
@@ -925,14 +2064,17 @@ def _read_suppress_error():
             try:
                 if os.path.isfile(self._index_path):
                     self._read_from_file(self._index_path)
+                    self._replay_journal()
             except CorruptDatabaseError as e:
                 self._error = e
                 self._data = {}
                 self._installed_prefixes = set()
 
-        transaction = lk.WriteTransaction(
-            self.lock, acquire=_read_suppress_error, release=self._write
-        )
+        def _write(type, value, traceback):
+            with timer.measure("write"):
+                self._write(type, value, traceback)
+
+        transaction = lk.WriteTransaction(self.lock, acquire=_read_suppress_error, release=_write)
 
         with transaction:
             if self._error:
@@ -942,7 +2084,7 @@ def _read_suppress_error():
             old_data = self._data
             old_installed_prefixes = self._installed_prefixes
             try:
-                self._construct_from_directory_layout(directory_layout, old_data)
+                self._construct_from_directory_layout(directory_layout, old_data, jobs, timer)
             except BaseException:
                 # If anything explodes, restore old data, skip write.
                 self._data = old_data
@@ -970,25 +2112,41 @@ def _construct_entry_from_directory_layout(
         if deprecator:
             self._deprecate(spec, deprecator)
 
-    def _construct_from_directory_layout(self, directory_layout, old_data):
+    def _construct_from_directory_layout(
+        self, directory_layout, old_data, jobs: int = 1, timer: timer.BaseTimer = timer.NULL_TIMER
+    ):
         # Read first the `spec.yaml` files in the prefixes. They should be
         # considered authoritative with respect to DB reindexing, as
         # entries in the DB may be corrupted in a way that still makes
         # them readable. If we considered DB entries authoritative
         # instead, we would perpetuate errors over a reindex.
-        with directory_layout.disable_upstream_check():
+        with directory_layout.disable_upstream_check(), directory_layout.cached_spec_reads():
+            # Find and read all the spec files up front, concurrently, so that adding the
+            # records below, and checking their dependencies are installed, does not touch
+            # the file system again
+            with timer.measure("discover"):
+                spec_files = directory_layout.spec_files(jobs)
+                deprecated_files = directory_layout.deprecated_spec_files(jobs)
+
+            with timer.measure("read"):
+                specs = directory_layout.read_specs(spec_files, jobs)
+                deprecated = directory_layout.read_deprecated_specs(deprecated_files, jobs)
+
+            timer.start("assemble")
+
             # Initialize data in the reconstructed DB
             self._data = {}
             self._installed_prefixes = set()
+            self._changed_keys = None
 
             # Start inspecting the installed prefixes
             processed_specs = set()
 
-            for spec in directory_layout.all_specs():
+            for spec in specs:
                 self._construct_entry_from_directory_layout(directory_layout, old_data, spec)
                 processed_specs.add(spec)
 
-            for spec, deprecator in directory_layout.all_deprecated_specs():
+            for spec, deprecator in deprecated:
                 self._construct_entry_from_directory_layout(
                     directory_layout, old_data, spec, deprecator
                 )
@@ -1025,6 +2183,7 @@ def _construct_from_directory_layout(self, directory_layout, old_data):
                     tty.debug(e)
 
             self._check_ref_counts()
+            timer.stop("assemble")
 
     def _check_ref_counts(self):
         """Ensure consistency of reference counts in the DB.
@@ -1055,6 +2214,11 @@ def _check_ref_counts(self):
                     % (key, found, expected, self._index_path)
                 )
 
+    def _changed(self, key: str) -> None:
+        """Record that the record with the given key was changed, added or removed."""
+        if self._changed_keys is not None:
+            self._changed_keys.add(key)
+
     def _write(self, type, value, traceback):
         """Write the in-memory database index to its file path.
 
@@ -1064,6 +2228,9 @@ def _write(self, type, value, traceback):
         database *may* be left in an inconsistent state.  It will be consistent
         after the start of the next transaction, when it read from disk again.
 
+        If the database is journaled, only the records changed since the database was
+        last read are appended to the journal, unless the journal grew too large.
+
         This routine does no locking.
         """
         # Do not write if exceptions were raised
@@ -1074,17 +2241,49 @@ def _write(self, type, value, traceback):
             self._state_is_inconsistent = True
             return
 
+        if self.journal and self._journal_id is not None and self._changed_keys is not None:
+            if self._write_journal(self._changed_keys):
+                self._changed_keys = set()
+                return
+
+        journal_id = str(uuid.uuid4()) if self.journal else None
+        installs = self._record_dicts()
         temp_file = self._index_path + (".%s.%s.temp" % (socket.getfqdn(), os.getpid()))
 
         # Write a temporary database file them move it into place
         try:
             with open(temp_file, "w") as f:
-                self._write_to_file(f)
+                self._write_to_file(f, journal_id=journal_id, installs=installs)
+            index_size = os.path.getsize(temp_file)
             fs.rename(temp_file, self._index_path)
 
+            # Start the journal of the new index.json only once the index is in place: a
+            # leftover journal is ignored, since its id is not the one of the index.
+            if journal_id is not None:
+                self._start_journal(journal_id)
+            elif os.path.exists(self._journal_path):
+                os.remove(self._journal_path)
+
+            new_verifier = str(uuid.uuid4()) if _use_uuid else ""
+            header = {
+                "version": str(_DB_VERSION),
+                "verifier": new_verifier,
+                "journal": journal_id,
+                "index_size": index_size,
+            }
+            if _use_uuid:
+                # The record table is valid only for the verifier it was written with
+                if self.binary_index:
+                    self._write_table(self._table_path, header, installs)
+                elif os.path.exists(self._table_path):
+                    os.remove(self._table_path)
+
+            # Readers prefer the record table in the database directory, if written
+            if self._snapshot_path is not None and not self.binary_index:
+                self._write_cached_snapshot(dict(header, **self._index_stat()), installs)
+
             if _use_uuid:
                 with open(self._verifier_path, "w") as f:
-                    new_verifier = str(uuid.uuid4())
                     f.write(new_verifier)
                     self.last_seen_verifier = new_verifier
         except BaseException as e:
@@ -1094,8 +2293,173 @@ def _write(self, type, value, traceback):
                 os.remove(temp_file)
             raise
 
+        self._journal_id = journal_id
+        self._index_size = index_size
+        self._changed_keys = set()
+
+    def _write_table(
+        self, path: str, header: Dict[str, Any], installs: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """Write a record table, i.e. a binary copy of index.json, to the given path."""
+        installed_prefixes = [
+            rec["path"]
+            for rec in installs.values()
+            if rec.get("installed") and "external" not in rec["spec"]
+        ]
+        temp_file = path + (".%s.%s.temp" % (socket.getfqdn(), os.getpid()))
+        try:
+            with open(temp_file, "wb") as f:
+                RecordTable.write(f, header, installs, installed_prefixes)
+            fs.rename(temp_file, path)
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+
+    def _start_journal(self, journal_id: str) -> None:
+        """Replace the journal with an empty one, for the index.json with the given id."""
+        header = (sjson.dump({"journal": journal_id}) + "\n").encode()
+        temp_file = self._journal_path + (".%s.%s.temp" % (socket.getfqdn(), os.getpid()))
+        try:
+            with open(temp_file, "wb") as f:
+                f.write(header)
+            fs.rename(temp_file, self._journal_path)
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+        self._journal_offset = len(header)
+
+    def _write_journal(self, keys: Set[str]) -> bool:
+        """Append the current state of the records with the given keys to the journal.
+
+        Return:
+            ``False`` if nothing was written, because the journal has to be compacted into
+            a new index.json instead
+        """
+        lines = []
+        for key in sorted(keys):
+            rec = self._data.get(key)
+            record = rec.to_dict(include_fields=self.record_fields) if rec else None
+            lines.append(sjson.dump({"hash": key, "record": record}) + "\n")
+        data = "".join(lines).encode()
+
+        size = self._journal_offset + len(data)
+        if size > _JOURNAL_COMPACTION_RATIO * self._index_size:
+            return False
+
+        # Overwrite anything past the entries already replayed, i.e. a partial entry left
+        # by an interrupted write.
+        try:
+            with open(self._journal_path, "r+b") as f:
+                f.seek(self._journal_offset)
+                f.truncate()
+                f.write(data)
+        except FileNotFoundError:
+            return False
+        self._journal_offset = size
+        return True
+
+    def _replay_journal(self) -> None:
+        """Apply to the records in memory the entries appended to the journal of the last
+        index.json read since the journal was last replayed.
+
+        Does not do any locking.
+        """
+        if self._journal_id is None:
+            return
+
+        try:
+            with open(self._journal_path, "rb") as f:
+                f.seek(self._journal_offset)
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+
+        # An incomplete last line is an entry still being written, or whose write was
+        # interrupted, so it is not applied.
+        data = data[: data.rfind(b"\n") + 1]
+        if not data:
+            return
+
+        try:
+            entries = [sjson.load(line.decode("utf-8")) for line in data.splitlines()]
+        except ValueError as e:
+            raise CorruptDatabaseError("error parsing database journal:", str(e)) from e
+
+        if self._journal_offset == 0:
+            header = entries.pop(0)
+            if header.get("journal") != self._journal_id:
+                # The journal belongs to another index.json
+                self._journal_id = None
+                return
+        self._journal_offset += len(data)
+
+        # Only the last state of each record matters
+        installs: Dict[str, Optional[Dict[str, Any]]] = {}
+        for entry in entries:
+            installs[entry["hash"]] = entry["record"]
+        if installs:
+            self._generation += 1
+
+        try:
+            self._apply_journal_entries(installs)
+        except MissingDependenciesError:
+            raise
+        except Exception as e:
+            raise CorruptDatabaseError(
+                f"Invalid entry in Spack database journal: {type(e).__name__}: {e}",
+                self._journal_path,
+            ) from e
+
+    def _apply_journal_entries(self, installs: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """Update the records in memory with the records read from the journal, where a
+        record of ``None`` means that the record was removed."""
+        spec_reader = reader(_DB_VERSION)
+        indexes = self._query_indexes()
+
+        added = []
+        for hash_key, rec_dict in installs.items():
+            old = self._data.get(hash_key)
+            if old is not None and not old.spec.external and old.installed:
+                self._installed_prefixes.discard(old.path)
+
+            if rec_dict is None:
+                if old is not None:
+                    indexes.remove(hash_key, old)
+                    del self._data[hash_key]
+                    old.spec.detach(deptype=_TRACKED_DEPENDENCIES)
+                continue
+
+            # Records that were already known keep their spec, which is shared with
+            # the specs of their dependents
+            if old is not None:
+                rec = InstallRecord.from_dict(old.spec, rec_dict)
+            else:
+                spec = self._read_spec_from_dict(spec_reader, hash_key, installs)
+                rec = InstallRecord.from_dict(spec, rec_dict)
+                added.append(hash_key)
+
+            self._data[hash_key] = rec
+            if old is not None:
+                indexes.add(hash_key, rec)
+            if not rec.spec.external and rec.installed:
+                self._installed_prefixes.add(rec.path)
+
+        # Connect and mark concrete the new specs, as when reading index.json, and index
+        # them once they know their dependencies
+        for hash_key in added:
+            self._assign_dependencies(spec_reader, hash_key, installs, self._data)
+        for hash_key in added:
+            self._data[hash_key].spec._mark_root_concrete()
+            indexes.add(hash_key, self._data[hash_key])
+
     def _read(self):
         """Re-read Database from the data in the set location. This does no locking."""
+        if self._upstreams is not None:
+            self._upstreams.refresh()
+        if self.is_upstream:
+            self._read_stamp = self._file_stamp()
         if os.path.isfile(self._index_path):
             current_verifier = ""
             if _use_uuid:
@@ -1107,10 +2471,11 @@ def _read(self):
             if (current_verifier != self.last_seen_verifier) or (current_verifier == ""):
                 self.last_seen_verifier = current_verifier
                 # Read from file if a database exists
-                self._read_from_file(self._index_path)
+                self._read_snapshot(current_verifier)
             elif self._state_is_inconsistent:
-                self._read_from_file(self._index_path)
+                self._read_snapshot(current_verifier)
                 self._state_is_inconsistent = False
+            self._replay_journal()
             return
         elif self.is_upstream:
             tty.warn("upstream not found: {0}".format(self._index_path))
@@ -1216,6 +2581,7 @@ def _add(
                 new_spec._add_dependency(record.spec, depflag=dep.depflag, virtuals=dep.virtuals)
                 if not upstream:
                     record.ref_count += 1
+                    self._changed(dkey)
 
             # Mark concrete once everything is built, and preserve
             # the original hashes of concrete specs.
@@ -1229,6 +2595,8 @@ def _add(
             self._data[key].installation_time = _now()
 
         self._data[key].explicit = explicit
+        self._query_indexes().add(key, self._data[key])
+        self._changed(key)
 
     @_autospec
     def add(self, spec, directory_layout, explicit=False):
@@ -1269,8 +2637,10 @@ def _decrement_ref_count(self, spec):
 
         rec = self._data[key]
         rec.ref_count -= 1
+        self._changed(key)
 
         if rec.ref_count == 0 and not rec.installed:
+            self._query_indexes().remove(key, rec)
             del self._data[key]
 
             for dep in spec.dependencies(deptype=_TRACKED_DEPENDENCIES):
@@ -1284,11 +2654,13 @@ def _increment_ref_count(self, spec):
 
         rec = self._data[key]
         rec.ref_count += 1
+        self._changed(key)
 
     def _remove(self, spec):
         """Non-locking version of remove(); does real work."""
         key = self._get_matching_spec_key(spec)
         rec = self._data[key]
+        self._changed(key)
 
         # This install prefix is now free for other specs to use, even if the
         # spec is only marked uninstalled.
@@ -1299,6 +2671,7 @@ def _remove(self, spec):
             rec.installed = False
             return rec.spec
 
+        self._query_indexes().remove(key, rec)
         del self._data[key]
 
         # Remove any reference to this node from dependencies and
@@ -1331,6 +2704,29 @@ def remove(self, spec):
         with self.write_transaction():
             return self._remove(spec)
 
+    def remove_many(self, specs: List["spack.spec.Spec"]) -> List["spack.spec.Spec"]:
+        """Removes many specs from the database, in a single write transaction, so that
+        the index is written only once.
+
+        Specs are removed as with ``remove()``, dependents before their dependencies.
+
+        Args:
+            specs: concrete specs to be removed
+
+        Return:
+            the removed specs, in the order they were removed
+        """
+        hashes = set(s.dag_hash() for s in specs)
+        ordered = [
+            s
+            for s in tr.traverse_nodes(
+                specs, order="topo", direction="children", root=True, cover="nodes", deptype="all"
+            )
+            if s.dag_hash() in hashes
+        ]
+        with self.write_transaction():
+            return [self._remove(spec) for spec in ordered]
+
     def deprecator(self, spec):
         """Return the spec that the given spec is deprecated for, or None"""
         with self.read_transaction():
@@ -1365,6 +2761,7 @@ def _deprecate(self, spec, deprecator):
         spec_rec.deprecated_for = deprecator_key
         spec_rec.installed = False
         self._data[spec_key] = spec_rec
+        self._changed(spec_key)
 
     @_autospec
     def mark(self, spec, key, value):
@@ -1373,8 +2770,9 @@ def mark(self, spec, key, value):
             return self._mark(spec, key, value)
 
     def _mark(self, spec, key, value):
-        record = self._data[self._get_matching_spec_key(spec)]
-        setattr(record, key, value)
+        spec_key = self._get_matching_spec_key(spec)
+        setattr(self._data[spec_key], key, value)
+        self._changed(spec_key)
 
     @_autospec
     def deprecate(self, spec, deprecator):
@@ -1396,20 +2794,20 @@ def installed_relatives(
 
         relatives = set()
         for spec in self.query(spec):
+            if direction == "parents":
+                relatives.update(self.installed_dependents([spec], deptype, transitive))
+                continue
+
             if transitive:
                 to_add = spec.traverse(direction=direction, root=False, deptype=deptype)
-            elif direction == "parents":
-                to_add = spec.dependents(deptype=deptype)
-            else:  # direction == 'children'
+            else:
                 to_add = spec.dependencies(deptype=deptype)
 
             for relative in to_add:
                 hash_key = relative.dag_hash()
                 upstream, record = self.query_by_spec_hash(hash_key)
                 if not record:
-                    reltype = "Dependent" if direction == "parents" else "Dependency"
-                    msg = "Inconsistent state! %s %s of %s not in DB" % (
-                        reltype,
+                    msg = "Inconsistent state! Dependency %s of %s not in DB" % (
                         hash_key,
                         spec.dag_hash(),
                     )
@@ -1424,6 +2822,70 @@ def installed_relatives(
                 relatives.add(relative)
         return relatives
 
+    def _dependent_keys(
+        self, keys: List[str], depflag: dt.DepFlag, transitive: bool = True
+    ) -> List[str]:
+        """Keys of the records depending on any of the given ones, through dependencies of
+        the given types, in breadth first order, excluding the given ones. Dependents are
+        looked up in this database and its upstreams.
+
+        Does no locking.
+        """
+        databases = [self] + self.upstream_dbs
+        seen = set(keys)
+        result: List[str] = []
+        current = list(keys)
+        while current:
+            following = []
+            for key in current:
+                for db in databases:
+                    for dependent in db._query_indexes().dependents(key, depflag):
+                        if dependent not in seen:
+                            seen.add(dependent)
+                            following.append(dependent)
+            result.extend(following)
+            current = following if transitive else []
+        return result
+
+    def installed_dependents(
+        self,
+        specs: List["spack.spec.Spec"],
+        deptype: Union[dt.DepFlag, dt.DepTypes] = dt.ALL,
+        transitive: bool = True,
+    ) -> List["spack.spec.Spec"]:
+        """Return the installed specs depending on any of the given specs, through
+        dependencies of the given types, in breadth first order. The given specs are not
+        part of the result.
+
+        Dependents are found with an index of the dependents of each record, so only the
+        records depending on the given specs are read.
+
+        Args:
+            specs: specs whose dependents are returned
+            deptype: types of dependencies to follow
+            transitive: whether to return the dependents of the dependents, and so on
+        """
+        if not isinstance(deptype, dt.DepFlag):
+            deptype = dt.canonicalize(deptype)
+        keys = [s.dag_hash() for s in specs]
+        result = []
+        with self.read_transaction():
+            for hash_key in self._dependent_keys(keys, deptype, transitive):
+                upstream, record = self.query_by_spec_hash(hash_key)
+                if not record:
+                    msg = "Inconsistent state! Dependent %s of %s not in DB" % (
+                        hash_key,
+                        ", ".join(keys),
+                    )
+                    if self._fail_when_missing_deps:
+                        raise MissingDependenciesError(msg)
+                    tty.warn(msg)
+                    continue
+
+                if record.installed:
+                    result.append(record.spec)
+        return result
+
     @_autospec
     def installed_extensions_for(self, extendee_spec):
         """Returns the specs of all packages that extend the given spec"""
@@ -1442,10 +2904,12 @@ def _get_by_hash_local(self, dag_hash, default=None, installed=any):
 
         # check if hash is a prefix of some installed (or previously
         # installed) spec.
+        if isinstance(self._data, LazyRecords):
+            keys = self._data.keys_with_prefix(dag_hash)
+        else:
+            keys = [h for h in self._data if h.startswith(dag_hash)]
         matches = [
-            record.spec
-            for h, record in self._data.items()
-            if h.startswith(dag_hash) and record.install_type_matches(installed)
+            self._data[h].spec for h in keys if self._data[h].install_type_matches(installed)
         ]
         if matches:
             return matches
@@ -1545,19 +3009,13 @@ def _query(
                 else:
                     return []
 
-        # Abstract specs require more work -- currently we test
-        # against everything.
-        results = []
-        start_date = start_date or datetime.datetime.min
-        end_date = end_date or datetime.datetime.max
-
-        # save specs whose name doesn't match for last, to avoid a virtual check
-        deferred = []
-
-        for key, rec in self._data.items():
-            if hashes is not None and rec.spec.dag_hash() not in hashes:
-                continue
+        # Abstract specs require more work -- narrow down the records to check
+        # with the indexes, then test against each of them.
+        keys = self._candidate_keys(query_spec, explicit, start_date, end_date, hashes)
 
+        results = []
+        for key in keys:
+            rec = self._data[key]
             if origin and not (origin == rec.origin):
                 continue
 
@@ -1573,31 +3031,8 @@ def _query(
             if known is not any and known(rec.spec.name):
                 continue
 
-            if start_date or end_date:
-                inst_date = datetime.datetime.fromtimestamp(rec.installation_time)
-                if not (start_date < inst_date < end_date):
-                    continue
-
-            if query_spec is any:
+            if query_spec is any or rec.spec.satisfies(query_spec):
                 results.append(rec.spec)
-                continue
-
-            # check anon specs and exact name matches first
-            if not query_spec.name or rec.spec.name == query_spec.name:
-                if rec.spec.satisfies(query_spec):
-                    results.append(rec.spec)
-
-            # save potential virtual matches for later, but not if we already found a match
-            elif not results:
-                deferred.append(rec.spec)
-
-        # Checking for virtuals is expensive, so we save it for last and only if needed.
-        # If we get here, we didn't find anything in the DB that matched by name.
-        # If we did fine something, the query spec can't be virtual b/c we matched an actual
-        # package installation, so skip the virtual check entirely. If we *didn't* find anything,
-        # check all the deferred specs *if* the query is virtual.
-        if not results and query_spec is not any and deferred and query_spec.virtual:
-            results = [spec for spec in deferred if spec.satisfies(query_spec)]
 
         return results
 
@@ -1605,6 +3040,136 @@ def _query(
         _query.__doc__ = ""
     _query.__doc__ += _QUERY_DOCSTRING
 
+    def _candidate_keys(
+        self, query_spec, explicit=any, start_date=None, end_date=None, hashes=None
+    ) -> Iterable[str]:
+        """Keys of the records that may match a query, narrowed down with the indexes."""
+        indexes = self._query_indexes()
+        candidates: List[Container[str]] = []
+        if hashes is not None:
+            candidates.append(dict.fromkeys(hashes))
+        if explicit is True:
+            candidates.append(indexes.explicit)
+        if start_date or end_date:
+            start, end = _timestamp(start_date, -math.inf), _timestamp(end_date, math.inf)
+            candidates.append(indexes.installed_between(start, end))
+
+        # Virtual specs are matched by the installations of their providers, if no
+        # installation has the name of the query spec.
+        names = None
+        if query_spec is not any and query_spec.name:
+            names = [query_spec.name]
+            if query_spec.name not in indexes.by_name and query_spec.virtual:
+                providers = spack.repo.PATH.provider_index.providers_for(query_spec.name)
+                names = list(dict.fromkeys(p.name for p in providers))
+            candidates.append({k: None for n in names for k in indexes.by_name.get(n, {})})
+
+        if not candidates:
+            return self._data
+        smallest = min(candidates, key=len)
+        return [
+            k
+            for k in smallest
+            if k in self._data and all(k in c for c in candidates if c is not smallest)
+        ]
+
+    def _record_row(self, key: str) -> RecordRow:
+        if isinstance(self._data, LazyRecords):
+            return self._data.row(key)
+        return _row_from_record(key, self._data[key])
+
+    def _query_rows(
+        self, query_spec=any, installed=True, explicit=any, hashes=None
+    ) -> List[RecordRow]:
+        """Non-locking version of ``query_rows()`` on this database only."""
+        indexes = self._query_indexes()
+        if query_spec is not any and query_spec.name not in indexes.by_name:
+            # Providers of virtual specs need their specs to check the provided versions
+            if query_spec.name and query_spec.virtual:
+                specs = self._query(query_spec, installed=installed, explicit=explicit)
+                return [self._record_row(s.dag_hash()) for s in specs]
+
+        versions, prefix = None, None
+        if query_spec is not any:
+            if query_spec.versions != vn.any_version:
+                versions = query_spec.versions
+            prefix = query_spec.abstract_hash
+
+        rows = []
+        for key in self._candidate_keys(query_spec, explicit, hashes=hashes):
+            if prefix and not key.startswith(prefix):
+                continue
+            row = self._record_row(key)
+            if not row.install_type_matches(installed):
+                continue
+            if explicit is not any and row.explicit != explicit:
+                continue
+            if versions and not vn.VersionList([vn.ver(row.version)]).satisfies(versions):
+                continue
+            rows.append(row)
+        return rows
+
+    def query_rows(
+        self, query_spec=any, installed=True, explicit=any, hashes=None, install_tree="all"
+    ) -> List[RecordRow]:
+        """Query this database and its upstreams like ``query()``, but return the rows of
+        the matching records, without materializing their specs when records are read
+        lazily.
+
+        Args:
+            query_spec: spec, or string, constraining at most the name, version and hash
+                of the records, see ``is_simple_query()``
+            installed: install status of the records, as in ``query()``
+            explicit: whether the records were installed explicitly, or ``any``
+            hashes: hashes of the records to consider, or ``None`` for all
+            install_tree: 'all' (default), 'local', 'upstream', or upstream path
+
+        Return:
+            the rows of the matching records, without duplicates, in no particular order
+        """
+        if query_spec is not any and not isinstance(query_spec, spack.spec.Spec):
+            query_spec = spack.spec.Spec(query_spec)
+        if not is_simple_query(query_spec):
+            raise ValueError(f"cannot query rows with '{query_spec}'")
+
+        trees = self._install_trees(install_tree)
+        if trees is None:
+            return []
+        upstreams, local = trees
+        if upstreams:
+            self._upstream_index().refresh()
+        if upstreams and query_spec is not any:
+            candidates = self._upstream_index().candidates(query_spec)
+            if candidates is not None:
+                upstreams = [u for u in upstreams if u in candidates]
+
+        rows: Dict[str, RecordRow] = {}
+        if local:
+            with self.read_transaction():
+                rows.update(
+                    (row.hash, row)
+                    for row in self._query_rows(query_spec, installed, explicit, hashes)
+                )
+        for upstream_db in upstreams:
+            for row in upstream_db._query_rows(query_spec, installed, explicit, hashes):
+                rows.setdefault(row.hash, row)
+        return list(rows.values())
+
+    def _install_trees(self, install_tree: str) -> Optional[Tuple[List["Database"], bool]]:
+        """Upstream databases to query for the install_tree argument of queries, and
+        whether to query this database, or None if the argument is invalid."""
+        valid_trees = ["all", "upstream", "local", self.root] + [u.root for u in self.upstream_dbs]
+        if install_tree not in valid_trees:
+            msg = "Invalid install_tree argument to Database.query()\n"
+            msg += f"Try one of {', '.join(valid_trees)}"
+            tty.error(msg)
+            return None
+
+        upstreams = self.upstream_dbs
+        if install_tree not in ("all", "upstream"):
+            upstreams = [u for u in self.upstream_dbs if u.root == install_tree]
+        return upstreams, install_tree in ("all", "local") or self.root == install_tree
+
     def query_local(self, *args, **kwargs):
         """Query only the local Spack database.
 
@@ -1625,18 +3190,27 @@ def query(self, *args, **kwargs):
         Additional Arguments:
             install_tree (str): query 'all' (default), 'local', 'upstream', or upstream path
         """
-        install_tree = kwargs.pop("install_tree", "all")
-        valid_trees = ["all", "upstream", "local", self.root] + [u.root for u in self.upstream_dbs]
-        if install_tree not in valid_trees:
-            msg = "Invalid install_tree argument to Database.query()\n"
-            msg += f"Try one of {', '.join(valid_trees)}"
-            tty.error(msg)
+        trees = self._install_trees(kwargs.pop("install_tree", "all"))
+        if trees is None:
             return []
 
         upstream_results = []
-        upstreams = self.upstream_dbs
-        if install_tree not in ("all", "upstream"):
-            upstreams = [u for u in self.upstream_dbs if u.root == install_tree]
+        upstreams, local = trees
+        if upstreams:
+            self._upstream_index().refresh()
+        query_spec = args[0] if args else kwargs.get("query_spec", any)
+        if upstreams and query_spec is not any:
+            # Parse the query spec once for all the databases, and query only the upstreams
+            # that have records of its hash, or of its package
+            if not isinstance(query_spec, spack.spec.Spec):
+                query_spec = spack.spec.Spec(query_spec)
+                if args:
+                    args = (query_spec,) + args[1:]
+                else:
+                    kwargs["query_spec"] = query_spec
+            candidates = self._upstream_index().candidates(query_spec)
+            if candidates is not None:
+                upstreams = [u for u in upstreams if u in candidates]
         for upstream_db in upstreams:
             # queries for upstream DBs need to *not* lock - we may not
             # have permissions to do this and the upstream DBs won't know about
@@ -1644,7 +3218,7 @@ def query(self, *args, **kwargs):
             upstream_results.extend(upstream_db._query(*args, **kwargs) or [])
 
         local_results = []
-        if install_tree in ("all", "local") or self.root == install_tree:
+        if local:
             local_results = set(self.query_local(*args, **kwargs))
 
         results = list(local_results) + list(x for x in upstream_results if x not in local_results)
@@ -1696,17 +3270,19 @@ def unused_specs(
                 considered needed. By default only link and run dependency types are considered.
         """
 
-        def root(key, record):
-            """Whether a DB record is a root for garbage collection."""
-            return key in root_hashes if root_hashes is not None else record.explicit
-
         with self.read_transaction():
-            roots = [rec.spec for key, rec in self._data.items() if root(key, rec)]
-            needed = set(id(spec) for spec in tr.traverse_nodes(roots, deptype=deptype))
+            # Look up the roots by key, so that only the records needed by the roots, and
+            # those that are not, are read
+            if root_hashes is None:
+                root_keys: Iterable[str] = self._query_indexes().explicit
+            else:
+                root_keys = [key for key in self._data if key in root_hashes]
+            roots = [self._data[key].spec for key in root_keys]
+            needed = {s.dag_hash() for s in tr.traverse_nodes(roots, deptype=deptype)}
             return [
-                rec.spec
-                for rec in self._data.values()
-                if id(rec.spec) not in needed and rec.installed
+                self._data[key].spec
+                for key in self._data
+                if key not in needed and self._data[key].installed
             ]
 
     def update_explicit(self, spec, explicit):
@@ -1726,6 +3302,10 @@ def update_explicit(self, spec, explicit):
                 status = "explicit" if explicit else "implicit"
                 tty.debug(message.format(status, s=spec))
                 rec.explicit = explicit
+                key = rec.spec.dag_hash()
+                if self._data.get(key) is rec:
+                    self._query_indexes().add(key, rec)
+                    self._changed(key)
 
 
 class UpstreamDatabaseLockingError(SpackError):
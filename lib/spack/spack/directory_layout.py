@@ -3,6 +3,7 @@
 #
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
 
+import concurrent.futures
 import errno
 import glob
 import os
@@ -12,6 +13,7 @@
 import sys
 from contextlib import contextmanager
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple, TypeVar
 
 import llnl.util.filesystem as fs
 import llnl.util.tty as tty
@@ -39,6 +41,20 @@ def _check_concrete(spec):
         raise ValueError("Specs passed to a DirectoryLayout must be concrete!")
 
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _concurrent_map(fn: Callable[[T], R], items: List[T], jobs: int) -> List[R]:
+    """Apply ``fn`` to every item with up to ``jobs`` threads, and return the results in
+    the order of the items. Reading install trees is dominated by file system latency,
+    which threads overlap without paying for sending specs back from other processes."""
+    if jobs <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(fn, items))
+
+
 class DirectoryLayout:
     """A directory layout is used to associate unique paths with specs.
     Different installations are going to want different layouts for their
@@ -97,6 +113,9 @@ def __init__(self, root, **kwargs):
         self.packages_dir = "repos"  # archive of package.py files
         self.manifest_file_name = "install_manifest.json"
 
+        # Specs read from their files, by normalized path, within cached_spec_reads()
+        self._spec_cache: Optional[Dict[str, "spack.spec.Spec"]] = None
+
     @property
     def hidden_file_regexes(self):
         return ("^{0}$".format(re.escape(self.metadata_dir)),)
@@ -128,6 +147,16 @@ def write_host_environment(self, spec):
 
     def read_spec(self, path):
         """Read the contents of a file and parse them as a spec"""
+        if self._spec_cache is not None:
+            key = os.path.normpath(path)
+            spec = self._spec_cache.get(key)
+            if spec is None:
+                spec = self._read_spec(path)
+                self._spec_cache[key] = spec
+            return spec
+        return self._read_spec(path)
+
+    def _read_spec(self, path):
         try:
             with open(path) as f:
                 extension = os.path.splitext(path)[-1].lower()
@@ -217,6 +246,18 @@ def disable_upstream_check(self):
         yield
         self.check_upstream = True
 
+    @contextmanager
+    def cached_spec_reads(self):
+        """Within this context every spec file is read at most once, and the install
+        prefixes whose spec files were read are assumed to exist. Meant for reindexing,
+        where the specs of the dependencies of an installation are checked against the
+        spec files that were all read up front."""
+        self._spec_cache = {}
+        try:
+            yield
+        finally:
+            self._spec_cache = None
+
     def metadata_path(self, spec):
         return os.path.join(spec.prefix, self.metadata_dir)
 
@@ -255,12 +296,15 @@ def ensure_installed(self, spec):
         path = self.path_for_spec(spec)
         spec_file_path = self.spec_file_path(spec)
 
-        if not os.path.isdir(path):
+        read = (
+            self._spec_cache is not None and os.path.normpath(spec_file_path) in self._spec_cache
+        )
+        if not read and not os.path.isdir(path):
             raise InconsistentInstallDirectoryError(
                 "Install prefix {0} does not exist.".format(path)
             )
 
-        if not os.path.isfile(spec_file_path):
+        if not read and not os.path.isfile(spec_file_path):
             raise InconsistentInstallDirectoryError(
                 "Install prefix exists but contains no spec.json:", "  " + path
             )
@@ -271,46 +315,73 @@ def ensure_installed(self, spec):
                 "Spec file in %s does not match hash!" % spec_file_path
             )
 
-    def all_specs(self):
-        if not os.path.isdir(self.root):
-            return []
-
-        specs = []
-        for _, path_scheme in self.projections.items():
-            path_elems = ["*"] * len(path_scheme.split(posixpath.sep))
-            # NOTE: Does not validate filename extension; should happen later
-            path_elems += [self.metadata_dir, "spec.json"]
-            pattern = os.path.join(self.root, *path_elems)
-            spec_files = glob.glob(pattern)
-            if not spec_files:  # we're probably looking at legacy yaml...
-                path_elems += [self.metadata_dir, "spec.yaml"]
-                pattern = os.path.join(self.root, *path_elems)
-                spec_files = glob.glob(pattern)
-            specs.extend([self.read_spec(s) for s in spec_files])
-        return specs
-
-    def all_deprecated_specs(self):
+    def _glob_prefixes(self, *path_elems: str, jobs: int = 1) -> List[str]:
+        """Paths matching ``path_elems`` relative to the installation prefixes of every
+        projection. The top level directories of the layout are searched concurrently.
+        """
         if not os.path.isdir(self.root):
             return []
 
-        deprecated_specs = set()
+        # Like glob, skip hidden directories such as the one of the database
+        top_level = sorted(
+            entry.name
+            for entry in os.scandir(self.root)
+            if not entry.name.startswith(".") and entry.is_dir()
+        )
+        patterns = []
         for _, path_scheme in self.projections.items():
-            path_elems = ["*"] * len(path_scheme.split(posixpath.sep))
-            # NOTE: Does not validate filename extension; should happen later
-            path_elems += [
-                self.metadata_dir,
-                self.deprecated_dir,
-                "*_spec.*",
-            ]  # + self.spec_file_name]
-            pattern = os.path.join(self.root, *path_elems)
-            spec_files = glob.glob(pattern)
-            get_depr_spec_file = lambda x: os.path.join(
-                os.path.dirname(os.path.dirname(x)), self.spec_file_name
+            depth = len(path_scheme.split(posixpath.sep))
+            patterns.extend(
+                os.path.join(self.root, glob.escape(top), *(["*"] * (depth - 1)), *path_elems)
+                for top in top_level
             )
-            deprecated_specs |= set(
-                (self.read_spec(s), self.read_spec(get_depr_spec_file(s))) for s in spec_files
+        return [path for paths in _concurrent_map(glob.glob, patterns, jobs) for path in paths]
+
+    def spec_files(self, jobs: int = 1) -> List[str]:
+        """Paths of the spec files of all the installations in the layout.
+
+        Args:
+            jobs: number of directories searched concurrently
+        """
+        # NOTE: Does not validate filename extension; should happen later
+        spec_files = self._glob_prefixes(self.metadata_dir, self.spec_file_name, jobs=jobs)
+        if not spec_files:  # we're probably looking at legacy yaml...
+            spec_files = self._glob_prefixes(
+                self.metadata_dir, self._spec_file_name_yaml, jobs=jobs
             )
-        return deprecated_specs
+        return spec_files
+
+    def deprecated_spec_files(self, jobs: int = 1) -> List[str]:
+        """Paths of the spec files of all the deprecated installations in the layout.
+
+        Args:
+            jobs: number of directories searched concurrently
+        """
+        # NOTE: Does not validate filename extension; should happen later
+        return self._glob_prefixes(self.metadata_dir, self.deprecated_dir, "*_spec.*", jobs=jobs)
+
+    def read_specs(self, paths: List[str], jobs: int = 1) -> List["spack.spec.Spec"]:
+        """Read the specs in the given files, up to ``jobs`` of them at the same time."""
+        return _concurrent_map(self.read_spec, paths, jobs)
+
+    def read_deprecated_specs(
+        self, paths: List[str], jobs: int = 1
+    ) -> Set[Tuple["spack.spec.Spec", "spack.spec.Spec"]]:
+        """Read the deprecated specs in the given files, together with the specs that
+        deprecated them, up to ``jobs`` files at the same time."""
+        deprecators = [
+            os.path.join(os.path.dirname(os.path.dirname(path)), self.spec_file_name)
+            for path in paths
+        ]
+        return set(zip(self.read_specs(paths, jobs), self.read_specs(deprecators, jobs)))
+
+    def all_specs(self, jobs: int = 1) -> List["spack.spec.Spec"]:
+        return self.read_specs(self.spec_files(jobs), jobs)
+
+    def all_deprecated_specs(
+        self, jobs: int = 1
+    ) -> Set[Tuple["spack.spec.Spec", "spack.spec.Spec"]]:
+        return self.read_deprecated_specs(self.deprecated_spec_files(jobs), jobs)
 
     def specs_by_hash(self):
         by_hash = {}
@@ -383,6 +454,31 @@ def remove_install_directory(self, spec, deprecated=False):
                         raise e
             path = os.path.dirname(path)
 
+    def remove_install_directories(
+        self, specs: List["spack.spec.Spec"], deprecated: Set[str] = frozenset(), jobs: int = 1
+    ) -> Dict[str, "RemoveFailedError"]:
+        """Removes many prefixes, and the parent directories left empty, with up to
+        ``jobs`` threads.
+
+        Args:
+            specs: specs whose prefixes are removed
+            deprecated: hashes of the specs that are deprecated
+            jobs: number of prefixes removed concurrently
+
+        Return:
+            the errors of the prefixes that could not be removed, by hash of their spec
+        """
+
+        def _remove(spec: "spack.spec.Spec") -> Optional[RemoveFailedError]:
+            try:
+                self.remove_install_directory(spec, spec.dag_hash() in deprecated)
+            except RemoveFailedError as e:
+                return e
+            return None
+
+        errors = _concurrent_map(_remove, specs, jobs)
+        return {spec.dag_hash(): e for spec, e in zip(specs, errors) if e is not None}
+
 
 class DirectoryLayoutError(SpackError):
     """Superclass for directory layout errors."""
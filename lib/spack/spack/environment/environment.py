@@ -6,6 +6,7 @@
 import collections.abc
 import contextlib
 import copy
+import itertools
 import os
 import pathlib
 import re
@@ -1650,16 +1651,29 @@ def _concretize_separately(self, tests=False):
             msg += f" pool with {num_procs} processes"
         tty.msg(msg)
 
-        batch = []
-        for j, (i, concrete, duration) in enumerate(
-            spack.util.parallel.imap_unordered(
+        if spack.config.get("concretizer:multi_shot", False) and len(args) > 1:
+            # Roots leading to the same problem are solved in a single process
+            tasks = _multi_shot_batches(args)
+            results = itertools.chain.from_iterable(
+                spack.util.parallel.imap_unordered(
+                    _concretize_multi_shot_task,
+                    tasks,
+                    processes=min(len(tasks), num_procs),
+                    debug=tty.is_debug(),
+                    maxtaskperchild=1,
+                )
+            )
+        else:
+            results = spack.util.parallel.imap_unordered(
                 _concretize_task,
                 args,
                 processes=num_procs,
                 debug=tty.is_debug(),
                 maxtaskperchild=1,
             )
-        ):
+
+        batch = []
+        for j, (i, concrete, duration) in enumerate(results):
             batch.append((i, concrete))
             percentage = (j + 1) / len(args) * 100
             tty.verbose(
@@ -2491,8 +2505,8 @@ def display_specs(specs):
     print(tree_string)
 
 
-def _concretize_from_constraints(spec_constraints, tests=False):
-    # Accept only valid constraints from list and concretize spec
+def _root_spec_from_constraints(spec_constraints):
+    # Accept only valid constraints from list
     # Get the named spec even if out of order
     root_spec = [s for s in spec_constraints if s.name]
     if len(root_spec) != 1:
@@ -2500,6 +2514,12 @@ def _concretize_from_constraints(spec_constraints, tests=False):
         m += "concretization target. all specs must have a single name "
         m += "constraint for concretization."
         raise InvalidSpecConstraintError(m)
+    return root_spec[0]
+
+
+def _concretize_from_constraints(spec_constraints, tests=False):
+    # Accept only valid constraints from list and concretize spec
+    root_spec = [_root_spec_from_constraints(spec_constraints)]
     spec_constraints.remove(root_spec[0])
 
     invalid_constraints = []
@@ -2540,6 +2560,63 @@ def _concretize_task(packed_arguments) -> Tuple[int, Spec, float]:
         return index, spec, time.time() - start
 
 
+def _multi_shot_root(spec_constraints: List[Spec]) -> Spec:
+    """Attach all anonymous constraints of a root to its named spec."""
+    named = _root_spec_from_constraints(spec_constraints)
+    root = named.copy()
+    for c in spec_constraints:
+        if c is not named:
+            root.constrain(c)
+    return root
+
+
+def _multi_shot_batches(args) -> List[list]:
+    """Group the arguments of ``_concretize_multi_shot_task`` by the problem solving their
+    root, so that the batches do not depend on the number of processes."""
+    import spack.solver.asp
+
+    batches: Dict[Any, list] = collections.defaultdict(list)
+    for index, spec_constraints, tests in args:
+        try:
+            root = _multi_shot_root([Spec(x) for x in spec_constraints])
+            key = spack.solver.asp.shared_problem_key(root, tests=tests)
+        except spack.error.SpackError:
+            key = None
+        batches[index if key is None else key].append((index, spec_constraints, tests))
+    return list(batches.values())
+
+
+def _concretize_multi_shot_task(packed_arguments) -> List[Tuple[int, Spec, float]]:
+    """Concretize several roots separately, solving them in a single problem where
+    possible, and the others like ``_concretize_task``."""
+    import spack.solver.asp
+
+    tests = packed_arguments[0][2]
+    roots = []
+    for _, spec_constraints, _ in packed_arguments:
+        spec_constraints = [Spec(x) for x in spec_constraints]
+        roots.append((_multi_shot_root(spec_constraints), spec_constraints))
+
+    results = []
+    with tty.SuppressOutput(msg_enabled=False):
+        allow_deprecated = spack.config.get("config:deprecated", False)
+        solver = spack.solver.asp.Solver()
+        start = time.time()
+        solutions = solver.solve_separately(
+            [root for root, _ in roots], tests=tests, allow_deprecated=allow_deprecated
+        )
+        for (index, _, _), (_, spec_constraints), result in zip(
+            packed_arguments, roots, solutions
+        ):
+            if result is not None:
+                spec = result.specs[0]
+            else:
+                spec = _concretize_from_constraints(spec_constraints, tests)
+            results.append((index, spec, time.time() - start))
+            start = time.time()
+    return results
+
+
 def make_repo_path(root):
     """Make a RepoPath from the repo subdirectories in an environment."""
     path = spack.repo.RepoPath()
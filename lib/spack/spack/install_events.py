@@ -0,0 +1,120 @@
+# Copyright 2013-2024 Lawrence Livermore National Security, LLC and other
+# Spack Project Developers. See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+"""Machine-readable stream of installer events, for live monitoring.
+
+When enabled with ``spack install --events FILE``, the installer, and the build
+processes it starts, append one JSON object per line to ``FILE``. Every event has:
+
+* ``time``: seconds on the monotonic clock of the host, comparable across processes
+* ``pid``: id of the process emitting the event
+* ``event``: the kind of event, e.g. ``task_queued``, ``lock_acquired``,
+  ``cache_hit``, ``phase_start``, ``phase_end``, ``fetched``, ``installed``
+  or ``failed``
+* ``package``: id of the package the event is about, if any
+
+and event specific fields, e.g. ``phase`` and ``seconds`` for the start and end
+of the phases of an installation, like fetching and relocating binaries, or
+staging and building sources, or ``bytes`` for downloads.
+
+Writes are done in append mode, one line at a time, so that events from
+concurrent processes are not interleaved. A file descriptor inherited from the
+calling process can be used through its ``/dev/fd/N`` path.
+"""
+import os
+import time
+from typing import Dict, Optional
+
+import llnl.util.tty as tty
+
+import spack.util.spack_json as sjson
+import spack.util.timer as timer
+
+
+class EventStream:
+    """Appends events, as JSON lines, to a file."""
+
+    #: Whether events are written anywhere
+    enabled = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", buffering=1)
+
+    def emit(self, event: str, package: Optional[str] = None, **fields) -> None:
+        """Write an event to the stream.
+
+        Args:
+            event: kind of event
+            package: id of the package the event is about, if any
+            fields: additional, JSON serializable, data about the event
+        """
+        data = {"time": time.monotonic(), "pid": os.getpid(), "event": event}
+        if package is not None:
+            data["package"] = package
+        data.update(fields)
+        try:
+            self._file.write(sjson.dump(data) + "\n")
+        except (OSError, ValueError) as e:
+            tty.debug(f"Cannot write the {event} event to {self.path}: {e}")
+
+    def timer(self, package: str) -> timer.Timer:
+        """Return a timer emitting the start and the end of its named phases."""
+        return EventTimer(self, package)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class NullEventStream(EventStream):
+    """Event stream discarding every event."""
+
+    enabled = False
+
+    def __init__(self):
+        self.path = ""
+
+    def emit(self, event: str, package: Optional[str] = None, **fields) -> None:
+        pass
+
+    def timer(self, package: str) -> timer.Timer:
+        return timer.Timer()
+
+    def close(self) -> None:
+        pass
+
+
+#: Stream used when events are disabled
+NULL_STREAM = NullEventStream()
+
+
+def open_stream(path: Optional[str]) -> EventStream:
+    """Return an event stream appending to ``path``, or the null stream if not given."""
+    return EventStream(path) if path else NULL_STREAM
+
+
+class EventTimer(timer.Timer):
+    """Timer emitting a ``phase_start`` and a ``phase_end`` event for each of its
+    named phases."""
+
+    def __init__(self, events: EventStream, package: str):
+        super().__init__()
+        self.events = events
+        self.package = package
+        self._started: Dict[str, float] = {}
+
+    def start(self, name=timer.global_timer_name):
+        super().start(name)
+        if name != timer.global_timer_name:
+            self._started[name] = time.monotonic()
+            self.events.emit("phase_start", self.package, phase=name)
+
+    def stop(self, name=timer.global_timer_name):
+        super().stop(name)
+        # Stopping the global timer stops all the phases
+        names = list(self._started) if name == timer.global_timer_name else [name]
+        for phase in names:
+            if phase in self._started:
+                seconds = time.monotonic() - self._started.pop(phase)
+                self.events.emit("phase_end", self.package, phase=phase, seconds=seconds)
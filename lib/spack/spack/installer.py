@@ -26,18 +26,20 @@
 installations of packages in a Spack instance.
 """
 
+import contextlib
 import copy
 import glob
 import heapq
 import io
 import itertools
+import multiprocessing.connection
 import os
 import shutil
 import sys
 import time
 from collections import defaultdict
 from gzip import GzipFile
-from typing import Dict, Iterator, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import llnl.util.filesystem as fs
 import llnl.util.lock as lk
@@ -48,21 +50,28 @@
 
 import spack.binary_distribution as binary_distribution
 import spack.build_environment
+import spack.build_times
 import spack.compilers
 import spack.config
 import spack.database
 import spack.deptypes as dt
 import spack.error
 import spack.hooks
+import spack.install_events
 import spack.mirror
 import spack.package_base
 import spack.package_prefs as prefs
 import spack.repo
 import spack.spec
 import spack.store
+import spack.traverse
+import spack.util.cpus
 import spack.util.executable
+import spack.util.jobserver
 import spack.util.path
+import spack.util.spack_json as sjson
 import spack.util.timer as timer
+import spack.version
 from spack.util.environment import EnvironmentModifications, dump_environment
 from spack.util.executable import which
 
@@ -91,6 +100,9 @@
 #: queue invariants).
 STATUS_REMOVED = "removed"
 
+#: Error message used when terminating after the first install failure
+_FAIL_FAST_ERR = "Terminating after first install failure"
+
 
 def _write_timer_json(pkg, timer, cache):
     extra_attributes = {"name": pkg.name, "cache": cache, "hash": pkg.spec.dag_hash()}
@@ -112,12 +124,22 @@ class InstallAction:
 
 
 class InstallStatus:
-    def __init__(self, pkg_count: int):
+    def __init__(
+        self,
+        pkg_count: int,
+        estimates: Optional[Dict[str, Tuple[float, float]]] = None,
+        concurrency: int = 1,
+    ):
         # Counters used for showing status information
         self.pkg_num: int = 0
         self.pkg_count: int = pkg_count
         self.pkg_ids: Set[str] = set()
 
+        # Estimated duration and critical path, in seconds, keyed on package id,
+        # and number of packages installed at the same time, used for the ETA
+        self.estimates: Dict[str, Tuple[float, float]] = estimates or {}
+        self.concurrency: int = concurrency
+
     def next_pkg(self, pkg: "spack.package_base.PackageBase"):
         pkg_id = package_id(pkg.spec)
 
@@ -136,8 +158,22 @@ def set_term_title(self, text: str):
         sys.stdout.write(f"\x1b]0;Spack: {status}\x07")
         sys.stdout.flush()
 
+    def eta(self) -> Optional[float]:
+        """Estimated time, in seconds, to install the packages not processed yet,
+        or ``None`` if there is no estimate."""
+        remaining = [est for pkg_id, est in self.estimates.items() if pkg_id not in self.pkg_ids]
+        if not remaining:
+            return None
+
+        # Installing the remaining packages takes at least as long as their longest
+        # chain of dependencies, and as long as their total duration spread evenly.
+        work = sum(duration for duration, _ in remaining) / self.concurrency
+        return max(work, max(path for _, path in remaining))
+
     def get_progress(self) -> str:
-        return f"[{self.pkg_num}/{self.pkg_count}]"
+        progress = f"[{self.pkg_num}/{self.pkg_count}]"
+        eta = self.eta()
+        return progress if eta is None else f"{progress} (ETA {_hms(round(eta))})"
 
 
 class TermStatusLine:
@@ -382,7 +418,11 @@ def _print_timer(pre: str, pkg_id: str, timer: timer.BaseTimer) -> None:
 
 
 def _install_from_cache(
-    pkg: "spack.package_base.PackageBase", explicit: bool, unsigned: Optional[bool] = False
+    pkg: "spack.package_base.PackageBase",
+    explicit: bool,
+    unsigned: Optional[bool] = False,
+    download_result: Optional[dict] = None,
+    events: spack.install_events.EventStream = spack.install_events.NULL_STREAM,
 ) -> bool:
     """
     Install the package from binary cache
@@ -392,12 +432,50 @@ def _install_from_cache(
         explicit: ``True`` if installing the package was explicitly
             requested by the user, otherwise, ``False``
         unsigned: if ``True`` or ``False`` override the mirror signature verification defaults
+        download_result: tarball already downloaded with ``download_tarball``, if any
+        events: stream of installer events
+
+    Return: ``True`` if the package was extract from binary cache, ``False`` otherwise
+    """
+    if not _extract_from_cache(pkg, explicit, unsigned, download_result, events=events):
+        return False
+    _print_installed_pkg(pkg.spec.prefix)
+    spack.hooks.post_install(pkg.spec, explicit)
+    return True
+
+
+def _extract_from_cache(
+    pkg: "spack.package_base.PackageBase",
+    explicit: bool,
+    unsigned: Optional[bool] = False,
+    download_result: Optional[dict] = None,
+    register: bool = True,
+    events: spack.install_events.EventStream = spack.install_events.NULL_STREAM,
+) -> bool:
+    """
+    Extract and relocate the package from binary cache, without running the
+    post-install hooks.
+
+    Args:
+        pkg: package to install from the binary cache
+        explicit: ``True`` if installing the package was explicitly
+            requested by the user, otherwise, ``False``
+        unsigned: if ``True`` or ``False`` override the mirror signature verification defaults
+        download_result: tarball already downloaded with ``download_tarball``, if any
+        register: whether to add the package to the database
+        events: stream of installer events
 
     Return: ``True`` if the package was extract from binary cache, ``False`` otherwise
     """
-    t = timer.Timer()
+    t = events.timer(package_id(pkg.spec))
     installed_from_cache = _try_install_from_binary_cache(
-        pkg, explicit, unsigned=unsigned, timer=t
+        pkg,
+        explicit,
+        unsigned=unsigned,
+        timer=t,
+        download_result=download_result,
+        register=register,
+        events=events,
     )
     if not installed_from_cache:
         return False
@@ -408,8 +486,6 @@ def _install_from_cache(
 
     _write_timer_json(pkg, t, True)
     _print_timer(pre=_log_prefix(pkg.name), pkg_id=pkg_id, timer=t)
-    _print_installed_pkg(pkg.spec.prefix)
-    spack.hooks.post_install(pkg.spec, explicit)
     return True
 
 
@@ -460,6 +536,9 @@ def _process_binary_cache_tarball(
     unsigned: Optional[bool],
     mirrors_for_spec: Optional[list] = None,
     timer: timer.BaseTimer = timer.NULL_TIMER,
+    download_result: Optional[dict] = None,
+    register: bool = True,
+    events: spack.install_events.EventStream = spack.install_events.NULL_STREAM,
 ) -> bool:
     """
     Process the binary cache tarball.
@@ -471,18 +550,26 @@ def _process_binary_cache_tarball(
         mirrors_for_spec: Optional list of concrete specs and mirrors
         obtained by calling binary_distribution.get_mirrors_for_spec().
         timer: timer to keep track of binary install phases.
+        download_result: tarball already downloaded with ``download_tarball``, if any
+        register: whether to add the package to the database
+        events: stream of installer events
 
     Return:
         bool: ``True`` if the package was extracted from binary cache,
             else ``False``
     """
-    with timer.measure("fetch"):
-        download_result = binary_distribution.download_tarball(
-            pkg.spec, unsigned, mirrors_for_spec
-        )
+    if download_result is None:
+        with timer.measure("fetch"):
+            download_result = binary_distribution.download_tarball(
+                pkg.spec, unsigned, mirrors_for_spec
+            )
 
-        if download_result is None:
-            return False
+        if download_result is not None and events.enabled:
+            size = os.path.getsize(download_result["tarball_stage"].save_filename)
+            events.emit("fetched", package_id(pkg.spec), bytes=size)
+
+    if download_result is None:
+        return False
 
     tty.msg(f"Extracting {package_id(pkg.spec)} from binary cache")
 
@@ -494,7 +581,8 @@ def _process_binary_cache_tarball(
             pkg._post_buildcache_install_hook()
 
         pkg.installed_from_binary_cache = True
-        spack.store.STORE.db.add(pkg.spec, spack.store.STORE.layout, explicit=explicit)
+        if register:
+            spack.store.STORE.db.add(pkg.spec, spack.store.STORE.layout, explicit=explicit)
         return True
 
 
@@ -503,6 +591,9 @@ def _try_install_from_binary_cache(
     explicit: bool,
     unsigned: Optional[bool] = None,
     timer: timer.BaseTimer = timer.NULL_TIMER,
+    download_result: Optional[dict] = None,
+    register: bool = True,
+    events: spack.install_events.EventStream = spack.install_events.NULL_STREAM,
 ) -> bool:
     """
     Try to extract the package from binary cache.
@@ -512,7 +603,21 @@ def _try_install_from_binary_cache(
         explicit: the package was explicitly requested by the user
         unsigned: if ``True`` or ``False`` override the mirror signature verification defaults
         timer: timer to keep track of binary install phases.
+        download_result: tarball already downloaded with ``download_tarball``, if any
+        register: whether to add the package to the database
+        events: stream of installer events
     """
+    if download_result is not None:
+        return _process_binary_cache_tarball(
+            pkg,
+            explicit,
+            unsigned,
+            timer=timer,
+            download_result=download_result,
+            register=register,
+            events=events,
+        )
+
     # Early exit if no binary mirrors are configured.
     if not spack.mirror.MirrorCollection(binary=True):
         return False
@@ -523,7 +628,13 @@ def _try_install_from_binary_cache(
         matches = binary_distribution.get_mirrors_for_spec(pkg.spec, index_only=True)
 
     return _process_binary_cache_tarball(
-        pkg, explicit, unsigned, mirrors_for_spec=matches, timer=timer
+        pkg,
+        explicit,
+        unsigned,
+        mirrors_for_spec=matches,
+        timer=timer,
+        register=register,
+        events=events,
     )
 
 
@@ -867,8 +978,14 @@ def spec(self) -> "spack.spec.Spec":
         """The specification associated with the package."""
         return self.pkg.spec
 
-    def traverse_dependencies(self, spec=None, visited=None) -> Iterator["spack.spec.Spec"]:
-        """Yield any dependencies of the appropriate type(s)"""
+    def traverse_dependencies(
+        self, spec=None, visited=None, prune: Optional[Callable[["spack.spec.Spec"], bool]] = None
+    ) -> Iterator["spack.spec.Spec"]:
+        """Yield any dependencies of the appropriate type(s)
+
+        Dependencies for which ``prune`` returns ``True`` are neither yielded
+        nor traversed.
+        """
         # notice: deptype is not constant across nodes, so we cannot use
         # spec.traverse_edges(deptype=...).
 
@@ -882,9 +999,9 @@ def traverse_dependencies(self, spec=None, visited=None) -> Iterator["spack.spec
             if hash in visited:
                 continue
             visited.add(hash)
-            # In Python 3: yield from self.traverse_dependencies(dep, visited)
-            for s in self.traverse_dependencies(dep, visited):
-                yield s
+            if prune and prune(dep):
+                continue
+            yield from self.traverse_dependencies(dep, visited, prune)
             yield dep
 
 
@@ -995,6 +1112,13 @@ def __init__(
             pkg_id for pkg_id in self.dependencies if pkg_id not in installed
         )
 
+        # Estimated time, in seconds, to install the package and then its chain
+        # of dependents that takes the longest (see PackageInstaller._set_critical_paths)
+        self.critical_path = 0.0
+
+        # Whether to use binary caches, if overridden after a failed attempt
+        self._use_cache: Optional[bool] = None
+
         # Ensure key sequence-related properties are updated accordingly.
         self.attempts = 0
         self._update()
@@ -1079,12 +1203,18 @@ def is_build_request(self) -> bool:
 
     @property
     def use_cache(self) -> bool:
+        if self._use_cache is not None:
+            return self._use_cache
         _use_cache = True
         if self.is_build_request:
             return self.request.install_args.get("package_use_cache", _use_cache)
         else:
             return self.request.install_args.get("dependencies_use_cache", _use_cache)
 
+    @use_cache.setter
+    def use_cache(self, value: bool) -> None:
+        self._use_cache = value
+
     @property
     def cache_only(self) -> bool:
         _cache_only = False
@@ -1094,9 +1224,11 @@ def cache_only(self) -> bool:
             return self.request.install_args.get("dependencies_cache_only", _cache_only)
 
     @property
-    def key(self) -> Tuple[int, int]:
-        """The key is the tuple (# uninstalled dependencies, sequence)."""
-        return (self.priority, self.sequence)
+    def key(self) -> Tuple[int, float, int]:
+        """The key is the tuple (# uninstalled dependencies, -critical path, sequence),
+        so that among the tasks ready to install, those at the start of the longest
+        chains of dependents go first."""
+        return (self.priority, -self.critical_path, self.sequence)
 
     def next_attempt(self, installed) -> "BuildTask":
         """Create a new, updated task for the next installation attempt."""
@@ -1112,6 +1244,312 @@ def priority(self):
         return len(self.uninstalled_deps)
 
 
+class _ChildProcesses:
+    """
+    Runs a function on packages in child processes, at most ``jobs`` at a time and in
+    the order the packages are submitted, for work done ahead of their installation.
+
+    Such work is not done in threads, since the installer forks build processes while
+    it runs: a child forked while another thread holds a lock, e.g. that of
+    ``sys.stdout`` or of a connection pool, would wait for it forever.
+    """
+
+    def __init__(
+        self,
+        jobs: int,
+        function: Callable,
+        server: Optional["spack.build_environment.BuildProcessServer"] = None,
+    ):
+        self.jobs = jobs
+        self.function = function
+        self.server = server
+
+        # Work not started yet, in progress and done, keyed on the DAG hash of the spec
+        self.pending: Dict[str, Tuple["spack.package_base.PackageBase", dict]] = {}
+        self.running: Dict[str, "spack.build_environment.ProcessHandle"] = {}
+        self.done: Dict[str, Any] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.pending or key in self.running or key in self.done
+
+    def submit(self, key: str, pkg: "spack.package_base.PackageBase", kwargs: dict) -> None:
+        """Queue the function to run on a package, in a child process."""
+        self.pending[key] = (pkg, {**kwargs, "setup_env": False})
+        self.poll()
+
+    @staticmethod
+    def _complete(handle: "spack.build_environment.ProcessHandle") -> Any:
+        try:
+            return handle.complete()
+        except Exception as e:
+            tty.debug(f"{package_id(handle.pkg.spec)}: {e}")
+            return None
+
+    def poll(self) -> None:
+        """Collect the results of the finished child processes, and start the pending
+        work while fewer than ``jobs`` child processes are running."""
+        for key, handle in list(self.running.items()):
+            if handle.poll():
+                self.done[key] = self._complete(self.running.pop(key))
+        while self.pending and len(self.running) < self.jobs:
+            key = next(iter(self.pending))
+            pkg, kwargs = self.pending.pop(key)
+            self.running[key] = spack.build_environment.spawn_build_process(
+                pkg, self.function, kwargs, forward_stdin=False, server=self.server
+            )
+
+    def pop(self, key: str) -> Any:
+        """Return the result of the work on a package, waiting for it if in progress.
+        Work not started yet is dropped, and ``None`` returned."""
+        self.pending.pop(key, None)
+        handle = self.running.pop(key, None)
+        if handle is not None:
+            self.done[key] = self._complete(handle)
+            self.poll()
+        return self.done.pop(key, None)
+
+    def close(self) -> List[Any]:
+        """Drop the pending work, wait for the child processes still running, and return
+        the results not popped yet."""
+        self.pending.clear()
+        for key, handle in self.running.items():
+            self.done[key] = self._complete(handle)
+        self.running.clear()
+        results = [result for result in self.done.values() if result is not None]
+        self.done.clear()
+        return results
+
+
+def _fetch_ahead_process(pkg: "spack.package_base.PackageBase", kwargs: dict):
+    """Child process fetching the sources of a package ahead of its build."""
+    try:
+        return SourcePrefetcher._fetch(pkg)
+    except (Exception, SystemExit) as e:
+        tty.debug(f"Failed to fetch the sources of {package_id(pkg.spec)} ahead: {e}")
+        return None
+
+
+def _prefetch_binary_process(pkg: "spack.package_base.PackageBase", kwargs: dict):
+    """Child process downloading, and verifying, the binary of a package ahead of its
+    installation."""
+    try:
+        return BinaryPrefetcher._download(pkg.spec, kwargs["unsigned"], kwargs["mirrors"])
+    except (Exception, SystemExit) as e:
+        tty.debug(f"Failed to prefetch the binary of {package_id(pkg.spec)}: {e}")
+        return None
+
+
+class SourcePrefetcher:
+    """
+    Fetches, checksums and caches the sources of the packages to be built from
+    sources in child processes, ahead of their builds.
+
+    Fetched sources are kept in the stage of their package, and in the source
+    cache, so that their builds, even after restaging, do not download them again.
+    """
+
+    def __init__(
+        self, jobs: int, server: Optional["spack.build_environment.BuildProcessServer"] = None
+    ):
+        self.jobs = jobs
+
+        # Fetches pending, in progress or done, keyed on the DAG hash of their spec
+        self.fetches = _ChildProcesses(jobs, _fetch_ahead_process, server)
+
+        # Results of the successful fetches, as (bytes fetched, time of completion)
+        self.fetched: List[Tuple[int, float]] = []
+
+        self.start = time.monotonic()
+
+    @staticmethod
+    def _unattended(pkg: "spack.package_base.PackageBase") -> bool:
+        """Whether the sources of a package can be fetched without asking the user to
+        confirm the fetch of a version with no checksum or of a deprecated version."""
+        if pkg.manual_download:
+            return False
+        if (
+            spack.config.get("config:checksum")
+            and pkg.version not in pkg.versions
+            and not isinstance(pkg.version, spack.version.GitVersion)
+        ):
+            return False
+        deprecated = pkg.versions.get(pkg.version, {}).get("deprecated", False)
+        return not deprecated or spack.config.get("config:deprecated")
+
+    @staticmethod
+    def _fetch(pkg: "spack.package_base.PackageBase") -> Tuple[int, float]:
+        pkg.do_fetch()
+        size = sum(os.path.getsize(s.archive_file) for s in pkg.stage if s.archive_file)
+        return size, time.monotonic()
+
+    def schedule(self, tasks: Iterable[BuildTask]) -> None:
+        """
+        Queue the fetch of the sources of the given build tasks, in order, unless they
+        are installed, external, or expected to be installed from a binary cache.
+
+        Args:
+            tasks: build tasks, in the order they will be processed
+        """
+        with spack.store.STORE.db.read_transaction():
+            for task in tasks:
+                pkg, spec = task.pkg, task.pkg.spec
+                dag_hash = spec.dag_hash()
+                if (
+                    dag_hash in self.fetches
+                    or task.cache_only
+                    or task.request.install_args.get("fake")
+                    or not pkg.has_code
+                    or spec.external
+                    or "dev_path" in spec.variants
+                    or spec.installed
+                ):
+                    continue
+                if task.use_cache and binary_distribution.get_mirrors_for_spec(
+                    spec, index_only=True
+                ):
+                    continue
+                if not self._unattended(pkg) or pkg.stage.archive_file:
+                    continue
+
+                tty.debug(f"Fetching the sources of {package_id(spec)} ahead of its build")
+                self.fetches.submit(dag_hash, pkg, {})
+
+    def poll(self) -> None:
+        """Start queued fetches as the fetches in progress finish."""
+        self.fetches.poll()
+
+    def take(self, spec: "spack.spec.Spec") -> None:
+        """
+        Wait for the sources of a spec about to be built to be fetched, if they are
+        being fetched ahead. Failures are left to the build to report, since it fetches
+        the sources again.
+
+        Args:
+            spec: concrete spec about to be built
+        """
+        result = self.fetches.pop(spec.dag_hash())
+        if result is not None:
+            self.fetched.append(result)
+
+    def close(self) -> None:
+        """Stop fetching, and report the throughput of the fetches ahead of builds."""
+        self.fetched.extend(self.fetches.close())
+
+        if not self.fetched:
+            return
+        size = sum(size for size, _ in self.fetched)
+        seconds = max(end for _, end in self.fetched) - self.start
+        rate = size / seconds if seconds > 0 else 0.0
+        tty.msg(
+            f"Fetched the sources of {len(self.fetched)} packages ahead of their builds: "
+            f"{size / 2**20:.1f} MB in {pretty_seconds(seconds)} ({rate / 2**20:.1f} MB/s)"
+        )
+        self.fetched = []
+
+
+class BinaryPrefetcher:
+    """
+    Downloads, and verifies, the binary cache tarballs of upcoming build tasks in
+    child processes, ahead of their extraction by the installer.
+
+    Downloads are started in the order of the build queue as long as fewer than
+    ``jobs`` are in progress and the tarballs not yet taken by the installer fit in
+    the staging budget of ``max_bytes``. The size of a tarball is only known once
+    it is downloaded, so the downloads in progress, and the one about to start, are
+    counted at the average size of the tarballs downloaded so far. The budget can
+    thus be exceeded by tarballs larger than the average.
+    """
+
+    def __init__(
+        self,
+        jobs: int,
+        max_bytes: int,
+        server: Optional["spack.build_environment.BuildProcessServer"] = None,
+    ):
+        self.jobs = jobs
+        self.max_bytes = max_bytes
+
+        # Downloads in progress or done, keyed on the DAG hash of their spec
+        self.downloads = _ChildProcesses(jobs, _prefetch_binary_process, server)
+
+        # DAG hashes of the specs already considered for a download
+        self.seen: Set[str] = set()
+
+    @staticmethod
+    def _download(spec: "spack.spec.Spec", unsigned: Optional[bool], mirrors: list) -> dict:
+        result = binary_distribution.download_tarball(spec, unsigned, mirrors)
+        if result is None:
+            raise InstallError(f"Cannot download the binary of {spec.name}")
+        binary_distribution.verify_download(result)
+        return result
+
+    @staticmethod
+    def _size(result: Optional[dict]) -> Optional[int]:
+        try:
+            return os.path.getsize(result["tarball_stage"].save_filename)
+        except Exception:
+            return None
+
+    def has_capacity(self) -> bool:
+        """Whether another download can be started."""
+        self.downloads.poll()
+        running = len(self.downloads.running)
+        if running >= self.jobs:
+            return False
+        sizes = [self._size(result) for result in self.downloads.done.values()]
+        staged = [size for size in sizes if size is not None]
+        # Before any tarball is downloaded, every job gets an even share of the budget
+        expected = sum(staged) / len(staged) if staged else self.max_bytes / self.jobs
+        return sum(staged) + expected * (running + 1) <= self.max_bytes
+
+    def schedule(self, tasks: Iterable[BuildTask]) -> None:
+        """
+        Start downloading the tarballs of the given build tasks, in order, while there
+        is capacity to do so.
+
+        Args:
+            tasks: upcoming build tasks, in the order they will be processed
+        """
+        for task in tasks:
+            if not self.has_capacity():
+                return
+
+            spec = task.pkg.spec
+            dag_hash = spec.dag_hash()
+            if dag_hash in self.seen or not task.use_cache or spec.external:
+                continue
+            self.seen.add(dag_hash)
+
+            # Looking up the local copy of the mirror indexes is cheap
+            mirrors = binary_distribution.get_mirrors_for_spec(spec, index_only=True)
+            if not mirrors:
+                continue
+
+            tty.debug(f"Prefetching the binary of {package_id(spec)}")
+            unsigned = task.request.install_args.get("unsigned")
+            self.downloads.submit(dag_hash, task.pkg, {"unsigned": unsigned, "mirrors": mirrors})
+
+    def take(self, spec: "spack.spec.Spec") -> Optional[dict]:
+        """
+        Hand over the prefetched tarball of a spec, waiting for its download to finish.
+
+        Args:
+            spec: concrete spec about to be installed
+
+        Return:
+            the download result, or ``None`` if the tarball was not prefetched or its
+            download, or verification, failed, in which case it has to be downloaded
+            again
+        """
+        return self.downloads.pop(spec.dag_hash())
+
+    def close(self) -> None:
+        """Stop downloading and remove the tarballs not handed over to the installer."""
+        for result in self.downloads.close():
+            result["tarball_stage"].destroy()
+            result["specfile_stage"].destroy()
+
+
 class PackageInstaller:
     """
     Class for managing the install process for a Spack instance based on a bottom-up DAG approach.
@@ -1127,7 +1565,7 @@ def __init__(
         self.build_requests = [BuildRequest(pkg, install_args) for pkg in packages]
 
         # Priority queue of build tasks
-        self.build_pq: List[Tuple[Tuple[int, int], BuildTask]] = []
+        self.build_pq: List[Tuple[Tuple[int, float, int], BuildTask]] = []
 
         # Mapping of unique package ids to build task
         self.build_tasks: Dict[str, BuildTask] = {}
@@ -1141,6 +1579,10 @@ def __init__(
         # Cache of installed packages' unique ids
         self.installed: Set[str] = set()
 
+        # Hashes of the specs found installed, locally or upstream, when the
+        # build queue was initialized, and that need no build task
+        self.satisfied: Set[str] = set()
+
         # Data store layout
         self.layout = spack.store.STORE.layout
 
@@ -1151,6 +1593,62 @@ def __init__(
         # fast then that option applies to all build requests.
         self.fail_fast = False
 
+        # Maximum number of packages to build, or extract from binary caches, at the same time
+        self.max_active_builds: int = max(
+            1,
+            install_args.get("concurrent_packages")
+            or spack.config.get("config:concurrent_packages", 1),
+        )
+
+        # Builds running in child processes, keyed on the package's unique id
+        self.active_builds: Dict[
+            str, Tuple[BuildTask, "spack.build_environment.ProcessHandle"]
+        ] = {}
+
+        # Ids of the active builds extracting a package from a binary cache
+        self.active_extractions: Set[str] = set()
+
+        # Durations of past installations, used to prioritize build tasks
+        self.build_times = spack.build_times.BuildTimes()
+
+        # Estimated duration and critical path of the build tasks, keyed on package id
+        self.estimates: Dict[str, Tuple[float, float]] = {}
+
+        # Downloader of binary cache tarballs ahead of their installation
+        self.prefetcher: Optional[BinaryPrefetcher] = None
+
+        # Number of sources to fetch at the same time, ahead of their builds
+        fetch_ahead = install_args.get("fetch_ahead")
+        self.fetch_ahead: int = (
+            spack.config.get("config:fetch_ahead", 0) if fetch_ahead is None else fetch_ahead
+        )
+
+        # Fetcher of sources ahead of their builds
+        self.source_prefetcher: Optional[SourcePrefetcher] = None
+
+        # Warm process forking the build processes, if enabled
+        self.build_process_server: Optional[spack.build_environment.BuildProcessServer] = None
+
+        # Stream of installer events, for monitoring
+        self.events = spack.install_events.open_stream(install_args.get("events"))
+
+        # Queue shared with the installers running on other nodes, if cooperating
+        cooperative = install_args.get("cooperative") or spack.config.get(
+            "config:cooperative_install", False
+        )
+        self.work_queue: Optional[spack.database.WorkQueue] = (
+            spack.store.STORE.work_queue if cooperative else None
+        )
+
+        # Ids of the tasks deferred, since the last installation, because they
+        # were claimed by other installers
+        self.deferred: Set[str] = set()
+
+        # Jobserver shared by concurrent builds, and number of its tokens held
+        # by the installer on behalf of the builds beyond the first one
+        self.jobserver: Optional[spack.util.jobserver.JobServer] = None
+        self.jobserver_tokens: int = 0
+
     def __repr__(self) -> str:
         """Returns a formal representation of the package installer."""
         rep = f"{self.__class__.__name__}("
@@ -1476,6 +1974,7 @@ def _ensure_locked(
         else:
             timeout = 1e-9  # Near 0 to iterate through install specs quickly
 
+        start = time.monotonic()
         try:
             if lock is None:
                 tty.debug(msg.format("Acquiring", desc, pkg_id, pretty_seconds(timeout or 0)))
@@ -1511,6 +2010,9 @@ def _ensure_locked(
 
         except (lk.LockDowngradeError, lk.LockTimeoutError) as exc:
             tty.debug(err.format(op, desc, pkg_id, exc.__class__.__name__, str(exc)))
+            self.events.emit(
+                "lock_failed", pkg_id, type=lock_type, waited=time.monotonic() - start
+            )
             return (lock_type, None)
 
         except (Exception, KeyboardInterrupt, SystemExit) as exc:
@@ -1518,6 +2020,7 @@ def _ensure_locked(
             self._cleanup_all_tasks()
             raise
 
+        self.events.emit("lock_acquired", pkg_id, type=lock_type, waited=time.monotonic() - start)
         self.locks[pkg_id] = (lock_type, lock)
         return self.locks[pkg_id]
 
@@ -1580,7 +2083,8 @@ def _add_tasks(self, request: BuildRequest, all_deps):
                     self._add_bootstrap_compilers(compiler, arch, packages, request, all_deps)
 
         if install_deps:
-            for dep in request.traverse_dependencies():
+            # Subtrees already installed, upstream or registered externals are skipped
+            for dep in request.traverse_dependencies(prune=self._flag_satisfied):
                 dep_pkg = dep.package
 
                 dep_id = package_id(dep)
@@ -1615,14 +2119,23 @@ def _add_compiler_package_to_config(self, pkg: "spack.package_base.PackageBase")
             spack.compilers.find_compilers([compiler_search_prefix])
         )
 
-    def _install_task(self, task: BuildTask, install_status: InstallStatus) -> None:
+    def _install_task(
+        self, task: BuildTask, install_status: InstallStatus, background: bool = False
+    ) -> Optional["spack.build_environment.ProcessHandle"]:
         """
         Perform the installation of the requested spec and/or dependency
         represented by the build task.
 
         Args:
             task: the installation build task for a package
-            install_status: the installation status for the package"""
+            install_status: the installation status for the package
+            background: if ``True``, do not wait for a build from sources to
+                finish, but return the handle on its child process instead
+
+        Return:
+            the handle on the build process if it was started in the background,
+            ``None`` if the installation is already complete
+        """
 
         explicit = task.explicit
         install_args = task.request.install_args
@@ -1640,22 +2153,51 @@ def _install_task(self, task: BuildTask, install_status: InstallStatus) -> None:
 
         # Use the binary cache if requested
         if use_cache:
-            if _install_from_cache(pkg, explicit, unsigned):
+            download_result = self.prefetcher.take(pkg.spec) if self.prefetcher else None
+
+            # Extract in the background, falling back to a build from sources once
+            # complete if no binary is found.
+            if background:
+                self.active_extractions.add(pkg_id)
+                kwargs = {
+                    "explicit": explicit,
+                    "unsigned": unsigned,
+                    "download_result": download_result,
+                    "events": self.events.path,
+                    "setup_env": False,
+                }
+                return spack.build_environment.spawn_build_process(
+                    pkg,
+                    cache_install_process,
+                    kwargs,
+                    forward_stdin=False,
+                    server=self.build_process_server,
+                )
+
+            if _install_from_cache(
+                pkg, explicit, unsigned, download_result=download_result, events=self.events
+            ):
+                self.events.emit("cache_hit", pkg_id)
+                self._record_build_time(task, cache=True)
                 self._update_installed(task)
                 if task.compiler:
                     self._add_compiler_package_to_config(pkg)
-                return
-            elif cache_only:
+                return None
+            self.events.emit("cache_miss", pkg_id)
+            if cache_only:
                 raise InstallError("No binary found when cache-only was specified", pkg=pkg)
-            else:
-                tty.msg(f"No binary for {pkg_id} found: installing from source")
+            tty.msg(f"No binary for {pkg_id} found: installing from source")
+
+        # The stage of the package must not be used while its sources are fetched ahead
+        if self.source_prefetcher:
+            self.source_prefetcher.take(pkg.spec)
 
         pkg.run_tests = tests if isinstance(tests, bool) else pkg.name in tests
 
         # hook that allows tests to inspect the Package before installation
         # see unit_test_check() docs.
         if not pkg.unit_test_check():
-            return
+            return None
 
         try:
             self._setup_install_dir(pkg)
@@ -1664,24 +2206,331 @@ def _install_task(self, task: BuildTask, install_status: InstallStatus) -> None:
             # way monkeypatch in tests works correctly.
             pkg.stage
 
-            # Create a child process to do the actual installation.
+            # Create a child process to do the actual installation. Children
+            # running concurrently with others must not compete for the terminal.
+            if background:
+                return spack.build_environment.spawn_build_process(
+                    pkg,
+                    build_process,
+                    install_args,
+                    forward_stdin=False,
+                    server=self.build_process_server,
+                )
+
             # Preserve verbosity settings across installs.
             spack.package_base.PackageBase._verbose = spack.build_environment.start_build_process(
-                pkg, build_process, install_args
+                pkg, build_process, install_args, server=self.build_process_server
             )
-            # Note: PARENT of the build process adds the new package to
-            # the database, so that we don't need to re-read from file.
-            spack.store.STORE.db.add(pkg.spec, spack.store.STORE.layout, explicit=explicit)
-
-            # If a compiler, ensure it is added to the configuration
-            if task.compiler:
-                self._add_compiler_package_to_config(pkg)
+            self._register_built_package(task)
         except spack.build_environment.StopPhase as e:
-            # A StopPhase exception means that do_install was asked to
-            # stop early from clients, and is not an error at this point
-            pid = f"{self.pid}: " if tty.show_pid() else ""
-            tty.debug(f"{pid}{str(e)}")
-            tty.debug(f"Package stage directory: {pkg.stage.source_path}")
+            self._handle_stop_phase(pkg, e)
+        return None
+
+    def _complete_install_task(self, task: BuildTask, result, extracted: bool) -> None:
+        """
+        Finish the installation of a package whose build, or extraction from a
+        binary cache, was completed in the background and which was already added
+        to the database.
+
+        Args:
+            task: the installation build task for the package
+            result: the value returned by the child process
+            extracted: whether the package was extracted from a binary cache
+        """
+        if extracted:
+            self.events.emit("cache_hit", task.pkg_id)
+            task.pkg.installed_from_binary_cache = True
+            _print_installed_pkg(task.pkg.spec.prefix)
+            spack.hooks.post_install(task.pkg.spec, task.explicit)
+        else:
+            # Preserve verbosity settings across installs.
+            spack.package_base.PackageBase._verbose = result
+        self._record_installed_package(task, cache=extracted)
+
+    def _register_built_package(self, task: BuildTask) -> None:
+        """
+        Record a package built from sources in the database and, for compilers,
+        in the configuration.
+
+        Args:
+            task: the installation build task for the package
+        """
+        # Note: PARENT of the build process adds the new package to
+        # the database, so that we don't need to re-read from file.
+        spack.store.STORE.db.add(task.pkg.spec, spack.store.STORE.layout, explicit=task.explicit)
+        self._record_installed_package(task, cache=False)
+
+    def _record_installed_package(self, task: BuildTask, cache: bool) -> None:
+        """
+        Record the duration of an installation and, for compilers, add the package
+        to the configuration.
+
+        Args:
+            task: the installation build task for the package
+            cache: whether the package was installed from a binary cache
+        """
+        self._record_build_time(task, cache=cache)
+
+        # If a compiler, ensure it is added to the configuration
+        if task.compiler:
+            self._add_compiler_package_to_config(task.pkg)
+
+    def _record_build_time(self, task: BuildTask, cache: bool) -> None:
+        """
+        Harvest the duration of an installation from the timer JSON in its prefix.
+
+        Args:
+            task: the installation build task for the installed package
+            cache: whether the package was installed from a binary cache
+        """
+        try:
+            with open(task.pkg.times_log_path) as f:
+                total = sjson.load(f)["total"]
+        except Exception as e:
+            tty.debug(f"Cannot read the install times of {task.pkg_id}: {e}")
+            return
+        self.build_times.record(task.pkg.spec, total, cache=cache)
+
+    def _estimate_duration(self, task: BuildTask) -> float:
+        """Estimated time, in seconds, to install the package of a build task."""
+        # The task is expected to be installed from a binary cache if it only uses
+        # the cache, or if it tries the cache and the spec is in the binary index
+        cache = task.cache_only or (
+            task.use_cache
+            and bool(binary_distribution.get_mirrors_for_spec(task.pkg.spec, index_only=True))
+        )
+        estimate = self.build_times.estimate(task.pkg.spec, cache=cache)
+        if estimate is None:
+            return self.build_times.default_estimate(cache=cache)
+        return estimate
+
+    def _set_critical_paths(self) -> None:
+        """
+        Set the critical path of every build task, i.e. its estimated duration plus
+        the longest critical path among its dependents, and reorder the queue
+        accordingly.
+        """
+        durations = {
+            pkg_id: self._estimate_duration(task) for pkg_id, task in self.build_tasks.items()
+        }
+        paths: Dict[str, float] = {}
+
+        def critical_path(pkg_id: str) -> float:
+            if pkg_id not in paths:
+                dependents = self.build_tasks[pkg_id].dependents & durations.keys()
+                longest = max((critical_path(dep_id) for dep_id in dependents), default=0.0)
+                paths[pkg_id] = durations[pkg_id] + longest
+            return paths[pkg_id]
+
+        for pkg_id, task in self.build_tasks.items():
+            task.critical_path = critical_path(pkg_id)
+
+        # Only report an ETA if there is a history of installations to base it on
+        if self.build_times.data:
+            self.estimates = {pkg_id: (durations[pkg_id], paths[pkg_id]) for pkg_id in paths}
+
+        self.build_pq = [(task.key, task) for _, task in self.build_pq]
+        heapq.heapify(self.build_pq)
+
+    def _handle_stop_phase(
+        self, pkg: "spack.package_base.PackageBase", e: "spack.build_environment.StopPhase"
+    ) -> None:
+        # A StopPhase exception means that do_install was asked to
+        # stop early from clients, and is not an error at this point
+        pid = f"{self.pid}: " if tty.show_pid() else ""
+        tty.debug(f"{pid}{str(e)}")
+        tty.debug(f"Package stage directory: {pkg.stage.source_path}")
+
+    def _handle_install_failure(
+        self,
+        task: BuildTask,
+        exc: BaseException,
+        single_requested_spec: bool,
+        failed_build_requests: List[Tuple["spack.package_base.PackageBase", str, str]],
+    ) -> None:
+        """
+        Mark the package of a failed installation, and its dependents, as failed.
+
+        Args:
+            task: the installation build task for the failed package
+            exc: the exception raised by the installation
+            single_requested_spec: ``True`` if only one package was requested
+            failed_build_requests: failures of explicitly requested packages,
+                which is updated in place
+
+        Raises:
+            the original exception, or an ``InstallError``, if the installation
+            has to be terminated
+        """
+        pkg = task.pkg
+        self._update_failed(task, True, exc)
+
+        # Best effort installs suppress the exception and mark the
+        # package as a failure.
+        if not isinstance(exc, spack.error.SpackError) or not exc.printed:  # type: ignore[union-attr] # noqa: E501
+            exc.printed = True  # type: ignore[union-attr]
+            # SpackErrors can be printed by the build process or at
+            # lower levels -- skip printing if already printed.
+            # TODO: sort out this and SpackError.print_context()
+            tty.error(
+                f"Failed to install {pkg.name} due to " f"{exc.__class__.__name__}: {str(exc)}"
+            )
+        # Terminate if requested to do so on the first failure.
+        if self.fail_fast:
+            self._terminate_active_builds()
+            raise InstallError(f"{_FAIL_FAST_ERR}: {str(exc)}", pkg=pkg)
+
+        # Terminate when a single build request has failed, or summarize errors later.
+        if task.is_build_request:
+            if single_requested_spec:
+                self._terminate_active_builds()
+                raise exc
+            failed_build_requests.append((pkg, task.pkg_id, str(exc)))
+
+    def _complete_active_builds(
+        self,
+        single_requested_spec: bool,
+        failed_build_requests: List[Tuple["spack.package_base.PackageBase", str, str]],
+        install_status: InstallStatus,
+    ) -> None:
+        """
+        Wait for at least one of the builds running in the background to finish
+        and update the build queue with the outcome of every finished build.
+
+        Args:
+            single_requested_spec: ``True`` if only one package was requested
+            failed_build_requests: failures of explicitly requested packages,
+                which is updated in place
+            install_status: the installation status of the packages
+        """
+        pipes = {handle.read_pipe: pkg_id for pkg_id, (_, handle) in self.active_builds.items()}
+        finished = [
+            self.active_builds.pop(pipes[pipe])
+            for pipe in multiprocessing.connection.wait(list(pipes))
+        ]
+
+        # Collect the outcome of every finished process first, so that all the
+        # packages they installed are added to the database in one transaction.
+        outcomes = []
+        for task, handle in finished:
+            extracted = task.pkg_id in self.active_extractions
+            self.active_extractions.discard(task.pkg_id)
+            try:
+                outcomes.append((task, extracted, handle.complete(), None))
+            except BaseException as exc:
+                outcomes.append((task, extracted, None, exc))
+
+        installed = [
+            task
+            for task, extracted, result, exc in outcomes
+            if exc is None and (result or not extracted)
+        ]
+        if installed:
+            with spack.store.STORE.db.write_transaction():
+                for task in installed:
+                    spack.store.STORE.db.add(
+                        task.pkg.spec, spack.store.STORE.layout, explicit=task.explicit
+                    )
+
+        for task, extracted, result, exc in outcomes:
+            pkg = task.pkg
+            keep_prefix = task.request.install_args.get("keep_prefix")
+            try:
+                if isinstance(exc, spack.build_environment.StopPhase):
+                    self._handle_stop_phase(pkg, exc)
+                elif exc is not None:
+                    raise exc
+                elif extracted and not result:
+                    self.events.emit("cache_miss", task.pkg_id)
+                    if task.cache_only:
+                        raise InstallError(
+                            "No binary found when cache-only was specified", pkg=pkg
+                        )
+                    tty.msg(f"No binary for {task.pkg_id} found: installing from source")
+                    task.use_cache = False
+                    self._requeue_task(task, install_status)
+                    continue
+                else:
+                    self._complete_install_task(task, result, extracted)
+                self._update_installed(task)
+
+                # If we installed then we should keep the prefix
+                stop_before_phase = getattr(pkg, "stop_before_phase", None)
+                last_phase = getattr(pkg, "last_phase", None)
+                keep_prefix = keep_prefix or (stop_before_phase is None and last_phase is None)
+
+            except KeyboardInterrupt as exc:
+                tty.error(
+                    f"Failed to install {pkg.name} due to " f"{exc.__class__.__name__}: {str(exc)}"
+                )
+                self._terminate_active_builds()
+                raise
+
+            except spack.build_environment.ChildError as exc:
+                if exc.name != "NoChecksumException" or task.cache_only:
+                    self._handle_install_failure(
+                        task, exc, single_requested_spec, failed_build_requests
+                    )
+                else:
+                    # Checking hash on downloaded binary failed.
+                    tty.error(
+                        f"Failed to install {pkg.name} from binary cache due "
+                        f"to {str(exc)}: Requeueing to install from source."
+                    )
+                    task.use_cache = False
+                    self._requeue_task(task, install_status)
+                    continue
+
+            except (Exception, SystemExit) as exc:
+                self._handle_install_failure(
+                    task, exc, single_requested_spec, failed_build_requests
+                )
+
+            finally:
+                # Remove the install prefix if anything went wrong during
+                # install.
+                if not keep_prefix:
+                    pkg.remove_prefix()
+
+            # Perform basic task cleanup for the installed spec to
+            # include downgrading the write to a read lock
+            self._cleanup_task(pkg)
+
+    def _can_start_build(self) -> bool:
+        """
+        Determine if another build can be started in the background, taking a
+        token from the jobserver if one is needed to do so.
+
+        Return:
+            ``True`` if a build slot and, if needed, a jobserver token are available
+        """
+        if len(self.active_builds) >= self.max_active_builds:
+            return False
+
+        # Every build beyond the first one needs a token from the jobserver, since
+        # each build is allowed one job without a token.
+        while self.jobserver and self.jobserver_tokens < len(self.active_builds):
+            if not self.jobserver.acquire():
+                return False
+            self.jobserver_tokens += 1
+        return True
+
+    def _release_jobserver_tokens(self) -> None:
+        """Return to the jobserver the tokens not needed by the running builds."""
+        needed = max(0, len(self.active_builds) - 1)
+        while self.jobserver and self.jobserver_tokens > needed:
+            self.jobserver.release()
+            self.jobserver_tokens -= 1
+
+    def _terminate_active_builds(self) -> None:
+        """Terminate the builds still running in the background, if any."""
+        for pkg_id, (task, handle) in self.active_builds.items():
+            tty.debug(f"Terminating the build of {pkg_id}")
+            handle.terminate()
+            if not task.request.install_args.get("keep_prefix"):
+                task.pkg.remove_prefix()
+        self.active_builds.clear()
+        self.active_extractions.clear()
 
     def _next_is_pri0(self) -> bool:
         """
@@ -1736,6 +2585,7 @@ def _push_task(self, task: BuildTask) -> None:
         self._remove_task(task.pkg_id)
         desc = "Queueing" if task.attempts == 0 else "Requeueing"
         tty.debug(msg.format(desc, task.pkg_id, task.status))
+        self.events.emit("task_queued", task.pkg_id, priority=task.priority, attempt=task.attempts)
 
         # Now add the new task to the queue with a new sequence number to
         # ensure it is the last entry popped with the same priority.  This
@@ -1800,6 +2650,29 @@ def _requeue_task(self, task: BuildTask, install_status: InstallStatus) -> None:
         new_task.status = STATUS_INSTALLING
         self._push_task(new_task)
 
+    def _defer_claimed_task(self, task: BuildTask, install_status: InstallStatus) -> None:
+        """
+        Requeue a task claimed by an installer on another node, waiting a little
+        first if the task was already deferred since the last installation.
+
+        Args:
+            task: the installation build task for a package
+            install_status: the installation status for the package
+        """
+        tty.debug(f"{task.pkg_id} is being installed by another installer")
+        if task.pkg_id in self.deferred:
+            # Wait for progress instead of polling the queue in a loop, returning
+            # early if a build running in the background is done.
+            assert self.work_queue is not None  # make mypy happy
+            pipes = [handle.read_pipe for _, handle in self.active_builds.values()]
+            if pipes:
+                multiprocessing.connection.wait(pipes, timeout=self.work_queue.poll_interval)
+            else:
+                time.sleep(self.work_queue.poll_interval)
+            self.deferred.clear()
+        self.deferred.add(task.pkg_id)
+        self._requeue_task(task, install_status)
+
     def _setup_install_dir(self, pkg: "spack.package_base.PackageBase") -> None:
         """
         Create and ensure proper access controls for the install directory.
@@ -1848,11 +2721,14 @@ def _update_failed(
         pkg_id = task.pkg_id
         err = "" if exc is None else f": {str(exc)}"
         tty.debug(f"Flagging {pkg_id} as failed{err}")
+        self.events.emit("failed", pkg_id, error=str(exc) if exc else None)
         if mark:
             self.failed[pkg_id] = spack.store.STORE.failure_tracker.mark(task.pkg.spec)
         else:
             self.failed[pkg_id] = None
         task.status = STATUS_FAILED
+        if self.work_queue:
+            self.work_queue.complete(task.pkg.spec, installed=False)
 
         for dep_id in task.dependents:
             if dep_id in self.build_tasks:
@@ -1873,7 +2749,11 @@ def _update_installed(self, task: BuildTask) -> None:
             task (BuildTask): the build task for the installed package
         """
         task.status = STATUS_INSTALLED
+        self.events.emit("installed", task.pkg_id)
         self._flag_installed(task.pkg, task.dependents)
+        if self.work_queue:
+            self.work_queue.complete(task.pkg.spec, installed=True)
+            self.deferred.clear()
 
     def _flag_installed(
         self, pkg: "spack.package_base.PackageBase", dependent_ids: Optional[Set[str]] = None
@@ -1909,11 +2789,69 @@ def _flag_installed(
             else:
                 tty.debug(f"{dep_id} has no build task to update for {pkg_id}'s success")
 
+    def _find_satisfied(self) -> Set[str]:
+        """Hashes of the specs, among the dependencies of all the build requests, that are
+        already installed, either locally, upstream or as registered externals.
+
+        The installation status of the whole DAG is resolved at once, in a single read
+        transaction on the database, rather than one spec at a time. Explicitly requested
+        specs, and specs to be overwritten, are never considered satisfied, since their
+        build tasks update the database.
+        """
+        requests = [r for r in self.build_requests if r.install_args.get("install_deps")]
+        if not requests:
+            return set()
+
+        excluded = {r.spec.dag_hash() for r in self.build_requests}
+        for request in self.build_requests:
+            excluded.update(request.install_args.get("explicit", []))
+            excluded.update(request.overwrite)
+
+        hashes = [
+            s.dag_hash()
+            for s in spack.traverse.traverse_nodes([r.spec for r in requests])
+            if s.dag_hash() not in excluded
+        ]
+        records = spack.store.STORE.db.query_by_spec_hashes(hashes)
+        return {h for h, (_, rec) in records.items() if rec.installed}
+
+    def _flag_satisfied(self, spec: "spack.spec.Spec") -> bool:
+        """Flag a spec found installed when the build queue was initialized as installed,
+        without a build task.
+
+        Args:
+            spec: dependency of a build request
+
+        Return:
+            ``True`` if the spec, and so all its dependencies, need no build task,
+            ``False`` otherwise
+        """
+        if spec.dag_hash() not in self.satisfied:
+            return False
+
+        pkg = spec.package
+        if package_id(spec) in self.installed:
+            return True
+
+        if not _handle_external_and_upstream(pkg, False):
+            # Preclude other processes from uninstalling the package until we're
+            # done installing its dependents, like already installed packages with
+            # a build task.
+            ltype, lock = self._ensure_locked("read", pkg)
+            if lock is None:
+                return False
+            _print_installed_pkg(spack.util.path.debug_padded_filter(pkg.prefix))
+
+        tty.debug(f"Flagging {package_id(spec)} as installed per the database")
+        self._flag_installed(pkg)
+        return True
+
     def _init_queue(self) -> None:
         """Initialize the build queue from the list of build requests."""
         all_dependencies: Dict[str, Set[str]] = defaultdict(set)
 
         tty.debug("Initializing the build queue from the build requests")
+        self.satisfied = self._find_satisfied()
         for request in self.build_requests:
             self._add_tasks(request, all_dependencies)
 
@@ -1927,6 +2865,8 @@ def _init_queue(self) -> None:
                 for dependent_id in dependents.difference(task.dependents):
                     task.add_dependent(dependent_id)
 
+        self._set_critical_paths()
+
     def _install_action(self, task: BuildTask) -> int:
         """
         Determine whether the installation should be overwritten (if it already
@@ -1965,13 +2905,59 @@ def _install_action(self, task: BuildTask) -> int:
 
     def install(self) -> None:
         """Install the requested package(s) and or associated dependencies."""
-
+        # Concurrent builds share a jobserver, so that their total number of
+        # jobs does not exceed the number of build jobs.
+        share_jobs = self.max_active_builds > 1 and sys.platform != "win32"
+        jobserver = (
+            spack.util.jobserver.jobserver(spack.util.cpus.determine_number_of_jobs(parallel=True))
+            if share_jobs
+            else contextlib.nullcontext()
+        )
+        with jobserver as self.jobserver:
+            # Started before any thread of the installer, and after the jobserver, which
+            # the build processes inherit from it.
+            if spack.build_environment.use_build_process_server():
+                self.build_process_server = spack.build_environment.BuildProcessServer()
+            # Binary cache tarballs can be downloaded ahead of their installation.
+            prefetch_jobs = spack.config.get("config:binary_prefetch:jobs", 0)
+            if prefetch_jobs > 0 and spack.mirror.MirrorCollection(binary=True):
+                max_mb = spack.config.get("config:binary_prefetch:max_staged_mb", 1024)
+                self.prefetcher = BinaryPrefetcher(
+                    prefetch_jobs, max_mb * 1024 * 1024, self.build_process_server
+                )
+            # Sources can be fetched ahead of their builds.
+            if self.fetch_ahead > 0:
+                self.source_prefetcher = SourcePrefetcher(
+                    self.fetch_ahead, self.build_process_server
+                )
+            try:
+                self._install()
+            finally:
+                self.jobserver, self.jobserver_tokens = None, 0
+                if self.prefetcher:
+                    self.prefetcher.close()
+                    self.prefetcher = None
+                if self.source_prefetcher:
+                    self.source_prefetcher.close()
+                    self.source_prefetcher = None
+                if self.build_process_server:
+                    self.build_process_server.close()
+                    self.build_process_server = None
+                self.build_times.save()
+                if self.work_queue:
+                    self.work_queue.release_all()
+                self.events.close()
+
+    def _install(self) -> None:
         self._init_queue()
-        fail_fast_err = "Terminating after first install failure"
+        if self.source_prefetcher:
+            self.source_prefetcher.schedule(
+                task for _, task in sorted(self.build_pq) if task.status != STATUS_REMOVED
+            )
         single_requested_spec = len(self.build_requests) == 1
-        failed_build_requests = []
+        failed_build_requests: List[Tuple["spack.package_base.PackageBase", str, str]] = []
 
-        install_status = InstallStatus(len(self.build_pq))
+        install_status = InstallStatus(len(self.build_pq), self.estimates, self.max_active_builds)
 
         # Only enable the terminal status line when we're in a tty without debug info
         # enabled, so that the output does not get cluttered.
@@ -1979,11 +2965,40 @@ def install(self) -> None:
             enabled=sys.stdout.isatty() and tty.msg_enabled() and not tty.is_debug()
         )
 
-        while self.build_pq:
+        while self.build_pq or self.active_builds:
+            self._release_jobserver_tokens()
+
+            if self.source_prefetcher:
+                self.source_prefetcher.poll()
+            if self.prefetcher and self.prefetcher.has_capacity():
+                self.prefetcher.schedule(
+                    task for _, task in sorted(self.build_pq) if task.status != STATUS_REMOVED
+                )
+
+            # With builds running in the background, wait for one of them to
+            # finish when no queued task is ready to be installed or when no
+            # build slot, or jobserver token, is available.
+            if self.active_builds and (
+                not self.build_pq or not self._next_is_pri0() or not self._can_start_build()
+            ):
+                self._complete_active_builds(
+                    single_requested_spec, failed_build_requests, install_status
+                )
+                continue
+
             task = self._pop_task()
             if task is None:
                 continue
 
+            # The next task may still be waiting on dependencies being built
+            # in the background.
+            if task.priority != 0 and self.active_builds:
+                self._push_task(task)
+                self._complete_active_builds(
+                    single_requested_spec, failed_build_requests, install_status
+                )
+                continue
+
             install_args = task.request.install_args
             keep_prefix = install_args.get("keep_prefix")
 
@@ -2031,10 +3046,18 @@ def install(self) -> None:
                 self._update_failed(task)
 
                 if self.fail_fast:
-                    raise InstallError(fail_fast_err, pkg=pkg)
+                    self._terminate_active_builds()
+                    raise InstallError(_FAIL_FAST_ERR, pkg=pkg)
 
                 continue
 
+            # Leave the specs claimed by installers on other nodes to them, and
+            # move on to the next spec.
+            if self.work_queue and not self.work_queue.claim(spec):
+                term_status.clear()
+                self._defer_claimed_task(task, install_status)
+                continue
+
             # Attempt to get a write lock.  If we can't get the lock then
             # another process is likely (un)installing the spec or has
             # determined the spec has already been installed (though the
@@ -2113,7 +3136,15 @@ def install(self) -> None:
                 action = self._install_action(task)
 
                 if action == InstallAction.INSTALL:
-                    self._install_task(task, install_status)
+                    handle = self._install_task(
+                        task, install_status, background=self.max_active_builds > 1
+                    )
+                    if handle is not None:
+                        # The prefix is kept or removed, and the lock downgraded,
+                        # once the build running in the background is complete.
+                        self.active_builds[pkg_id] = (task, handle)
+                        keep_prefix = True
+                        continue
                 elif action == InstallAction.OVERWRITE:
                     # spack.store.STORE.db is not really a Database object, but a small
                     # wrapper -- silence mypy
@@ -2132,6 +3163,7 @@ def install(self) -> None:
                 tty.error(
                     f"Failed to install {pkg.name} due to " f"{exc.__class__.__name__}: {str(exc)}"
                 )
+                self._terminate_active_builds()
                 raise
 
             except binary_distribution.NoChecksumException as exc:
@@ -2143,34 +3175,14 @@ def install(self) -> None:
                     f"Failed to install {pkg.name} from binary cache due "
                     f"to {str(exc)}: Requeueing to install from source."
                 )
-                # this overrides a full method, which is ugly.
-                task.use_cache = False  # type: ignore[misc]
+                task.use_cache = False
                 self._requeue_task(task, install_status)
                 continue
 
             except (Exception, SystemExit) as exc:
-                self._update_failed(task, True, exc)
-
-                # Best effort installs suppress the exception and mark the
-                # package as a failure.
-                if not isinstance(exc, spack.error.SpackError) or not exc.printed:  # type: ignore[union-attr] # noqa: E501
-                    exc.printed = True  # type: ignore[union-attr]
-                    # SpackErrors can be printed by the build process or at
-                    # lower levels -- skip printing if already printed.
-                    # TODO: sort out this and SpackError.print_context()
-                    tty.error(
-                        f"Failed to install {pkg.name} due to "
-                        f"{exc.__class__.__name__}: {str(exc)}"
-                    )
-                # Terminate if requested to do so on the first failure.
-                if self.fail_fast:
-                    raise InstallError(f"{fail_fast_err}: {str(exc)}", pkg=pkg)
-
-                # Terminate when a single build request has failed, or summarize errors later.
-                if task.is_build_request:
-                    if single_requested_spec:
-                        raise
-                    failed_build_requests.append((pkg, pkg_id, str(exc)))
+                self._handle_install_failure(
+                    task, exc, single_requested_spec, failed_build_requests
+                )
 
             finally:
                 # Remove the install prefix if anything went wrong during
@@ -2269,9 +3281,6 @@ def __init__(self, pkg: "spack.package_base.PackageBase", install_args: dict):
         # env modifications by Spack
         self.env_mods = install_args.get("env_modifications", EnvironmentModifications())
 
-        # timer for build phases
-        self.timer = timer.Timer()
-
         # If we are using a padded path, filter the output to compress padded paths
         # The real log still has full-length paths.
         padding = spack.config.get("config:install_tree:padded_length", None)
@@ -2281,6 +3290,10 @@ def __init__(self, pkg: "spack.package_base.PackageBase", install_args: dict):
         self.pre = _log_prefix(pkg.name)
         self.pkg_id = package_id(pkg.spec)
 
+        # stream of installer events, and timer for build phases emitting events
+        self.events = spack.install_events.open_stream(install_args.get("events"))
+        self.timer = self.events.timer(self.pkg_id)
+
     def run(self) -> bool:
         """Main entry point from ``build_process`` to kick off install in child."""
 
@@ -2301,6 +3314,10 @@ def run(self) -> bool:
 
             self.timer.stop("stage")
 
+            archive_file = None if self.fake else stage.archive_file
+            if archive_file:
+                self.events.emit("fetched", self.pkg_id, bytes=os.path.getsize(archive_file))
+
             tty.debug(
                 f"{self.pre} Building {self.pkg_id} [{self.pkg.build_system_class}]"  # type: ignore[attr-defined] # noqa: E501
             )
@@ -2333,6 +3350,7 @@ def run(self) -> bool:
         print_install_test_log(self.pkg)
         _print_timer(pre=self.pre, pkg_id=self.pkg_id, timer=self.timer)
         _print_installed_pkg(self.pkg.prefix)
+        self.events.close()
 
         # preserve verbosity across runs
         return self.echo
@@ -2447,6 +3465,34 @@ def build_process(pkg: "spack.package_base.PackageBase", install_args: dict) ->
         return installer.run()
 
 
+def cache_install_process(pkg: "spack.package_base.PackageBase", kwargs: dict) -> bool:
+    """Extract and relocate a package from a binary cache.
+
+    This runs in a separate child process, started by
+    build_environment.spawn_build_process(), so that several packages can be
+    extracted at once. The package is added to the database by the parent.
+
+    Arguments:
+        pkg: the package being installed.
+        kwargs: ``explicit``, ``unsigned`` and ``download_result`` arguments of
+            ``_extract_from_cache()``, and the path of the event stream as ``events``
+
+    Return: ``True`` if the package was extracted, ``False`` if no binary was found
+    """
+    events = spack.install_events.open_stream(kwargs["events"])
+    try:
+        return _extract_from_cache(
+            pkg,
+            kwargs["explicit"],
+            kwargs["unsigned"],
+            download_result=kwargs["download_result"],
+            register=False,
+            events=events,
+        )
+    finally:
+        events.close()
+
+
 class OverwriteInstall:
     def __init__(
         self,
@@ -45,6 +45,7 @@
 import spack.util.debug
 import spack.util.environment
 import spack.util.git
+import spack.util.lock
 import spack.util.path
 from spack.error import SpackError
 
@@ -617,6 +618,11 @@ def setup_main_options(args):
     for config_var in args.config_vars or []:
         spack.config.add(fullpath=config_var, scope="command_line")
 
+    # lock telemetry and polling need the final command line configuration
+    spack.util.lock.set_polling(spack.config.get("config:lock_polling", "fixed"))
+    if spack.config.get("config:lock_stats", False):
+        spack.util.lock.report_statistics_at_exit()
+
     # On Windows10 console handling for ASCI/VT100 sequences is not
     # on by default. Turn on before we try to write to console
     # with color
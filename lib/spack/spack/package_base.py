@@ -11,6 +11,7 @@
 
 import base64
 import collections
+import contextlib
 import copy
 import functools
 import glob
@@ -2304,23 +2305,7 @@ def uninstall_by_spec(spec, force=False, deprecator=None):
         # Pre-uninstall hook runs first.
         with spack.store.STORE.prefix_locker.write_lock(spec):
             if pkg is not None:
-                try:
-                    spack.hooks.pre_uninstall(spec)
-                except Exception as error:
-                    if force:
-                        error_msg = (
-                            "One or more pre_uninstall hooks have failed"
-                            " for {0}, but Spack is continuing with the"
-                            " uninstall".format(str(spec))
-                        )
-                        if isinstance(error, spack.error.SpackError):
-                            error_msg += "\n\nError message: {0}".format(str(error))
-                        tty.warn(error_msg)
-                        # Note that if the uninstall succeeds then we won't be
-                        # seeing this error again and won't have another chance
-                        # to run the hook.
-                    else:
-                        raise
+                PackageBase._pre_uninstall(spec, force)
 
             # Uninstalling in Spack only requires removing the prefix.
             if not spec.external:
@@ -2341,23 +2326,149 @@ def uninstall_by_spec(spec, force=False, deprecator=None):
                 spack.store.STORE.db.remove(spec)
 
         if pkg is not None:
-            try:
-                spack.hooks.post_uninstall(spec)
-            except Exception:
-                # If there is a failure here, this is our only chance to do
-                # something about it: at this point the Spec has been removed
-                # from the DB and prefix, so the post-uninstallation hooks
-                # will not have another chance to run.
+            PackageBase._post_uninstall(spec)
+
+        tty.msg("Successfully uninstalled {0}".format(spec.short_spec))
+
+    @staticmethod
+    def _pre_uninstall(spec, force=False):
+        """Run the pre-uninstall hooks, which may fail only if ``force`` is not set."""
+        try:
+            spack.hooks.pre_uninstall(spec)
+        except Exception as error:
+            if force:
                 error_msg = (
-                    "One or more post-uninstallation hooks failed for"
-                    " {0}, but the prefix has been removed (if it is not"
-                    " external).".format(str(spec))
+                    "One or more pre_uninstall hooks have failed"
+                    " for {0}, but Spack is continuing with the"
+                    " uninstall".format(str(spec))
                 )
-                tb_msg = traceback.format_exc()
-                error_msg += "\n\nThe error:\n\n{0}".format(tb_msg)
+                if isinstance(error, spack.error.SpackError):
+                    error_msg += "\n\nError message: {0}".format(str(error))
                 tty.warn(error_msg)
+                # Note that if the uninstall succeeds then we won't be
+                # seeing this error again and won't have another chance
+                # to run the hook.
+            else:
+                raise
 
-        tty.msg("Successfully uninstalled {0}".format(spec.short_spec))
+    @staticmethod
+    def _post_uninstall(spec):
+        """Run the post-uninstall hooks, only warning about their failures."""
+        try:
+            spack.hooks.post_uninstall(spec)
+        except Exception:
+            # If there is a failure here, this is our only chance to do
+            # something about it: at this point the Spec has been removed
+            # from the DB and prefix, so the post-uninstallation hooks
+            # will not have another chance to run.
+            error_msg = (
+                "One or more post-uninstallation hooks failed for"
+                " {0}, but the prefix has been removed (if it is not"
+                " external).".format(str(spec))
+            )
+            tb_msg = traceback.format_exc()
+            error_msg += "\n\nThe error:\n\n{0}".format(tb_msg)
+            tty.warn(error_msg)
+
+    @staticmethod
+    def uninstall_by_specs(specs, force=False, jobs=1):
+        """Uninstall many specs at once.
+
+        This is equivalent to calling ``uninstall_by_spec()`` on each spec, dependents
+        first, except that prefixes are removed by up to ``jobs`` threads, and that the
+        database is updated once, in a single write transaction. Prefixes are removed
+        before taking the database lock, so that other processes are not blocked while
+        large prefixes are deleted.
+
+        Args:
+            specs (List[spack.spec.Spec]): concrete specs to uninstall
+            force (bool): uninstall specs even if installed specs that are not
+                uninstalled depend on them
+            jobs (int): number of prefixes removed concurrently
+
+        Raises:
+            PackageStillNeededError: if ``force`` is not set and some spec is needed by
+                other installed specs, in which case nothing is uninstalled
+            RemoveFailedError: if a prefix could not be removed, after uninstalling all
+                the specs whose prefixes were removed. The dependencies of a spec whose
+                prefix could not be removed are not uninstalled.
+        """
+        db = spack.store.STORE.db
+        hashes = set(s.dag_hash() for s in specs)
+
+        if not force and db.installed_dependents(specs, deptype=("link", "run")):
+            for spec in specs:
+                dependents = [
+                    d
+                    for d in db.installed_dependents([spec], deptype=("link", "run"))
+                    if d.dag_hash() not in hashes
+                ]
+                if dependents:
+                    raise PackageStillNeededError(spec, dependents)
+
+        # Records whose prefix does not exist are only removed from the database
+        stale = [s for s in specs if not os.path.isdir(s.prefix)]
+        installed = [s for s in specs if os.path.isdir(s.prefix)]
+
+        pkgs = {}
+        for spec in installed:
+            try:
+                pkgs[spec.dag_hash()] = spec.package
+            except spack.repo.UnknownEntityError:
+                pass
+
+        with contextlib.ExitStack() as stack:
+            # Locks are taken in the same order by every process, to avoid deadlocks
+            for spec in sorted(installed, key=lambda s: s.dag_hash()):
+                stack.enter_context(spack.store.STORE.prefix_locker.write_lock(spec))
+
+            for spec in installed:
+                if spec.dag_hash() in pkgs:
+                    PackageBase._pre_uninstall(spec, force)
+
+            with db.read_transaction():
+                deprecated = set(s.dag_hash() for s in installed if db.deprecator(s))
+
+            # Prefixes are removed dependents first, a round at a time, so that the
+            # dependencies of a spec whose prefix could not be removed are kept
+            errors: Dict[str, spack.directory_layout.RemoveFailedError] = {}
+            removed = []
+            remaining = {s.dag_hash(): s for s in installed}
+            while True:
+                ready = [
+                    spec
+                    for spec in remaining.values()
+                    if not any(
+                        d.dag_hash() in remaining or d.dag_hash() in errors
+                        for d in spec.dependents(deptype=("link", "run"))
+                    )
+                ]
+                if not ready:
+                    break
+                for spec in ready:
+                    del remaining[spec.dag_hash()]
+                errors.update(
+                    spack.store.STORE.layout.remove_install_directories(
+                        [s for s in ready if not s.external], deprecated, jobs=jobs
+                    )
+                )
+                removed.extend(s for s in ready if s.dag_hash() not in errors)
+
+            db.remove_many(stale + removed)
+
+        for spec in stale:
+            tty.debug("Removed stale DB entry for {0}".format(spec.short_spec))
+
+        for spec in remaining.values():
+            tty.warn(f"{spec.short_spec} was not uninstalled, since a dependent was not")
+
+        for spec in removed:
+            if spec.dag_hash() in pkgs:
+                PackageBase._post_uninstall(spec)
+            tty.msg("Successfully uninstalled {0}".format(spec.short_spec))
+
+        if errors:
+            raise next(iter(errors.values()))
 
     def do_uninstall(self, force=False):
         """Uninstall this package by spec."""
@@ -62,6 +62,16 @@
                 },
             },
             "os_compatible": {"type": "object", "additionalProperties": {"type": "array"}},
+            "cache_package_facts": {"type": "boolean"},
+            "multi_shot": {"type": "boolean"},
+            "result_cache": {"type": "boolean"},
+            "result_cache_size": {"type": "integer", "minimum": 1},
+            "portfolio": {
+                "oneOf": [
+                    {"type": "boolean"},
+                    {"type": "object", "additionalProperties": {"type": "string"}},
+                ]
+            },
         },
     }
 }
@@ -83,9 +83,16 @@
             "dirty": {"type": "boolean"},
             "build_language": {"type": "string"},
             "build_jobs": {"type": "integer", "minimum": 1},
+            "concurrent_packages": {"type": "integer", "minimum": 1},
+            "cooperative_install": {"type": "boolean"},
             "ccache": {"type": "boolean"},
             "concretizer": {"type": "string", "enum": ["original", "clingo"]},
             "db_lock_timeout": {"type": "integer", "minimum": 1},
+            "db_journal": {"type": "boolean"},
+            "db_binary_index": {"type": "boolean"},
+            "db_snapshots": {"type": "boolean"},
+            "lock_stats": {"type": "boolean"},
+            "lock_polling": {"type": "string", "enum": ["fixed", "adaptive"]},
             "package_lock_timeout": {
                 "anyOf": [{"type": "integer", "minimum": 1}, {"type": "null"}]
             },
@@ -95,6 +102,15 @@
             "url_fetch_method": {"type": "string", "enum": ["urllib", "curl"]},
             "additional_external_search_paths": {"type": "array", "items": {"type": "string"}},
             "binary_index_ttl": {"type": "integer", "minimum": 0},
+            "fetch_ahead": {"type": "integer", "minimum": 0},
+            "warm_build_processes": {"type": "boolean"},
+            "binary_prefetch": {
+                "type": "object",
+                "properties": {
+                    "jobs": {"type": "integer", "minimum": 0},
+                    "max_staged_mb": {"type": "integer", "minimum": 1},
+                },
+            },
             "aliases": {"type": "object", "patternProperties": {r"\w[\w-]*": {"type": "string"}}},
         },
         "deprecatedProperties": {
@@ -37,6 +37,7 @@
                 },
             },
             "version": {"type": "string"},
+            "journal": {"type": "string"},
         },
     }
 }
@@ -13,6 +13,7 @@
 import pprint
 import re
 import sys
+import tempfile
 import types
 import typing
 import warnings
@@ -34,6 +35,7 @@
 import spack.directives
 import spack.environment as ev
 import spack.error
+import spack.hash_types as ht
 import spack.package_base
 import spack.package_prefs
 import spack.parser
@@ -41,6 +43,7 @@
 import spack.repo
 import spack.spec
 import spack.store
+import spack.target
 import spack.util.crypto
 import spack.util.elf
 import spack.util.libc
@@ -64,6 +67,16 @@
     parse_term,
 )
 from .counter import FullDuplicatesCounter, MinimalDuplicatesCounter, NoDuplicatesCounter
+from .fact_cache import (
+    ID_BASE,
+    FactBlock,
+    PackageFactCache,
+    class_digest,
+    digest,
+    file_digest,
+    solver_digest,
+)
+from .result_cache import DEFAULT_SIZE, ResultCache, result_key
 
 GitOrStandardVersion = Union[spack.version.GitVersion, spack.version.StandardVersion]
 
@@ -99,6 +112,49 @@ def default_clingo_control():
     return control
 
 
+#: Configurations raced in the portfolio mode of the solver, as clasp options added to the
+#: "tweety" configuration. The heuristic in heuristic.lp is only used with "Domain".
+DEFAULT_PORTFOLIO = {
+    "domain-usc": "--heuristic=Domain --opt-strategy=usc,one",
+    "domain-bb": "--heuristic=Domain --opt-strategy=bb,hier",
+    "vsids-usc": "--heuristic=Vsids,92 --opt-strategy=usc,one",
+    "vsids-bb": "--heuristic=Vsids,92 --opt-strategy=bb,hier",
+}
+
+
+def portfolio_from_config() -> Dict[str, str]:
+    """Return the options of the configurations in the solver portfolio, by name, or an
+    empty dictionary if the portfolio mode is disabled.
+    """
+    portfolio = spack.config.get("concretizer:portfolio", False)
+    if portfolio is True:
+        return dict(DEFAULT_PORTFOLIO)
+    return dict(portfolio or {})
+
+
+def portfolio_clingo_control(portfolio: Dict[str, str]):
+    """Return a control object racing the configurations of a portfolio, one per thread,
+    which stops as soon as one of them proves a model to be optimal.
+
+    Args:
+        portfolio: clasp options of each configuration, by name. They are added to the
+            "tweety" configuration.
+    """
+    control = clingo().Control()
+    fd, path = tempfile.mkstemp(suffix=".cfg")
+    try:
+        with os.fdopen(fd, "w") as f:
+            for name, options in portfolio.items():
+                f.write(f"[{name}](tweety): {options}\n")
+        control.configuration.configuration = path
+    except RuntimeError as e:
+        raise spack.config.ConfigError(f"invalid solver portfolio: {e}") from e
+    finally:
+        os.remove(path)
+    control.configuration.solve.parallel_mode = f"{len(portfolio)},compete"
+    return control
+
+
 class Provenance(enum.IntEnum):
     """Enumeration of the possible provenances of a version."""
 
@@ -270,6 +326,23 @@ def specify(spec):
     return spack.spec.Spec(spec)
 
 
+def _directive_specs(pkg) -> Iterator[spack.spec.Spec]:
+    """Specs in the directives of a package that are translated into facts."""
+    for when, deps_by_name in pkg.dependencies.items():
+        yield when
+        yield from (dep.spec for dep in deps_by_name.values())
+    for when, conflicts in pkg.conflicts.items():
+        yield when
+        yield from (spack.spec.Spec(conflict_spec) for conflict_spec, _ in conflicts)
+    for when, provided in pkg.provided.items():
+        yield when
+        yield from provided
+    yield from pkg.provided_together
+    yield from pkg.languages
+    for _, when in pkg.variants.values():
+        yield from when
+
+
 def remove_node(spec: spack.spec.Spec, facts: List[AspFunction]) -> List[AspFunction]:
     """Transformation that removes all "node" and "virtual_node" from the input list of facts."""
     return list(filter(lambda x: x.args[0] not in ("node", "virtual_node"), facts))
@@ -284,6 +357,34 @@ def _create_counter(specs: List[spack.spec.Spec], tests: bool):
     return NoDuplicatesCounter(specs, tests=tests)
 
 
+def shared_problem_key(spec: spack.spec.Spec, tests: bool = False) -> Optional[tuple]:
+    """Key on what an abstract spec adds to the problem solving it, apart from its literal:
+    its possible dependencies and virtuals, and the namespaces, compilers, architectures and
+    non boolean variant values in its nodes.
+
+    Specs with the same key can share a problem, see ``Solver.solve_separately()``. The key
+    is ``None`` for specs that cannot share a problem, i.e. specs with concrete nodes or
+    nodes referred to by hash.
+    """
+    nodes = list(spec.traverse())
+    if any(s.concrete or s.abstract_hash for s in nodes):
+        return None
+    counter = _create_counter([spec], tests=tests)
+    return (
+        frozenset(counter.possible_dependencies()),
+        frozenset(counter.possible_virtuals()),
+        frozenset((s.name, s.namespace) for s in nodes if s.namespace),
+        frozenset(str(s.compiler) for s in nodes if s.compiler),
+        frozenset(str(s.architecture) for s in nodes if s.architecture),
+        frozenset(
+            (s.name, str(variant))
+            for s in nodes
+            for variant in s.variants.values()
+            if not isinstance(variant, spack.variant.BoolValuedVariant)
+        ),
+    )
+
+
 def all_compilers_in_config(configuration):
     return spack.compilers.all_compilers_from(configuration)
 
@@ -363,6 +464,9 @@ def __init__(self, specs, asp=None):
         # Saved control object for reruns when necessary
         self.control = None
 
+        # Name of the portfolio configuration that found the best model, if any
+        self.portfolio_winner = None
+
         # specs ordered by optimization level
         self.answers = []
         self.cores = []
@@ -795,8 +899,20 @@ def __init__(self, cores=True):
                 error reporting.
         """
         self.cores = cores
-        # This attribute will be reset at each call to solve
+        # These attributes will be reset at each call to solve
         self.control = None
+        self.portfolio: List[str] = []
+
+    def _init_control(self, control):
+        """Initialize the control object of a solve, with the configurations of the solver
+        portfolio if it is enabled and no control object is given.
+        """
+        portfolio = {} if control else portfolio_from_config()
+        self.portfolio = list(portfolio)
+        if portfolio:
+            self.control = portfolio_clingo_control(portfolio)
+        else:
+            self.control = control or default_clingo_control()
 
     def solve(self, setup, specs, reuse=None, output=None, control=None, allow_deprecated=False):
         """Set up the input and solve for dependencies of ``specs``.
@@ -822,7 +938,7 @@ def solve(self, setup, specs, reuse=None, output=None, control=None, allow_depre
         timer = spack.util.timer.Timer()
 
         # Initialize the control object for the solver
-        self.control = control or default_clingo_control()
+        self._init_control(control)
 
         # ensure core deps are present on Windows
         # needs to modify active config scope, so cannot be run within
@@ -839,6 +955,66 @@ def solve(self, setup, specs, reuse=None, output=None, control=None, allow_depre
             return Result(specs), None, None
         timer.stop("setup")
 
+        self._ground(setup, asp_problem, timer)
+        result = self._solve_grounded(setup, specs, timer)
+
+        if output.timers:
+            timer.write_tty()
+            print()
+            if setup.reuse_counts:
+                print("Reusable specs:")
+                for name, count in setup.reuse_counts.items():
+                    print(f"    {name:12s} {count:>8d}")
+                print()
+
+        if output.stats:
+            print("Statistics:")
+            pprint.pprint(self.control.statistics)
+            if result.portfolio_winner:
+                print(f"Portfolio winner: {result.portfolio_winner}")
+
+        result.raise_if_unsat()
+
+        if result.satisfiable and result.unsolved_specs and setup.concretize_everything:
+            unsolved_str = Result.format_unsolved(result.unsolved_specs)
+            raise InternalConcretizerError(
+                "Internal Spack error: the solver completed but produced specs"
+                " that do not satisfy the request. Please report a bug at "
+                f"https://github.com/spack/spack/issues\n\t{unsolved_str}"
+            )
+
+        return result, timer, self.control.statistics
+
+    def ground(self, setup, specs, reuse=None, control=None, allow_deprecated=False):
+        """Set up and ground the problem for ``specs``, with the literals of the specs
+        guarded by externals, so that it can be solved several times for different
+        subsets of the specs with ``solve_literals()``.
+
+        Arguments are as for ``solve()``.
+        """
+        self._init_control(control)
+        setup.external_literals = True
+        asp_problem = setup.setup(specs, reuse=reuse, allow_deprecated=allow_deprecated)
+        self._ground(setup, asp_problem, spack.util.timer.NULL_TIMER)
+
+    def solve_literals(self, setup, specs, literal_ids):
+        """Solve the grounded problem for some of its input specs.
+
+        Arguments:
+            setup (SpackSolverSetup): setup used to ground the problem
+            specs (list): input specs to solve for
+            literal_ids (list): ids of the literals of these specs in the setup
+
+        Return:
+            The result of the solve, which may be unsatisfiable
+        """
+        selected = set(literal_ids)
+        for literal_id in setup.literal_ids:
+            symbol = fn.solve_literal(literal_id).symbol()
+            self.control.assign_external(symbol, literal_id in selected)
+        return self._solve_grounded(setup, specs, spack.util.timer.NULL_TIMER)
+
+    def _ground(self, setup, asp_problem, timer):
         timer.start("load")
         # Add the problem instance
         self.control.add("base", [], asp_problem)
@@ -864,12 +1040,15 @@ def solve(self, setup, specs, reuse=None, output=None, control=None, allow_depre
         self.control.ground([("base", [])])
         timer.stop("ground")
 
+    def _solve_grounded(self, setup, specs, timer):
         # With a grounded program, we can run the solve.
         models = []  # stable models if things go well
+        threads = []  # threads finding the models, in portfolio mode
         cores = []  # unsatisfiable cores if they do not
 
         def on_model(model):
             models.append((model.cost, model.symbols(shown=True, terms=True)))
+            threads.append(model.thread_id)
 
         solve_kwargs = {
             "assumptions": setup.assumptions,
@@ -893,6 +1072,11 @@ def on_model(model):
             builder = SpecBuilder(specs, hash_lookup=setup.reusable_and_possible)
             min_cost, best_model = min(models)
 
+            if self.portfolio:
+                winner = self.portfolio[threads[models.index((min_cost, best_model))]]
+                result.portfolio_winner = winner
+                tty.debug(f"[SOLVE]: the best model was found by the {winner} configuration")
+
             # first check for errors
             error_handler = ErrorHandler(best_model)
             error_handler.raise_if_errors()
@@ -918,25 +1102,7 @@ def on_model(model):
             result.control = self.control
             result.cores.extend(cores)
 
-        if output.timers:
-            timer.write_tty()
-            print()
-
-        if output.stats:
-            print("Statistics:")
-            pprint.pprint(self.control.statistics)
-
-        result.raise_if_unsat()
-
-        if result.satisfiable and result.unsolved_specs and setup.concretize_everything:
-            unsolved_str = Result.format_unsolved(result.unsolved_specs)
-            raise InternalConcretizerError(
-                "Internal Spack error: the solver completed but produced specs"
-                " that do not satisfy the request. Please report a bug at "
-                f"https://github.com/spack/spack/issues\n\t{unsolved_str}"
-            )
-
-        return result, timer, self.control.statistics
+        return result
 
 
 class ConcreteSpecsByHash(collections.abc.Mapping):
@@ -1054,6 +1220,7 @@ def __init__(self, tests: bool = False):
 
         # Caches to optimize the setup phase of the solver
         self.target_specs_cache = None
+        self.package_facts: Optional[PackageFactCache] = None
 
         # whether to add installed/binary hashes to the solve
         self.tests = tests
@@ -1061,6 +1228,14 @@ def __init__(self, tests: bool = False):
         # If False allows for input specs that are not solved
         self.concretize_everything = True
 
+        # If True, which input specs are solved is decided by assigning externals, see
+        # PyclingoDriver.ground(). Ids of the literals of the input specs, in order.
+        self.external_literals = False
+        self.literal_ids: List[int] = []
+
+        # Number of reusable specs, of duplicates, and of specs that cannot be reached
+        self.reuse_counts: Dict[str, int] = {}
+
         # Set during the call to setup
         self.pkgs: Set[str] = set()
         self.explicitly_required_namespaces: Dict[str, str] = {}
@@ -1220,6 +1395,36 @@ def pkg_rules(self, pkg, tests):
         self.pkg_version_rules(pkg)
         self.gen.newline()
 
+        # languages, variants, conflicts, virtuals and dependencies
+        self.package_definition_rules(pkg)
+
+        # virtual preferences
+        self.virtual_preferences(
+            pkg.name,
+            lambda v, p, i: self.gen.fact(fn.pkg_fact(pkg.name, fn.provider_preference(v, p, i))),
+        )
+
+        self.package_requirement_rules(pkg)
+
+        # trigger and effect tables
+        self.trigger_rules()
+        self.effect_rules()
+
+    def package_definition_rules(self, pkg):
+        """Facts for the directives of a package, which are taken from the package fact
+        cache, if it is enabled and up to date for the package."""
+        if self.package_facts is None:
+            self._package_definition_rules(pkg)
+            return
+
+        key = self._package_definition_key(pkg)
+        block = self.package_facts.get(pkg.fullname, key)
+        if block is None:
+            block = self._record_package_definition(pkg)
+            self.package_facts.put(pkg.fullname, key, block)
+        self._replay_package_definition(block)
+
+    def _package_definition_rules(self, pkg):
         # languages
         self.package_languages(pkg)
 
@@ -1235,17 +1440,97 @@ def pkg_rules(self, pkg, tests):
         # dependencies
         self.package_dependencies_rules(pkg)
 
-        # virtual preferences
-        self.virtual_preferences(
-            pkg.name,
-            lambda v, p, i: self.gen.fact(fn.pkg_fact(pkg.name, fn.provider_preference(v, p, i))),
+    def _package_definition_key(self, pkg) -> str:
+        """Digest of everything the facts for the directives of a package depend on: the
+        package class, the package files of the other packages named in the directives,
+        which of these names are virtual, and the options of the solve that matter."""
+        names = set()
+        for spec in _directive_specs(pkg):
+            names.update(node.name for node in spec.traverse() if node.name)
+        names.discard(pkg.name)
+
+        references = []
+        for name in sorted(names):
+            namespace = self.explicitly_required_namespaces.get(name)
+            repo = spack.repo.PATH.repo_for_pkg(f"{namespace}.{name}" if namespace else name)
+            references.append((name, file_digest(repo.filename_for_package_name(name))))
+
+        with_tests = bool(self.tests) and (self.tests is True or pkg.name in self.tests)
+        return digest(
+            [
+                solver_digest(),
+                pkg.fullname,
+                class_digest(pkg),
+                references,
+                sorted(name for name in names if spack.repo.PATH.is_virtual(name)),
+                sorted(v for v in pkg.provided_virtual_names() if v in self.possible_virtuals),
+                with_tests,
+            ]
         )
 
-        self.package_requirement_rules(pkg)
-
-        # trigger and effect tables
-        self.trigger_rules()
-        self.effect_rules()
+    def _record_package_definition(self, pkg) -> FactBlock:
+        """Generate the facts for the directives of a package apart from the rest of the
+        setup, with condition ids starting from ``ID_BASE``, and return them along with their
+        side effects on the setup."""
+        saved = (
+            self.gen,
+            self._id_counter,
+            self._trigger_cache,
+            self._effect_cache,
+            self.version_constraints,
+            self.target_constraints,
+            self.compiler_version_constraints,
+            self.variant_values_from_specs,
+        )
+        self.gen = ProblemInstanceBuilder()
+        self._id_counter = itertools.count(ID_BASE)
+        self._trigger_cache = collections.defaultdict(dict)
+        self._effect_cache = collections.defaultdict(dict)
+        self.version_constraints = set()
+        self.target_constraints = set()
+        self.compiler_version_constraints = set()
+        self.variant_values_from_specs = set()
+        try:
+            self._package_definition_rules(pkg)
+            self.trigger_rules()
+            self.effect_rules()
+            return FactBlock.from_text(
+                self.gen.value(),
+                count=next(self._id_counter) - ID_BASE,
+                version_constraints=sorted(
+                    (name, str(versions)) for name, versions in self.version_constraints
+                ),
+                target_constraints=sorted(str(t) for t in self.target_constraints),
+                compiler_version_constraints=sorted(
+                    str(c) for c in self.compiler_version_constraints
+                ),
+                variant_values=sorted(self.variant_values_from_specs, key=str),
+            )
+        finally:
+            (
+                self.gen,
+                self._id_counter,
+                self._trigger_cache,
+                self._effect_cache,
+                self.version_constraints,
+                self.target_constraints,
+                self.compiler_version_constraints,
+                self.variant_values_from_specs,
+            ) = saved
+
+    def _replay_package_definition(self, block: FactBlock) -> None:
+        """Add the facts of a block, with fresh condition ids, and its side effects."""
+        first_id = next(self._id_counter)
+        self._id_counter = itertools.count(first_id + block.count)
+        self.gen.append(block.text(first_id))
+        self.version_constraints.update(
+            (name, vn.VersionList(versions)) for name, versions in block.version_constraints
+        )
+        self.target_constraints.update(spack.target.Target(t) for t in block.target_constraints)
+        self.compiler_version_constraints.update(
+            spack.spec.CompilerSpec(c) for c in block.compiler_version_constraints
+        )
+        self.variant_values_from_specs.update(block.variant_values)
 
     def trigger_rules(self):
         """Flushes all the trigger rules collected so far, and clears the cache."""
@@ -2370,6 +2655,40 @@ def register_concrete_spec(self, spec, possible):
 
         self.reusable_and_possible.add(spec)
 
+    @staticmethod
+    def prune_reusable_specs(
+        reuse: List[spack.spec.Spec], possible: Set[str]
+    ) -> Tuple[List[spack.spec.Spec], List[spack.spec.Spec]]:
+        """Return the reusable specs without duplicates, and the ones among them that can be
+        part of the solve.
+
+        The same spec often comes from more than one source, e.g. from the store and from a
+        buildcache. A reusable spec imposes the hashes of its link and run dependencies, so
+        it can be part of the solve only if all the packages it reaches through them are
+        possible dependencies of the input specs.
+
+        Args:
+            reuse: concrete specs that can be reused
+            possible: names of the possible dependencies of the input specs
+        """
+        by_hash: Dict[str, spack.spec.Spec] = {}
+        for spec in reuse:
+            by_hash.setdefault(spec.dag_hash(), spec)
+
+        reachable: Dict[str, bool] = {}
+
+        def is_reachable(spec: spack.spec.Spec) -> bool:
+            dag_hash = spec.dag_hash()
+            if dag_hash not in reachable:
+                edges = spec.edges_to_dependencies(depflag=dt.LINK | dt.RUN | dt.TEST)
+                reachable[dag_hash] = spec.name in possible and all(
+                    is_reachable(edge.spec) for edge in edges
+                )
+            return reachable[dag_hash]
+
+        unique = list(by_hash.values())
+        return unique, [spec for spec in unique if is_reachable(spec)]
+
     def concrete_specs(self):
         """Emit facts for reusable specs"""
         for h, spec in self.reusable_and_possible.explicit_items():
@@ -2440,8 +2759,13 @@ def setup(
                 self.explicitly_required_namespaces[node.name] = node.namespace
 
         self.gen = ProblemInstanceBuilder()
+        self.literal_ids = []
         compiler_parser = CompilerParser(configuration=spack.config.CONFIG).with_input_specs(specs)
 
+        self.package_facts = None
+        if spack.config.get("concretizer:cache_package_facts", False):
+            self.package_facts = PackageFactCache()
+
         if using_libc_compatibility():
             for libc in self.libcs:
                 self.gen.fact(fn.host_libc(libc.name, libc.version))
@@ -2466,11 +2790,24 @@ def setup(
 
         self.gen.h1("Reusable concrete specs")
         self.define_concrete_input_specs(specs, self.pkgs)
+        self.reuse_counts = {}
         if reuse:
             self.gen.fact(fn.optimize_for_reuse())
-            for reusable_spec in reuse:
+            unique, reachable = self.prune_reusable_specs(reuse, self.pkgs)
+            for reusable_spec in unique:
                 compiler_parser.add_compiler_from_concrete_spec(reusable_spec)
+            for reusable_spec in reachable:
                 self.register_concrete_spec(reusable_spec, self.pkgs)
+            self.reuse_counts = {
+                "candidates": len(reuse),
+                "duplicates": len(reuse) - len(unique),
+                "unreachable": len(unique) - len(reachable),
+                "reusable": len(reachable),
+            }
+            tty.debug(
+                "[SETUP]: reusable specs: "
+                + ", ".join(f"{count} {name}" for name, count in self.reuse_counts.items())
+            )
         self.concrete_specs()
 
         self.possible_compilers = compiler_parser.possible_compilers()
@@ -2522,6 +2859,13 @@ def setup(
             self.gen.h2("Package preferences: %s" % pkg)
             self.preferred_variants(pkg)
 
+        if self.package_facts is not None:
+            tty.debug(
+                f"[SETUP]: package facts from cache: {self.package_facts.hits}, "
+                f"generated: {self.package_facts.misses}"
+            )
+            self.package_facts.save()
+
         self.gen.h1("Develop specs")
         # Inject dev_path from environment
         for ds in dev_specs:
@@ -2648,7 +2992,10 @@ def literal_specs(self, specs):
             cache[imposed_spec_key] = (effect_id, requirements)
             self.gen.fact(fn.pkg_fact(spec.name, fn.condition_effect(condition_id, effect_id)))
 
-            if self.concretize_everything:
+            self.literal_ids.append(trigger_id)
+            if self.external_literals:
+                self.gen.append(f"#external {fn.solve_literal(trigger_id)}.\n")
+            elif self.concretize_everything:
                 self.gen.fact(fn.solve_literal(trigger_id))
 
         self.effect_rules()
@@ -3836,6 +4183,10 @@ class Solver:
     def __init__(self):
         self.driver = PyclingoDriver()
         self.selector = ReusableSpecsSelector(configuration=spack.config.CONFIG)
+        self.results: Optional[ResultCache] = None
+        if spack.config.get("concretizer:result_cache", False):
+            size = spack.config.get("concretizer:result_cache_size", DEFAULT_SIZE)
+            self.results = ResultCache(size=size)
 
     @staticmethod
     def _check_input_and_extract_concrete_specs(specs):
@@ -3874,14 +4225,70 @@ def solve(
         # Check upfront that the variants are admissible
         specs = [s.lookup_hash() for s in specs]
         reusable_specs = self._check_input_and_extract_concrete_specs(specs)
+
+        # Results are cached only for abstract specs, and for solves without output
+        use_cache = self.results is not None and not reusable_specs
+        use_cache = use_cache and not (out or timers or stats or setup_only)
+
         reusable_specs.extend(self.selector.reusable_specs(specs))
+        cache_key = None
+        if use_cache:
+            cache_key = result_key(specs, reusable_specs, tests, allow_deprecated)
+            result = self._cached_result(cache_key, specs)
+            if result is not None:
+                return result
+
         setup = SpackSolverSetup(tests=tests)
         output = OutputConfiguration(timers=timers, stats=stats, out=out, setup_only=setup_only)
         result, _, _ = self.driver.solve(
             setup, specs, reuse=reusable_specs, output=output, allow_deprecated=allow_deprecated
         )
+        if cache_key is not None:
+            self._cache_result(cache_key, result)
         return result
 
+    def _cached_result(self, key, specs):
+        """Return the result of a previous solve of the same problem, or None if there is
+        no such result in the cache.
+        """
+        entry = self.results.get(key)
+        if entry is None:
+            return None
+
+        try:
+            roots = [spack.spec.Spec.from_dict(data) for data in entry["specs"]]
+            result = Result(specs)
+            result.satisfiable = True
+            answer = {SpecBuilder.make_node(pkg=root.name): root for root in roots}
+            result.answers.append((entry["cost"], 0, answer))
+            result.criteria = [tuple(x) for x in entry["criteria"]]
+            unsolved = result.unsolved_specs
+        except Exception as e:
+            tty.debug(f"[SOLVE]: cannot read the cached result of the solve: {e}")
+            return None
+
+        if unsolved:
+            return None
+        tty.debug(f"[SOLVE]: using the cached result {key}")
+        return result
+
+    def _cache_result(self, key, result):
+        """Store the result of a solve in the cache, if all the input specs were solved, and
+        no dependency of an external was detected on the system.
+        """
+        if not result.satisfiable or result.unsolved_specs:
+            return
+        nodes = traverse.traverse_nodes(result.specs)
+        if any(s.external and s.dependencies() for s in nodes):
+            return
+        opt, _, _ = min(result.answers)
+        entry = {
+            "specs": [s.to_dict(hash=ht.dag_hash) for s in result.specs],
+            "cost": list(opt),
+            "criteria": [list(x) for x in result.criteria],
+        }
+        self.results.put(key, entry)
+
     def solve_in_rounds(
         self, specs, out=None, timers=False, stats=False, tests=False, allow_deprecated=False
     ):
@@ -3938,6 +4345,83 @@ def solve_in_rounds(
             for spec in result.specs:
                 reusable_specs.extend(spec.traverse())
 
+    def solve_separately(self, specs, tests=False, allow_deprecated=False):
+        """Solve for each spec on its own, but set up and ground a single problem for the
+        specs leading to the same facts.
+
+        Specs are grouped by ``shared_problem_key()``. Each group shares a problem, which is
+        solved once per spec (multi-shot solving), selecting the literal of that spec
+        through an external atom. The facts of the shared problem are those of the problem
+        of each spec of the group on its own, and the literals of the other specs are
+        disabled while a spec is solved, so that its result is the one of
+        ``solve([spec])``. Specs with a group of their own, specs with concrete versions
+        unknown to Spack, and specs whose set up or solve in the shared problem fails, are
+        not solved here, and neither are any specs when reusing only dependencies. These
+        have to be solved on their own with ``solve()``, which gives the usual error
+        messages.
+
+        The function is a generator that yields, in order, the result of each spec, or
+        ``None`` if the spec has to be solved on its own.
+
+        Arguments:
+            specs (list): list of Specs to solve.
+            tests (bool): add test dependencies to the solve
+            allow_deprecated (bool): allow deprecated version in the solve
+        """
+        specs = [s.lookup_hash() for s in specs]
+        groups = collections.defaultdict(list)
+        if self.selector.reuse_strategy != ReuseStrategy.DEPENDENCIES:
+            for i, spec in enumerate(specs):
+                key = shared_problem_key(spec, tests=tests)
+                if key is not None:
+                    groups[key].append(i)
+
+        results = {}
+        for group in groups.values():
+            if len(group) > 1:
+                results.update(
+                    zip(
+                        group,
+                        self._solve_shared([specs[i] for i in group], tests, allow_deprecated),
+                    )
+                )
+
+        for i in range(len(specs)):
+            yield results.get(i)
+
+    def _solve_shared(self, specs, tests, allow_deprecated):
+        """Solve each spec in a problem set up and grounded once for all of them, and return
+        the results, or ``None`` for the specs that have to be solved on their own."""
+        setup = SpackSolverSetup(tests=tests)
+        try:
+            self.driver.ground(
+                setup,
+                specs,
+                reuse=self.selector.reusable_specs(specs),
+                allow_deprecated=allow_deprecated,
+            )
+        except spack.error.SpackError as e:
+            tty.debug(f"[SOLVE]: cannot set up a problem shared by {len(specs)} specs: {e}")
+            return [None] * len(specs)
+        if any(
+            declared.origin == Provenance.SPEC
+            for versions in setup.declared_versions.values()
+            for declared in versions
+        ):
+            return [None] * len(specs)
+
+        results = []
+        for i, spec in enumerate(specs):
+            result = None
+            try:
+                result = self.driver.solve_literals(setup, [spec], [setup.literal_ids[i]])
+            except spack.error.UnsatisfiableSpecError:
+                pass
+            if result is not None and (not result.satisfiable or result.unsolved_specs):
+                result = None
+            results.append(result)
+        return results
+
 
 class UnsatisfiableSpecError(spack.error.UnsatisfiableSpecError):
     """There was an issue with the spec that was requested (i.e. a user error)."""
@@ -0,0 +1,212 @@
+# Copyright 2013-2024 Lawrence Livermore National Security, LLC and other
+# Spack Project Developers. See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+"""Persistent cache of the facts generated for the definition of each package.
+
+Setting up a solve translates the directives of every possible package (languages,
+variants, conflicts, provided virtuals and dependencies) into facts, which is a large
+part of the time spent before clingo runs. These facts only depend on the package
+class, on the files of the packages it refers to, and on a few properties of the
+solve, so the block of facts of each package is kept in the misc cache, along with a
+digest of everything it depends on, and reused as long as the digest matches.
+
+Blocks are stored as templates, where the ids of the conditions they define are
+relative to the first one, so that they can be replayed at any point of the setup.
+"""
+import functools
+import hashlib
+import inspect
+import os
+import re
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import llnl.util.tty as tty
+
+import spack
+import spack.caches
+import spack.util.file_cache
+import spack.util.spack_json as sjson
+
+#: Key of the cached facts in their file cache
+CACHE_KEY = "solver/package_facts.json"
+
+#: Version of the format of the cached facts
+FORMAT_VERSION = 1
+
+#: Condition ids used while recording a block start from here, so that they can be told
+#: apart from other integers in the facts. It leaves room for more than 10^8 ids per
+#: block below the largest integer clingo can represent.
+ID_BASE = 2_000_000_000
+
+#: Matches quoted strings, which are skipped, and condition ids recorded from ID_BASE
+_ID_RE = re.compile(r'"(?:[^"\\]|\\.)*"|(?<![\w.])(2\d{9})(?![\w.])')
+
+
+def file_digest(path: str) -> str:
+    """Digest of the content of a file, or of its absence."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ""
+    return _file_digest(path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=None)
+def _file_digest(path: str, mtime: int, size: int) -> str:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return ""
+
+
+def class_digest(cls: type) -> str:
+    """Digest of the source files of a class, of its base classes, and of its metaclass."""
+    files = set()
+    for c in (*cls.__mro__, *type(cls).__mro__):
+        module = sys.modules.get(c.__module__)
+        path = getattr(module, "__file__", None)
+        if path:
+            files.add(path)
+    return digest([(path, file_digest(path)) for path in sorted(files)])
+
+
+def digest(data: Any) -> str:
+    """Digest of JSON serializable data."""
+    return hashlib.sha256(sjson.dump(data).encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def solver_digest() -> str:
+    """Digest of the version of Spack and of the code generating the facts."""
+    here = inspect.getsourcefile(sys.modules[__name__]) or ""
+    asp = here.replace("fact_cache.py", "asp.py")
+    return digest([spack.spack_version, file_digest(here), file_digest(asp)])
+
+
+class FactBlock(NamedTuple):
+    """Facts generated for the definition of a package, with their side effects on the
+    setup of the solve."""
+
+    #: Text of the facts, split where condition ids are
+    chunks: List[str]
+    #: Condition ids between the chunks, relative to the first id of the block
+    ids: List[int]
+    #: Number of condition ids used by the block
+    count: int
+    #: Version constraints, as (package name, version list) pairs
+    version_constraints: List[Tuple[str, str]]
+    #: Target constraints, as strings
+    target_constraints: List[str]
+    #: Compiler version constraints, as strings
+    compiler_version_constraints: List[str]
+    #: Variant values found in the specs of conditions, as (package, variant, value)
+    variant_values: List[Tuple[str, str, Any]]
+
+    @staticmethod
+    def from_text(text: str, count: int, **side_effects) -> "FactBlock":
+        """Make a block from the text of facts recorded with condition ids from
+        ``ID_BASE``."""
+        chunks, ids, start = [], [], 0
+        for match in _ID_RE.finditer(text):
+            if match.group(1) is None:
+                continue
+            chunks.append(text[start : match.start()])
+            ids.append(int(match.group(1)) - ID_BASE)
+            start = match.end()
+        chunks.append(text[start:])
+        return FactBlock(chunks=chunks, ids=ids, count=count, **side_effects)
+
+    def text(self, first_id: int) -> str:
+        """Text of the facts, with condition ids starting from ``first_id``."""
+        parts = [self.chunks[0]]
+        for i, chunk in zip(self.ids, self.chunks[1:]):
+            parts.append(str(first_id + i))
+            parts.append(chunk)
+        return "".join(parts)
+
+
+class PackageFactCache:
+    """Blocks of facts for the definition of packages, backed by a file in the misc cache,
+    unless another file cache is given."""
+
+    def __init__(self, cache: Optional[spack.util.file_cache.FileCache] = None):
+        self._cache = cache
+        self._data: Optional[Dict[str, Any]] = None
+        self._added: Dict[str, Any] = {}
+        #: Number of blocks found, and not found, in the cache
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self) -> spack.util.file_cache.FileCache:
+        if self._cache is None:
+            self._cache = spack.caches.MISC_CACHE
+        return self._cache
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            if not self.cache.init_entry(CACHE_KEY):
+                return {}
+            with self.cache.read_transaction(CACHE_KEY) as f:
+                data = sjson.load(f)
+        except Exception as e:
+            tty.debug(f"Cannot read the cached package facts: {e}")
+            return {}
+        if data.get("version") != FORMAT_VERSION:
+            return {}
+        return data.get("packages", {})
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = self._read()
+        return self._data
+
+    def get(self, fullname: str, key: str) -> Optional[FactBlock]:
+        """Return the block of facts of a package, if it was cached with the same key.
+
+        Args:
+            fullname: namespace and name of the package
+            key: digest of everything the facts depend on
+        """
+        entry = self.data.get(fullname)
+        if entry is None or entry.get("key") != key:
+            self.misses += 1
+            return None
+        self.hits += 1
+        block = entry["block"]
+        return FactBlock(
+            chunks=block["chunks"],
+            ids=block["ids"],
+            count=block["count"],
+            version_constraints=[tuple(x) for x in block["version_constraints"]],
+            target_constraints=block["target_constraints"],
+            compiler_version_constraints=block["compiler_version_constraints"],
+            variant_values=[tuple(x) for x in block["variant_values"]],
+        )
+
+    def put(self, fullname: str, key: str, block: FactBlock) -> None:
+        """Add the block of facts of a package to the cache, to be saved with ``save()``."""
+        entry = {"key": key, "block": block._asdict()}
+        self.data[fullname] = entry
+        self._added[fullname] = entry
+
+    def save(self) -> None:
+        """Merge the blocks added since the last save into the cache on disk."""
+        if not self._added:
+            return
+        try:
+            self.cache.init_entry(CACHE_KEY)
+            with self.cache.write_transaction(CACHE_KEY) as (old, new):
+                data = sjson.load(old) if old else {}
+                if data.get("version") != FORMAT_VERSION:
+                    data = {"version": FORMAT_VERSION, "packages": {}}
+                data["packages"].update(self._added)
+                sjson.dump(data, new)
+        except Exception as e:
+            tty.debug(f"Cannot update the cached package facts: {e}")
+            return
+        self._added = {}
@@ -0,0 +1,201 @@
+# Copyright 2013-2024 Lawrence Livermore National Security, LLC and other
+# Spack Project Developers. See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+"""Persistent cache of the results of solves.
+
+The same abstract specs are often concretized again and again, against the same
+packages and configuration, e.g. by ``spack spec`` or by environments whose roots did
+not change. The result of a solve is kept in the misc cache, under a key digesting
+everything the solve depends on:
+
+* the abstract specs, and the options of the solve
+* the configuration sections read by the solver, and the host architecture
+* the stats of all the files of every repository, including patches
+* the hashes of the specs that can be reused
+* the version of Spack, and the code of the solver, of the directives and of the base
+  classes of packages
+
+and returned again, without solving, as long as none of these change. Each result is
+kept in its own file, and the least recently used ones are removed once there are more
+than a given number of them.
+"""
+import glob
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+import archspec.cpu
+
+import llnl.util.tty as tty
+from llnl.util.filesystem import mkdirp
+
+import spack
+import spack.caches
+import spack.concretize
+import spack.config
+import spack.repo
+import spack.spec
+import spack.util.file_cache
+import spack.util.spack_json as sjson
+
+from .fact_cache import digest, file_digest
+
+#: Directory of the cached results in their file cache
+CACHE_DIR = "solver/results"
+
+#: Version of the format of the cached results
+FORMAT_VERSION = 1
+
+#: Default number of results kept in the cache
+DEFAULT_SIZE = 256
+
+#: Configuration sections the result of a solve depends on
+CONFIG_SECTIONS = ("concretizer", "packages", "compilers", "config", "develop")
+
+#: Modules, besides the solver, defining how packages translate into concrete specs, i.e.
+#: their directives, variants, patches, dependencies and base classes
+CODE_FILES = (
+    "spec.py",
+    "package_base.py",
+    "directives.py",
+    "variant.py",
+    "patch.py",
+    "dependency.py",
+    os.path.join("build_systems", "*.py"),
+)
+
+
+def code_digest() -> str:
+    """Digest of the version of Spack, of the code of the solver, and of the modules
+    defining how packages translate into concrete specs."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    spack_dir = os.path.dirname(here)
+    files = sorted(glob.glob(os.path.join(here, "*.py")) + glob.glob(os.path.join(here, "*.lp")))
+    for pattern in CODE_FILES:
+        files.extend(sorted(glob.glob(os.path.join(spack_dir, pattern))))
+    return digest(
+        [spack.spack_version, [(os.path.relpath(f, spack_dir), file_digest(f)) for f in files]]
+    )
+
+
+def repo_digest() -> str:
+    """Digest of the stats of all the files of every repository, since patches and other
+    files of the packages change concrete specs as much as their package files."""
+    data = []
+    for repo in spack.repo.PATH.repos:
+        stats = []
+        for root, dirs, files in os.walk(repo.root):
+            dirs[:] = [d for d in dirs if d != "__pycache__"]
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    s = os.stat(path)
+                except OSError:
+                    continue
+                stats.append((os.path.relpath(path, repo.root), s.st_mtime_ns, s.st_size))
+        data.append((repo.namespace, repo.root, sorted(stats)))
+    return digest(data)
+
+
+def result_key(
+    specs: List[spack.spec.Spec],
+    reusable: Iterable[spack.spec.Spec],
+    tests: Any = False,
+    allow_deprecated: bool = False,
+) -> str:
+    """Return the key of the result of a solve.
+
+    Args:
+        specs: abstract specs to be solved
+        reusable: concrete specs that can be reused in the solve
+        tests: whether, or for which packages, test dependencies are concretized
+        allow_deprecated: whether deprecated versions are allowed in the solve
+    """
+    tests = sorted(tests) if isinstance(tests, (list, tuple, set)) else bool(tests)
+    return digest(
+        [
+            FORMAT_VERSION,
+            # Namespaces of dependencies are not part of the string of a spec
+            [(str(s), [node.fullname for node in s.traverse()]) for s in specs],
+            tests,
+            allow_deprecated,
+            spack.concretize.Concretizer().check_for_compiler_existence,
+            [spack.config.get(section) for section in CONFIG_SECTIONS],
+            str(spack.spec.ArchSpec.default_arch()),
+            archspec.cpu.host().name,
+            repo_digest(),
+            sorted(s.dag_hash() for s in reusable),
+            code_digest(),
+        ]
+    )
+
+
+class ResultCache:
+    """Results of solves, each in its own file under the misc cache, unless another file
+    cache is given."""
+
+    def __init__(
+        self, cache: Optional[spack.util.file_cache.FileCache] = None, size: int = DEFAULT_SIZE
+    ):
+        self._cache = cache
+        self.size = size
+        #: Number of results found, and not found, in the cache
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self) -> spack.util.file_cache.FileCache:
+        if self._cache is None:
+            self._cache = spack.caches.MISC_CACHE
+        return self._cache
+
+    @property
+    def root(self) -> str:
+        return self.cache.cache_path(CACHE_DIR)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the result stored under a key, if any, and mark it as recently used."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = sjson.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store a result under a key, and remove the least recently used results if there
+        are too many of them."""
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            mkdirp(self.root)
+            with open(tmp, "w") as f:
+                sjson.dump(entry, f)
+            os.replace(tmp, path)
+            self._evict()
+        except OSError as e:
+            tty.debug(f"Cannot store the result of the solve in {path}: {e}")
+
+    def _evict(self) -> None:
+        paths = glob.glob(os.path.join(self.root, "*.json"))
+        if len(paths) <= self.size:
+            return
+        by_time = []
+        for path in paths:
+            try:
+                by_time.append((os.stat(path).st_mtime, path))
+            except OSError:
+                pass
+        by_time.sort()
+        for _, path in by_time[: len(by_time) - self.size]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
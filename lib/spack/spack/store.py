@@ -34,6 +34,7 @@
 import spack.paths
 import spack.spec
 import spack.util.path
+import spack.util.timer as timer
 
 #: default installation root, relative to the Spack install path
 DEFAULT_INSTALL_TREE_ROOT = os.path.join(spack.paths.opt_path, "spack")
@@ -144,7 +145,8 @@ class Store:
     The database is a single file that caches metadata for the entire Spack installation. It
     prevents us from having to spider the install tree to figure out what's there.
 
-    The store is also able to lock installation prefixes, and to mark installation failures.
+    The store is also able to lock installation prefixes, to mark installation failures, and to
+    coordinate installers running on different nodes.
 
     Args:
         root: path to the root of the install tree
@@ -156,6 +158,9 @@ class Store:
             truncated to this length
         upstreams: optional list of upstream databases
         lock_cfg: lock configuration for the database
+        db_journal: whether writes to the database are appended to a journal
+        db_binary_index: whether a binary copy of the database index is written
+        db_snapshot_cache: directory where to keep binary copies of database indexes, if any
     """
 
     def __init__(
@@ -166,6 +171,9 @@ def __init__(
         hash_length: Optional[int] = None,
         upstreams: Optional[List[spack.database.Database]] = None,
         lock_cfg: spack.database.LockConfiguration = spack.database.NO_LOCK,
+        db_journal: bool = False,
+        db_binary_index: bool = False,
+        db_snapshot_cache: Optional[str] = None,
     ) -> None:
         self.root = root
         self.unpadded_root = unpadded_root or root
@@ -173,7 +181,17 @@ def __init__(
         self.hash_length = hash_length
         self.upstreams = upstreams
         self.lock_cfg = lock_cfg
-        self.db = spack.database.Database(root, upstream_dbs=upstreams, lock_cfg=lock_cfg)
+        self.db_journal = db_journal
+        self.db_binary_index = db_binary_index
+        self.db_snapshot_cache = db_snapshot_cache
+        self.db = spack.database.Database(
+            root,
+            upstream_dbs=upstreams,
+            lock_cfg=lock_cfg,
+            journal=db_journal,
+            binary_index=db_binary_index,
+            snapshot_cache=db_snapshot_cache,
+        )
 
         timeout_format_str = (
             f"{str(lock_cfg.package_timeout)}s" if lock_cfg.package_timeout else "No timeout"
@@ -186,14 +204,22 @@ def __init__(
         self.failure_tracker = spack.database.FailureTracker(
             self.root, default_timeout=lock_cfg.package_timeout
         )
+        self.work_queue = spack.database.WorkQueue(
+            self.root, self.prefix_locker, default_timeout=lock_cfg.database_timeout
+        )
 
         self.layout = spack.directory_layout.DirectoryLayout(
             root, projections=projections, hash_length=hash_length
         )
 
-    def reindex(self) -> None:
-        """Convenience function to reindex the store DB with its own layout."""
-        return self.db.reindex(self.layout)
+    def reindex(self, jobs: int = 1, timer: timer.BaseTimer = timer.NULL_TIMER) -> None:
+        """Convenience function to reindex the store DB with its own layout.
+
+        Args:
+            jobs: number of directories searched, and spec files read, concurrently
+            timer: timer of the phases of the reindex
+        """
+        return self.db.reindex(self.layout, jobs=jobs, timer=timer)
 
     def __reduce__(self):
         return Store, (
@@ -203,6 +229,9 @@ def __reduce__(self):
             self.hash_length,
             self.upstreams,
             self.lock_cfg,
+            self.db_journal,
+            self.db_binary_index,
+            self.db_snapshot_cache,
         )
 
 
@@ -221,7 +250,13 @@ def create(configuration: ConfigurationType) -> Store:
         install_properties["install_tree"]
         for install_properties in configuration.get("upstreams", {}).values()
     ]
-    upstreams = _construct_upstream_dbs_from_install_roots(install_roots)
+    db_snapshot_cache = None
+    if configuration.get("config:db_snapshots", False):
+        misc_cache = configuration.get("config:misc_cache", spack.paths.default_misc_cache_path)
+        db_snapshot_cache = os.path.join(spack.util.path.canonicalize_path(misc_cache), "database")
+    upstreams = _construct_upstream_dbs_from_install_roots(
+        install_roots, snapshot_cache=db_snapshot_cache
+    )
 
     return Store(
         root=root,
@@ -230,6 +265,9 @@ def create(configuration: ConfigurationType) -> Store:
         hash_length=hash_length,
         upstreams=upstreams,
         lock_cfg=spack.database.lock_configuration(configuration),
+        db_journal=configuration.get("config:db_journal", False),
+        db_binary_index=configuration.get("config:db_binary_index", False),
+        db_snapshot_cache=db_snapshot_cache,
     )
 
 
@@ -261,7 +299,7 @@ def restore(token):
 
 
 def _construct_upstream_dbs_from_install_roots(
-    install_roots: List[str], _test: bool = False
+    install_roots: List[str], _test: bool = False, snapshot_cache: Optional[str] = None
 ) -> List[spack.database.Database]:
     accumulated_upstream_dbs: List[spack.database.Database] = []
     for install_root in reversed(install_roots):
@@ -270,6 +308,7 @@ def _construct_upstream_dbs_from_install_roots(
             spack.util.path.canonicalize_path(install_root),
             is_upstream=True,
             upstream_dbs=upstream_dbs,
+            snapshot_cache=snapshot_cache,
         )
         next_db._fail_when_missing_deps = _test
         next_db._read()
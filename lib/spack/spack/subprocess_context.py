@@ -15,6 +15,7 @@
 
 import io
 import multiprocessing
+import os
 import pickle
 import pydoc
 import sys
@@ -65,7 +66,7 @@ class PackageInstallContext:
     needs to be transmitted to a child process.
     """
 
-    def __init__(self, pkg):
+    def __init__(self, pkg, global_state=True):
         if _SERIALIZE:
             self.serialized_pkg = serialize(pkg)
             self.serialized_env = serialize(spack.environment.active_environment())
@@ -73,10 +74,27 @@ def __init__(self, pkg):
             self.pkg = pkg
             self.env = spack.environment.active_environment()
         self.spack_working_dir = spack.main.spack_working_dir
-        self.test_state = TestState()
+        # The global state is not needed when restoring in a process that has it already,
+        # but the configuration and the environment variables may have changed since then
+        self.test_state = TestState() if global_state else None
+        self.config = None
+        self.environ = None
+        if not global_state:
+            config = spack.config.CONFIG
+            self.config = getattr(config, "instance", config)
+            self.environ = dict(os.environ)
 
     def restore(self):
-        self.test_state.restore()
+        if self.test_state:
+            self.test_state.restore()
+        if self.config is not None:
+            repos_changed = self.config.get("repos") != spack.config.CONFIG.get("repos")
+            spack.config.CONFIG = self.config
+            if repos_changed:
+                spack.repo.PATH = spack.repo.create(self.config)
+        if self.environ is not None:
+            os.environ.clear()
+            os.environ.update(self.environ)
         spack.main.spack_working_dir = self.spack_working_dir
         env = pickle.load(self.serialized_env) if _SERIALIZE else self.env
         pkg = pickle.load(self.serialized_pkg) if _SERIALIZE else self.pkg
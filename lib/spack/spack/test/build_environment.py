@@ -6,6 +6,7 @@
 import os
 import platform
 import posixpath
+import time
 
 import pytest
 
@@ -717,3 +718,80 @@ def test_rpath_with_duplicate_link_deps():
     assert child in rpath_deps
     assert runtime_2 in rpath_deps
     assert runtime_1 not in rpath_deps
+
+
+def _process_ids(pkg, kwargs):
+    return os.getpid(), os.getppid()
+
+
+def _fail(pkg, kwargs):
+    raise RuntimeError("failure in the build process")
+
+
+def _sleep(pkg, kwargs):
+    time.sleep(60)
+
+
+@pytest.mark.not_on_windows("Build process servers are POSIX only")
+def test_build_process_server(default_mock_concretization):
+    """Build processes are forked by the server, each in a process of its own."""
+    pkg = default_mock_concretization("trivial-install-test-package").package
+    server = spack.build_environment.BuildProcessServer()
+    try:
+        handles = [
+            spack.build_environment.spawn_build_process(
+                pkg, _process_ids, {"setup_env": False}, forward_stdin=False, server=server
+            )
+            for _ in range(3)
+        ]
+        results = [handle.complete() for handle in handles]
+        assert all(handle.process.exitcode == 0 for handle in handles)
+
+        with pytest.raises(spack.build_environment.ChildError, match="failure in the build"):
+            spack.build_environment.start_build_process(
+                pkg, _fail, {"setup_env": False}, server=server
+            )
+    finally:
+        server.close()
+
+    assert len({pid for pid, _ in results}) == 3
+    assert {ppid for _, ppid in results} == {server.process.pid}
+    assert server.process.exitcode == 0
+
+
+def _config_and_environ(pkg, kwargs):
+    return spack.config.get("config:build_jobs"), os.environ.get("SPACK_TEST_SERVER")
+
+
+@pytest.mark.not_on_windows("Build process servers are POSIX only")
+def test_build_process_server_sees_later_changes(
+    default_mock_concretization, mutable_config, monkeypatch
+):
+    """Build processes see the configuration and environment of the time of the request,
+    not of the time the server was started."""
+    pkg = default_mock_concretization("trivial-install-test-package").package
+    server = spack.build_environment.BuildProcessServer()
+    try:
+        spack.config.set("config:build_jobs", 7)
+        monkeypatch.setenv("SPACK_TEST_SERVER", "changed")
+        handle = spack.build_environment.spawn_build_process(
+            pkg, _config_and_environ, {"setup_env": False}, forward_stdin=False, server=server
+        )
+        assert handle.complete() == (7, "changed")
+    finally:
+        server.close()
+
+
+@pytest.mark.not_on_windows("Build process servers are POSIX only")
+def test_build_process_server_terminate(default_mock_concretization):
+    pkg = default_mock_concretization("trivial-install-test-package").package
+    server = spack.build_environment.BuildProcessServer()
+    try:
+        handle = spack.build_environment.spawn_build_process(
+            pkg, _sleep, {"setup_env": False}, forward_stdin=False, server=server
+        )
+        assert not handle.poll()
+        handle.terminate()
+        assert handle.process.exitcode < 0
+    finally:
+        server.close()
@@ -0,0 +1,54 @@
+# Copyright 2013-2024 Lawrence Livermore National Security, LLC and other
+# Spack Project Developers. See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+
+import pytest
+
+import spack.build_times
+import spack.spec
+import spack.util.file_cache
+
+
+@pytest.fixture()
+def file_cache(tmpdir):
+    return spack.util.file_cache.FileCache(str(tmpdir.join("cache")))
+
+
+def test_build_times_no_history(file_cache):
+    times = spack.build_times.BuildTimes(file_cache)
+    assert times.estimate(spack.spec.Spec("zlib@=1.3")) is None
+    assert times.default_estimate() == 1.0
+
+    # Nothing to save
+    times.save()
+    assert not file_cache.init_entry(spack.build_times.CACHE_KEY)
+
+
+def test_build_times_record_and_estimate(file_cache):
+    times = spack.build_times.BuildTimes(file_cache)
+    times.record(spack.spec.Spec("zlib@=1.3"), 10.0)
+    times.record(spack.spec.Spec("zlib@=1.2"), 20.0)
+    times.record(spack.spec.Spec("zlib@=1.3"), 2.0, cache=True)
+    times.save()
+
+    # A new instance reads the database from the cache
+    times = spack.build_times.BuildTimes(file_cache)
+    assert times.estimate(spack.spec.Spec("zlib@=1.3")) == 10.0
+    assert times.estimate(spack.spec.Spec("zlib@=1.3"), cache=True) == 2.0
+    # Unknown versions are estimated from the known ones
+    assert times.estimate(spack.spec.Spec("zlib@=1.4")) == 15.0
+    assert times.estimate(spack.spec.Spec("cmake@=3.27")) is None
+    assert times.default_estimate() == 15.0
+
+
+def test_build_times_are_smoothed(file_cache):
+    times = spack.build_times.BuildTimes(file_cache)
+    times.record(spack.spec.Spec("zlib@=1.3"), 10.0)
+    times.save()
+
+    times = spack.build_times.BuildTimes(file_cache)
+    times.record(spack.spec.Spec("zlib@=1.3"), 20.0)
+    times.save()
+
+    assert spack.build_times.BuildTimes(file_cache).estimate(spack.spec.Spec("zlib@=1.3")) == 15.0
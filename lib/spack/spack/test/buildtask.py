@@ -39,7 +39,7 @@ def test_build_task_basics(install_mockery):
     task = inst.BuildTask(spec.package, request, False, 0, 0, inst.STATUS_ADDED, set())
     assert not task.explicit
     assert task.priority == len(task.uninstalled_deps)
-    assert task.key == (task.priority, task.sequence)
+    assert task.key == (task.priority, -task.critical_path, task.sequence)
 
     # Ensure flagging installed works as expected
     assert len(task.uninstalled_deps) > 0
@@ -49,6 +49,25 @@ def test_build_task_basics(install_mockery):
     assert task.priority == 0
 
 
+def test_build_task_critical_path_order(install_mockery):
+    """Among tasks with the same number of uninstalled dependencies, the one with the
+    longest critical path goes first, regardless of the sequence."""
+    spec = spack.spec.Spec("trivial-install-test-package")
+    spec.concretize()
+    request = inst.BuildRequest(spec.package, {})
+    short = inst.BuildTask(spec.package, request, False, 0, 0, inst.STATUS_ADDED, set())
+    long = inst.BuildTask(spec.package, request, False, 0, 0, inst.STATUS_ADDED, set())
+    short.critical_path, long.critical_path = 1.0, 10.0
+    assert short.sequence < long.sequence
+    assert min([short, long], key=lambda task: task.key) is long
+
+    # Tasks with uninstalled dependencies still come after the ready ones
+    blocked = inst.BuildTask(spec.package, request, False, 0, 0, inst.STATUS_ADDED, set())
+    blocked.uninstalled_deps.add("dependency")
+    blocked.critical_path = 100.0
+    assert min([blocked, short], key=lambda task: task.key) is short
+
+
 def test_build_task_strings(install_mockery):
     """Tests of build_task repr and str for coverage purposes."""
     # Using a package with one dependency
@@ -328,6 +328,62 @@ def test_find_no_sections(database, config):
     assert "==>" not in output
 
 
+@pytest.mark.db
+@pytest.mark.parametrize(
+    "args",
+    [
+        [],
+        ["-l"],
+        ["-L", "-p"],
+        ["-x"],
+        ["-X", "--no-groups"],
+        ["--namespaces", "-p"],
+        ["-m", "-l"],
+        ["--only-deprecated"],
+        ["mpileaks"],
+        ["-l", "mpileaks@2.3", "libelf@:0.8.12"],
+        ["mpileaks@3:"],
+        ["mpi"],
+        ["--install-tree", "local", "callpath"],
+        ["-v"],
+        ["-lvp", "mpileaks"],
+    ],
+)
+def test_find_rows_like_specs(args, database, monkeypatch):
+    """Listing the rows of database records is the same as listing their specs, except
+    for the order of the installations of the same package version."""
+    from_rows = find(*args, fail_on_error=False)
+    monkeypatch.setattr(spack.cmd.find, "rows_suffice", lambda *args: False)
+    from_specs = find(*args, fail_on_error=False)
+    assert sorted(from_rows.splitlines()) == sorted(from_specs.splitlines())
+
+
+@pytest.mark.db
+def test_find_rows_by_hash(database):
+    libelf = database.query_one("libelf")
+    output = find("-p", f"/{libelf.dag_hash()[:6]}")
+    assert f"libelf@{libelf.version}" in output
+    assert libelf.prefix in output
+
+
+@pytest.mark.db
+def test_find_rows_skip_complex_constraints(database, monkeypatch):
+    """Constraints on more than the name, version and hash need specs."""
+    parser = argparse.ArgumentParser()
+    spack.cmd.find.setup_parser(parser)
+
+    def rows_suffice(*argv):
+        args = parser.parse_args(argv)
+        constraint_specs = spack.cmd.parse_specs(args.constraint)
+        return spack.cmd.find.rows_suffice(args, None, constraint_specs)
+
+    assert rows_suffice("mpileaks@2.3", "/abc")
+    assert rows_suffice("-v", "mpileaks")
+    for constraint in (["mpileaks", "^mpich"], ["mpileaks%gcc"], ["libdwarf", "~debug"]):
+        assert not rows_suffice(*constraint)
+    assert not rows_suffice("-d")
+
+
 @pytest.mark.db
 def test_find_command_basic_usage(database):
     output = find()
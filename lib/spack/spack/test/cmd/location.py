@@ -10,6 +10,7 @@
 
 from llnl.util.filesystem import mkdirp
 
+import spack.database
 import spack.environment as ev
 import spack.paths
 import spack.stage
@@ -132,6 +133,15 @@ def test_location_install_dir(mock_spec):
     assert location("--install-dir", spec.name).strip() == spec.prefix
 
 
+@pytest.mark.db
+def test_location_install_dir_from_rows(database, monkeypatch):
+    """A single matching installation is found without querying specs."""
+    libelf = database.query_one("libelf")
+    monkeypatch.setattr(spack.database.Database, "query", lambda *args, **kwargs: [])
+    assert location("--install-dir", f"/{libelf.dag_hash()[:7]}").strip() == libelf.prefix
+    assert location("--install-dir", "libelf").strip() == libelf.prefix
+
+
 @pytest.mark.db
 def test_location_package_dir(mock_spec):
     """Tests spack location --package-dir."""
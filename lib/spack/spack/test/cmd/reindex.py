@@ -55,3 +55,17 @@ def test_reindex_with_deprecated_packages(
 
     assert spack.store.STORE.db.query(installed=any) == all_installed
     assert spack.store.STORE.db.query(installed=True) == non_deprecated
+
+
+def test_reindex_concurrently(mock_packages, mock_archive, mock_fetch, install_mockery):
+    install("libelf@0.8.13")
+    install("libdwarf")
+
+    all_installed = spack.store.STORE.db.query()
+
+    os.remove(spack.store.STORE.db._index_path)
+    output = reindex("--jobs", "4")
+
+    assert spack.store.STORE.db.query() == all_installed
+    for phase in ("discover", "read", "assemble", "write", "total"):
+        assert phase in output
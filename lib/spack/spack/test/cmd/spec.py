@@ -7,11 +7,15 @@
 
 import pytest
 
+import spack.caches
+import spack.config
 import spack.environment as ev
 import spack.error
 import spack.parser
+import spack.solver.asp
 import spack.spec
 import spack.store
+import spack.util.file_cache
 from spack.main import SpackCommand, SpackCommandError
 
 pytestmark = pytest.mark.usefixtures("config", "mutable_mock_repo")
@@ -55,6 +59,22 @@ def test_spec_concretizer_args(mutable_config, mutable_database, do_not_check_ru
     assert h in output
 
 
+@pytest.mark.only_clingo("Original concretizer does not cache results")
+def test_spec_no_result_cache(mutable_config, tmpdir, monkeypatch):
+    """Tests that --no-result-cache bypasses the cache of the results of solves."""
+    cache = spack.util.file_cache.FileCache(str(tmpdir))
+    monkeypatch.setattr(spack.caches, "MISC_CACHE", cache)
+    spack.config.set("concretizer:result_cache", True)
+    spec("mpileaks")
+    assert len(tmpdir.join("solver", "results").listdir()) == 1
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("the cached result must not be used")
+
+    monkeypatch.setattr(spack.solver.asp.Solver, "_cached_result", _fail)
+    spec("--no-result-cache", "mpileaks")
+
+
 def test_spec_parse_dependency_variant_value():
     """Verify that we can provide multiple key=value variants to multiple separate
     packages within a spec string."""
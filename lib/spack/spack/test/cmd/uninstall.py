@@ -89,6 +89,16 @@ def test_recursive_uninstall(mutable_database):
     assert len(mpi_specs) == 3
 
 
+@pytest.mark.db
+def test_recursive_uninstall_with_jobs(mutable_database):
+    """Uninstalling many specs with many jobs leaves the database consistent."""
+    uninstall("-y", "-a", "-j", "4", "--dependents", "libelf")
+
+    assert len(spack.store.STORE.layout.all_specs()) == 6
+    assert not spack.store.STORE.db.query_local("libelf")
+    assert not spack.store.STORE.db.query_local("callpath", installed=any)
+
+
 @pytest.mark.db
 @pytest.mark.regression("3690")
 @pytest.mark.parametrize("constraint,expected_number_of_specs", [("dyninst", 8), ("libelf", 6)])
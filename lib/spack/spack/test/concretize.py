@@ -3087,3 +3087,29 @@ def test_reuse_prefers_standard_over_git_versions(
         test_spec = spack.spec.Spec("git-ref-package@2").concretized()
         assert git_spec.dag_hash() != test_spec.dag_hash()
         assert standard_spec.dag_hash() == test_spec.dag_hash()
+
+
+@pytest.mark.only_clingo("clingo only reuse feature being tested")
+def test_reusable_specs_are_pruned_to_possible_dependencies(
+    mutable_database, do_not_check_runtimes_on_reuse
+):
+    """Tests that reusable specs are deduplicated, and that the ones reaching packages that
+    cannot be part of the solve are not given to the solver.
+    """
+    installed = mutable_database.query()
+    setup = spack.solver.asp.SpackSolverSetup()
+    setup.setup([Spec("callpath")], reuse=installed + installed[:5])
+
+    counts = setup.reuse_counts
+    assert counts["candidates"] == len(installed) + 5
+    assert counts["duplicates"] == 5
+    assert counts["reusable"] + counts["unreachable"] == len(installed)
+
+    # Only callpath and its possible dependencies can be reused
+    reused = [s for _, s in setup.reusable_and_possible.explicit_items()]
+    assert reused and len(reused) == counts["reusable"]
+    assert all(s.name in setup.pkgs for spec in reused for s in spec.traverse())
+    assert not any(s.name == "mpileaks" for s in reused)
+
+    with spack.config.override("concretizer:reuse", True):
+        assert Spec("callpath ^mpich").concretized().installed
@@ -7,6 +7,7 @@
 import functools
 import json
 import os
+import pickle
 import shutil
 import sys
 
@@ -26,10 +27,12 @@
 
 import spack.database
 import spack.deptypes as dt
+import spack.directory_layout
 import spack.package_base
 import spack.repo
 import spack.spec
 import spack.store
+import spack.traverse
 import spack.version as vn
 from spack.schema.database_index import schema
 from spack.util.executable import Executable
@@ -142,6 +145,33 @@ def test_installed_upstream(upstream_and_downstream_db, tmpdir):
         downstream_db._check_ref_counts()
 
 
+@pytest.mark.usefixtures("config")
+def test_query_by_spec_hashes(upstream_and_downstream_db, tmpdir):
+    upstream_write_db, upstream_db, upstream_layout, downstream_db, downstream_layout = (
+        upstream_and_downstream_db
+    )
+
+    builder = spack.repo.MockRepositoryBuilder(tmpdir.mkdir("mock.repo"))
+    builder.add_package("z")
+    builder.add_package("y", dependencies=[("z", None, None)])
+
+    with spack.repo.use_repositories(builder.root):
+        spec = spack.spec.Spec("y").concretized()
+        upstream_write_db.add(spec["z"], upstream_layout)
+        upstream_db._read()
+        downstream_db.add(spec, downstream_layout)
+
+        records = downstream_db.query_by_spec_hashes(
+            [spec.dag_hash(), spec["z"].dag_hash(), "nonexistenthash"]
+        )
+        assert set(records) == {spec.dag_hash(), spec["z"].dag_hash()}
+
+        upstream, record = records[spec.dag_hash()]
+        assert not upstream and record.installed
+        upstream, record = records[spec["z"].dag_hash()]
+        assert upstream and record.path == upstream_layout.path_for_spec(spec["z"])
+
+
 @pytest.mark.usefixtures("config")
 def test_removed_upstream_dep(upstream_and_downstream_db, tmpdir):
     upstream_write_db, upstream_db, upstream_layout, downstream_db, downstream_layout = (
@@ -276,6 +306,50 @@ def test_recursive_upstream_dbs(tmpdir, gen_mock_layout):
         )
 
 
+@pytest.mark.usefixtures("config", "temporary_store")
+def test_merged_upstream_index(tmpdir, gen_mock_layout):
+    roots = [str(tmpdir.mkdir(x)) for x in ["a", "b", "c"]]
+    layouts = [gen_mock_layout(x) for x in ["/ra/", "/rb/", "/rc/"]]
+
+    builder = spack.repo.MockRepositoryBuilder(tmpdir.mkdir("mock.repo"))
+    builder.add_package("z")
+    builder.add_package("y", dependencies=[("z", None, None)])
+    builder.add_package("x", dependencies=[("y", None, None)])
+
+    with spack.repo.use_repositories(builder.root):
+        spec = spack.spec.Spec("x").concretized()
+        db_c = spack.database.Database(roots[2])
+        db_c.add(spec["z"], layouts[2])
+        db_b = spack.database.Database(roots[1], upstream_dbs=[db_c])
+        db_b.add(spec["y"], layouts[1])
+
+        upstream_dbs = spack.store._construct_upstream_dbs_from_install_roots(
+            [roots[1], roots[2]], _test=True
+        )
+        db_a = spack.database.Database(roots[0], upstream_dbs=upstream_dbs)
+        db_a.add(spec["x"], layouts[0])
+
+        # Hashes and names of all the upstreams are in a single index
+        index = db_a._upstream_index()
+        assert index.get(spec["y"].dag_hash()) == (
+            upstream_dbs[0],
+            upstream_dbs[0]._data[spec["y"].dag_hash()],
+        )
+        assert index.get(spec["z"].dag_hash())[0] is upstream_dbs[1]
+        assert set(index.by_name) == {"y", "z"}
+        assert index.candidates(spack.spec.Spec("z")) == [upstream_dbs[1]]
+        assert db_a.query("z") == [spec["z"]]
+
+        # Only the upstream whose index changed is read and indexed again
+        generations = [db._generation for db in upstream_dbs]
+        db_c.remove(spec["z"])
+        assert db_a.db_for_spec_hash(spec["z"].dag_hash()) is None
+        assert not db_a.query("z")
+        assert set(index.by_name) == {"y"}
+        assert upstream_dbs[0]._generation == generations[0]
+        assert upstream_dbs[1]._generation > generations[1]
+
+
 @pytest.fixture()
 def usr_folder_exists(monkeypatch):
     """The ``/usr`` folder is assumed to be existing in some tests. This
@@ -777,6 +851,48 @@ def test_uninstall_by_spec(mutable_database):
     assert len(mutable_database.query()) == 0
 
 
+def test_uninstall_by_specs(mutable_database, monkeypatch):
+    """Bulk uninstalls write the database once, and remove all the prefixes."""
+    specs = mutable_database.query_local(installed=True)
+    writes = []
+    monkeypatch.setattr(spack.database.Database, "_write", lambda db, *args: writes.append(args))
+
+    spack.package_base.PackageBase.uninstall_by_specs(specs, jobs=4)
+
+    assert len(writes) == 1
+    assert not mutable_database._data
+    assert not any(os.path.exists(s.prefix) for s in specs if not s.external)
+
+
+def test_uninstall_by_specs_partial_failure(mutable_database, monkeypatch):
+    """The dependencies of a spec whose prefix cannot be removed are kept."""
+    specs = mutable_database.query_local("mpileaks ^mpich")
+    failing = specs[0]
+    remove = spack.store.STORE.layout.remove_install_directory
+
+    def _remove(spec, deprecated=False):
+        if spec.dag_hash() == failing.dag_hash():
+            raise spack.directory_layout.RemoveFailedError(spec, spec.prefix, OSError())
+        remove(spec, deprecated)
+
+    monkeypatch.setattr(spack.store.STORE.layout, "remove_install_directory", _remove)
+    with pytest.raises(spack.directory_layout.RemoveFailedError):
+        spack.package_base.PackageBase.uninstall_by_specs(list(failing.traverse()), force=True)
+
+    for spec in failing.traverse():
+        assert spec.installed
+        assert spec.external or os.path.isdir(spec.prefix)
+
+
+def test_uninstall_by_specs_still_needed(mutable_database):
+    """Nothing is uninstalled when a spec is needed by another one."""
+    callpath = mutable_database.query_local("callpath ^mpich")
+    with pytest.raises(spack.package_base.PackageStillNeededError):
+        spack.package_base.PackageBase.uninstall_by_specs(callpath)
+    assert all(os.path.isdir(s.prefix) for s in callpath)
+    assert all(s.installed for s in callpath)
+
+
 def test_query_unused_specs(mutable_database):
     # This spec installs a fake cmake as a build only dependency
     s = spack.spec.Spec("simple-inheritance")
@@ -946,6 +1062,348 @@ def _raise(db, spec):
             assert False
 
 
+def _work_queue(root, worker, grace=60.0):
+    queue = spack.database.WorkQueue(
+        root, spack.database.SpecLocker(str(root.join("prefix_lock")), None), None, grace=grace
+    )
+    queue.worker = worker
+    return queue
+
+
+def test_query_checks_indexed_records_only(database, monkeypatch):
+    """Queries on abstract specs only check the records of matching packages."""
+    checked = []
+    satisfies = spack.spec.Spec.satisfies
+
+    def _satisfies(self, other, deps=True):
+        checked.append(self.name)
+        return satisfies(self, other, deps=deps)
+
+    monkeypatch.setattr(spack.spec.Spec, "satisfies", _satisfies)
+
+    assert len(database.query("mpileaks")) == 3
+    assert set(checked) == {"mpileaks"}
+
+    checked.clear()
+    assert len(database.query("mpi")) == 3
+    assert set(checked) == {"mpich", "mpich2", "zmpi"}
+
+
+def test_query_indexes_follow_updates(mutable_database):
+    spec = mutable_database.query_one("mpileaks ^mpich")
+    indexes = mutable_database._query_indexes()
+    assert spec.dag_hash() in indexes.explicit
+
+    mutable_database.update_explicit(spec, False)
+    assert spec not in mutable_database.query(explicit=True)
+    assert spec in mutable_database.query("mpileaks", explicit=False)
+
+    mutable_database.remove(spec)
+    assert not mutable_database.query("mpileaks ^mpich")
+    assert spec.dag_hash() not in indexes.by_name["mpileaks"]
+
+    # Indexes are rebuilt when the records are replaced
+    records = mutable_database._data
+    mutable_database._data = {k: r for k, r in records.items() if r.spec.name != "mpileaks"}
+    assert not mutable_database.query_local("mpileaks")
+    mutable_database._data = records
+    assert mutable_database.query_local("mpileaks")
+
+
+def _records(database):
+    return {k: r.to_dict(include_fields=database.record_fields) for k, r in database._data.items()}
+
+
+@pytest.fixture()
+def journaled_database(mutable_database, monkeypatch):
+    """Mutable database writing to a journal, which is never compacted."""
+    monkeypatch.setattr(spack.database, "_JOURNAL_COMPACTION_RATIO", 100)
+    mutable_database.journal = True
+    # Write an index.json with a journal
+    with mutable_database.write_transaction():
+        pass
+    return mutable_database
+
+
+def test_journal_appends_changes(journaled_database, monkeypatch):
+    db = journaled_database
+    with open(db._index_path) as f:
+        index = f.read()
+    verifier = db.last_seen_verifier
+
+    reader = spack.database.Database(db.root)
+    reader._fail_when_missing_deps = True
+    reader.query_local()
+
+    db.update_explicit(db.query_one("mpich"), True)
+    _check_remove_and_add_package(db, "mpileaks ^mpich")
+    db.remove(db.query_one("mpileaks ^zmpi"))
+
+    # Only the journal was written
+    with open(db._index_path) as f:
+        assert f.read() == index
+    assert db.last_seen_verifier == verifier
+
+    # Readers replay only the new entries of the journal
+    def _fail(filename):
+        raise AssertionError("index.json should not be read again")
+
+    monkeypatch.setattr(reader, "_read_from_file", _fail)
+    assert len(reader.query_local("mpileaks")) == len(db.query_local("mpileaks"))
+    assert _records(reader) == _records(db)
+    assert reader._installed_prefixes == db._installed_prefixes
+    reader._check_ref_counts()
+
+    # New readers replay the whole journal on top of index.json
+    fresh = spack.database.Database(db.root)
+    fresh._fail_when_missing_deps = True
+    assert fresh.query_local("mpich", explicit=True)
+    assert _records(fresh) == _records(db)
+
+
+def test_journal_compaction(journaled_database, monkeypatch):
+    monkeypatch.setattr(spack.database, "_JOURNAL_COMPACTION_RATIO", 0)
+    db = journaled_database
+    verifier = db.last_seen_verifier
+
+    db.update_explicit(db.query_one("mpich"), True)
+    assert db.last_seen_verifier != verifier
+    with open(db._journal_path) as f:
+        assert len(f.readlines()) == 1
+    assert spack.database.Database(db.root).query_local("mpich", explicit=True)
+
+
+def test_journal_partial_and_stale_entries(journaled_database):
+    db = journaled_database
+    spec = db.query_one("mpileaks ^mpich")
+    db.update_explicit(spec, False)
+
+    # An incomplete entry, e.g. from an interrupted write, is ignored and then overwritten
+    with open(db._journal_path, "a") as f:
+        f.write('{"hash": "')
+    assert not spack.database.Database(db.root).get_record(spec).explicit
+    db.update_explicit(spec, True)
+    assert spack.database.Database(db.root).get_record(spec).explicit
+
+    # Without a journal, index.json is written in full and the journal is dropped
+    db.journal = False
+    db.update_explicit(spec, False)
+    assert not os.path.exists(db._journal_path)
+    assert not spack.database.Database(db.root).get_record(spec).explicit
+
+
+@pytest.fixture()
+def tabled_database(mutable_database):
+    """Mutable database writing a record table along with index.json."""
+    mutable_database.binary_index = True
+    with mutable_database.write_transaction():
+        pass
+    return mutable_database
+
+
+def test_record_table_reads_records_lazily(tabled_database):
+    db = tabled_database
+    spec = db.query_one("mpileaks ^mpich")
+
+    reader = spack.database.Database(db.root)
+    reader._fail_when_missing_deps = True
+    assert reader.get_by_hash(spec.dag_hash()[:7]) == [spec]
+
+    # Only the record looked up, and those of its dependencies, were read
+    assert isinstance(reader._data, spack.database.LazyRecords)
+    deps = spec.traverse(deptype=spack.database._TRACKED_DEPENDENCIES)
+    assert set(reader._data._records) == {s.dag_hash() for s in deps}
+
+    # Records are read along with their dependents
+    callpath = spec["callpath"]
+    (found,) = reader.get_by_hash(callpath.dag_hash())
+    assert {s.dag_hash() for s in found.dependents()} == {
+        s.dag_hash() for s in callpath.dependents()
+    }
+
+    table = reader._data.table
+    assert pickle.loads(pickle.dumps(table)).get(spec.dag_hash()) == table.get(spec.dag_hash())
+
+    assert reader.query("mpileaks ^mpich") == [spec]
+    assert reader._installed_prefixes == db._installed_prefixes
+    assert _records(reader) == _records(db)
+    reader._check_ref_counts()
+
+
+def test_record_table_rows(tabled_database):
+    """Rows are read from the record table without reading records, and are the same as
+    the rows of the records."""
+    reader = spack.database.Database(tabled_database.root)
+    rows = reader.query_rows(installed=any)
+    assert isinstance(reader._data, spack.database.LazyRecords)
+    assert not reader._data._records
+
+    expected = {row.hash: row for row in tabled_database.query_rows(installed=any)}
+    assert {row.hash: row for row in rows} == expected
+    assert any(row.variants for row in rows)
+
+
+def test_record_table_with_journal(tabled_database, monkeypatch):
+    monkeypatch.setattr(spack.database, "_JOURNAL_COMPACTION_RATIO", 100)
+    tabled_database.journal = True
+    with tabled_database.write_transaction():
+        pass
+
+    db = spack.database.Database(tabled_database.root, journal=True, binary_index=True)
+    db._fail_when_missing_deps = True
+    _check_remove_and_add_package(db, "mpileaks ^mpich")
+    db.update_explicit(db.query_one("mpich"), True)
+    db.remove(db.query_one("mpileaks ^zmpi"))
+    assert isinstance(db._data, spack.database.LazyRecords)
+
+    reader = spack.database.Database(db.root)
+    reader._fail_when_missing_deps = True
+    assert reader.query_local("mpich", explicit=True)
+    assert _records(reader) == _records(db)
+    assert reader._installed_prefixes == db._installed_prefixes
+
+
+def test_record_table_ignored_when_stale(tabled_database):
+    # Another Spack rewrote index.json
+    with open(tabled_database._verifier_path, "w") as f:
+        f.write("other")
+    assert os.path.exists(tabled_database._table_path)
+
+    reader = spack.database.Database(tabled_database.root)
+    assert reader.query_local("mpileaks")
+    assert not isinstance(reader._data, spack.database.LazyRecords)
+
+    # The record table is removed when it is not written
+    tabled_database.binary_index = False
+    tabled_database.update_explicit(tabled_database.query_one("mpich"), True)
+    assert not os.path.exists(tabled_database._table_path)
+
+
+def _read_records(database):
+    database._read()
+    return _records(database)
+
+
+def _traversed_dependents(spec, deptype):
+    return {
+        s.dag_hash()
+        for s in spack.traverse.traverse_nodes(
+            [spec], root=False, direction="parents", deptype=deptype
+        )
+    }
+
+
+def test_dependents_index(mutable_database):
+    mpich = mutable_database.query_one("mpich")
+    libelf = mutable_database.query_one("libelf")
+
+    for spec in (mpich, libelf):
+        for deptype in (dt.ALL, dt.LINK, dt.BUILD):
+            dependents = mutable_database.installed_dependents([spec], deptype=deptype)
+            assert {s.dag_hash() for s in dependents} == _traversed_dependents(spec, deptype)
+
+    # The index follows removals
+    for spec in mutable_database.query("mpileaks ^mpich"):
+        mutable_database.remove(spec)
+    dependents = mutable_database.installed_dependents([mpich])
+    assert {s.name for s in dependents} == {"callpath"}
+    assert {s.dag_hash() for s in dependents} == _traversed_dependents(mpich, dt.ALL)
+
+
+def test_dependents_index_from_record_table(tabled_database):
+    mpich = tabled_database.query_one("mpich")
+    expected = _traversed_dependents(mpich, dt.LINK | dt.RUN)
+
+    reader = spack.database.Database(tabled_database.root)
+    with reader.read_transaction():
+        keys = reader._dependent_keys([mpich.dag_hash()], dt.LINK | dt.RUN)
+        # Dependents are found without reading any record
+        assert isinstance(reader._data, spack.database.LazyRecords)
+        assert not reader._data._records
+    assert set(keys) == expected
+
+
+def test_cached_snapshot_read_by_later_processes(mutable_database, tmpdir):
+    cache = str(tmpdir.join("snapshots"))
+    expected = _read_records(mutable_database)
+
+    # The first reader parses index.json and leaves a snapshot for later ones
+    first = spack.database.Database(mutable_database.root, snapshot_cache=cache)
+    assert _read_records(first) == expected
+    assert not isinstance(first._data, spack.database.LazyRecords)
+    assert os.path.exists(first._snapshot_path)
+
+    for later in (
+        spack.database.Database(mutable_database.root, snapshot_cache=cache),
+        spack.database.Database(mutable_database.root, is_upstream=True, snapshot_cache=cache),
+    ):
+        later._fail_when_missing_deps = True
+        assert _read_records(later) == expected
+        assert isinstance(later._data, spack.database.LazyRecords)
+        assert later._records_path == first._snapshot_path
+
+
+def test_cached_snapshot_ignored_when_stale(mutable_database, tmpdir):
+    cache = str(tmpdir.join("snapshots"))
+    snapshot_db = spack.database.Database(mutable_database.root, snapshot_cache=cache)
+    _read_records(snapshot_db)
+
+    # Another Spack, not keeping snapshots, rewrote index.json
+    mutable_database.update_explicit(mutable_database.query_one("mpich"), True)
+    expected = _read_records(mutable_database)
+
+    reader = spack.database.Database(mutable_database.root, snapshot_cache=cache)
+    assert _read_records(reader) == expected
+    assert not isinstance(reader._data, spack.database.LazyRecords)
+
+    # Writers keeping snapshots refresh them along with index.json
+    snapshot_db.update_explicit(snapshot_db.query_one("mpich"), False)
+    expected = _read_records(snapshot_db)
+
+    reader = spack.database.Database(mutable_database.root, snapshot_cache=cache)
+    assert _read_records(reader) == expected
+    assert isinstance(reader._data, spack.database.LazyRecords)
+
+
+def test_work_queue_claims(default_mock_concretization, tmpdir):
+    """Test that a spec can only be claimed by one installer at a time."""
+    s = default_mock_concretization("a")
+    first, second = _work_queue(tmpdir, "node1:1"), _work_queue(tmpdir, "node2:2")
+
+    assert first.claim(s)
+    assert first.claim(s)
+    assert not second.claim(s)
+    assert first.entries()[s.dag_hash()]["worker"] == "node1:1"
+
+    # Once the installation is done, the entry is dropped and the spec can be claimed again
+    first.complete(s, installed=True)
+    assert s.dag_hash() not in first.entries()
+    assert second.claim(s)
+
+    second.complete(s, installed=False)
+    assert s.dag_hash() not in first.entries()
+    assert second.claim(s)
+
+    # Claims are dropped when an installer is done
+    second.release_all()
+    assert s.dag_hash() not in first.entries()
+
+
+def test_work_queue_abandoned_claims(default_mock_concretization, tmpdir):
+    """Test that claims older than the grace period, on specs whose prefix is not
+    locked, can be taken over."""
+    s = default_mock_concretization("a")
+    first, second = _work_queue(tmpdir, "node1:1"), _work_queue(tmpdir, "node2:2", grace=0)
+
+    assert first.claim(s)
+    assert second.claim(s)
+    assert first.entries()[s.dag_hash()]["worker"] == "node2:2"
+
+    # Only the installer holding the claim reports on it
+    first.complete(s, installed=False)
+    assert first.entries()[s.dag_hash()]["status"] == "claimed"
+
+
 @pytest.mark.regression("26600")
 def test_database_works_with_empty_dir(tmpdir):
     # Create the lockfile and failures directory otherwise
@@ -14,6 +14,7 @@
 
 from llnl.path import path_to_os_path
 
+import spack.directory_layout
 import spack.paths
 import spack.repo
 from spack.directory_layout import DirectoryLayout, InvalidDirectoryLayoutParametersError
@@ -217,6 +218,32 @@ def test_find(temporary_store, config, mock_packages):
         assert found_specs[name].eq_dag(spec)
 
 
+def test_find_concurrently(temporary_store, config, mock_packages):
+    """Test that spec files are found and read the same way with many jobs, and read only
+    once when reads are cached."""
+    layout = temporary_store.layout
+    specs = [Spec(name).concretized() for name in ("libelf", "libdwarf", "callpath")]
+    for spec in specs:
+        for node in spec.traverse():
+            if not os.path.isdir(node.prefix):
+                layout.create_install_directory(node)
+
+    assert sorted(layout.spec_files(jobs=4)) == sorted(layout.spec_files())
+    found = layout.all_specs(jobs=4)
+    assert sorted(s.dag_hash() for s in found) == sorted(s.dag_hash() for s in layout.all_specs())
+    assert all(s.dag_hash() in {f.dag_hash() for f in found} for s in specs)
+
+    with layout.cached_spec_reads():
+        cached = layout.read_specs(layout.spec_files(), jobs=4)
+        # Installations whose spec files were read are not checked on the file system
+        os.remove(layout.spec_file_path(specs[0]))
+        layout.ensure_installed(specs[0])
+        assert layout.read_spec(layout.spec_file_path(specs[0])) in cached
+
+    with pytest.raises(spack.directory_layout.InconsistentInstallDirectoryError):
+        layout.ensure_installed(specs[0])
+
+
 def test_yaml_directory_layout_build_path(tmpdir, default_mock_concretization):
     """This tests build path method."""
     spec = default_mock_concretization("python")
@@ -843,3 +843,59 @@ def test_root_version_weights_for_old_versions(mutable_mock_env_path, mock_packa
 
     assert bowtie.satisfies("@=1.3.0")
     assert gcc.satisfies("@=1.0")
+
+
+@pytest.mark.only_clingo("Original concretizer does not support multi-shot solves")
+def test_multi_shot_gives_same_roots(tmp_path, mock_packages, mutable_config, monkeypatch):
+    """Tests that roots concretized separately in a shared problem are the same as
+    when they are concretized one at a time, and that only roots leading to the same
+    problem share it.
+    """
+    manifest = tmp_path / "spack.yaml"
+    manifest.write_text(
+        """\
+spack:
+  definitions:
+  - packages: [mpileaks, callpath]
+  - mpis: [^mpich, ^zmpi]
+  specs:
+  - libelf
+  - dt-diamond
+  - matrix:
+    - [$packages]
+    - [$mpis]
+  concretizer:
+    unify: false
+"""
+    )
+    with ev.Environment(manifest.parent) as e:
+        e.concretize()
+        expected = sorted(s.dag_hash() for s in e.concrete_roots())
+
+    # Only the roots leading to the same problem share it, whatever the number of processes
+    batches = ev.environment._multi_shot_batches(
+        [(i, [str(root)], False) for i, root in enumerate(e.user_specs)]
+    )
+    assert sorted(sorted(str(e.user_specs[i]) for i, _, _ in batch) for batch in batches) == [
+        ["callpath ^mpich", "callpath ^zmpi"],
+        ["dt-diamond"],
+        ["libelf"],
+        ["mpileaks ^mpich", "mpileaks ^zmpi"],
+    ]
+
+    # Roots are solved in worker processes
+    solved_alone = tmp_path / "solved_alone"
+    solved_alone.touch()
+    concretize_from_constraints = ev.environment._concretize_from_constraints
+
+    def _concretize(spec_constraints, tests=False):
+        with open(solved_alone, "a") as f:
+            f.write(f"{spec_constraints[0]}\n")
+        return concretize_from_constraints(spec_constraints, tests)
+
+    monkeypatch.setattr(ev.environment, "_concretize_from_constraints", _concretize)
+    with spack.config.override("concretizer:multi_shot", True):
+        with ev.Environment(manifest.parent) as e:
+            e.concretize(force=True)
+            assert sorted(solved_alone.read_text().split()) == ["dt-diamond", "libelf"]
+            assert sorted(s.dag_hash() for s in e.concrete_roots()) == expected
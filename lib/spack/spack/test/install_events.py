@@ -0,0 +1,69 @@
+# Copyright 2013-2024 Lawrence Livermore National Security, LLC and other
+# Spack Project Developers. See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+import json
+import os
+
+import spack.install_events
+
+
+def _read_events(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_event_stream(tmpdir):
+    path = str(tmpdir.join("events.jsonl"))
+    events = spack.install_events.open_stream(path)
+    events.emit("task_queued", "zlib-1.3-abcdef", priority=0)
+    events.emit("done")
+    events.close()
+
+    first, second = _read_events(path)
+    assert first["event"] == "task_queued"
+    assert first["package"] == "zlib-1.3-abcdef"
+    assert first["priority"] == 0
+    assert first["pid"] == os.getpid()
+    assert "package" not in second
+    assert second["time"] >= first["time"]
+
+
+def test_event_stream_appends(tmpdir):
+    """Events of several streams on the same file, e.g. from build processes, are kept."""
+    path = str(tmpdir.join("events.jsonl"))
+    for event in ("first", "second"):
+        events = spack.install_events.open_stream(path)
+        events.emit(event)
+        events.close()
+
+    assert [e["event"] for e in _read_events(path)] == ["first", "second"]
+
+
+def test_event_timer(tmpdir):
+    path = str(tmpdir.join("events.jsonl"))
+    events = spack.install_events.open_stream(path)
+    timer = events.timer("zlib-1.3-abcdef")
+    with timer.measure("fetch"):
+        pass
+    timer.start("install")
+    timer.stop()
+    events.close()
+
+    emitted = [(e["event"], e["phase"]) for e in _read_events(path)]
+    assert emitted == [
+        ("phase_start", "fetch"),
+        ("phase_end", "fetch"),
+        ("phase_start", "install"),
+        ("phase_end", "install"),
+    ]
+    assert timer.phases == ["fetch", "install"]
+
+
+def test_null_event_stream():
+    events = spack.install_events.open_stream(None)
+    assert events is spack.install_events.NULL_STREAM
+    events.emit("ignored")
+    with events.timer("zlib-1.3-abcdef").measure("fetch") as timer:
+        pass
+    assert timer.phases == ["fetch"]
@@ -4,9 +4,11 @@
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
 
 import glob
+import json
 import os
 import shutil
 import sys
+import time
 from typing import List, Optional, Union
 
 import py
@@ -19,6 +21,8 @@
 import llnl.util.tty as tty
 
 import spack.binary_distribution
+import spack.build_environment
+import spack.build_times
 import spack.compilers
 import spack.concretize
 import spack.config
@@ -30,6 +34,8 @@
 import spack.repo
 import spack.spec
 import spack.store
+import spack.util.file_cache
+import spack.util.jobserver
 import spack.util.lock as lk
 import spack.version
 
@@ -198,6 +204,144 @@ def _spec(spec, unsigned=False, mirrors_for_spec=None):
     assert "from binary cache" in out
 
 
+def test_process_binary_cache_tarball_prefetched(install_mockery, monkeypatch):
+    """Tests that a prefetched tarball is extracted without downloading it again."""
+    extracted = []
+
+    def _download(*args, **kwargs):
+        assert False, "the prefetched tarball must not be downloaded again"
+
+    monkeypatch.setattr(spack.binary_distribution, "download_tarball", _download)
+    monkeypatch.setattr(
+        spack.binary_distribution,
+        "extract_tarball",
+        lambda spec, download_result, **kwargs: extracted.append(download_result),
+    )
+    monkeypatch.setattr(spack.database.Database, "add", _noop)
+
+    spec = spack.spec.Spec("a").concretized()
+    download_result = {"tarball_stage": None, "specfile_stage": None}
+    assert inst._process_binary_cache_tarball(
+        spec.package, explicit=False, unsigned=False, download_result=download_result
+    )
+    assert extracted == [download_result]
+
+
+class _MockStage:
+    def __init__(self, path):
+        self.save_filename = path
+
+    def destroy(self):
+        os.remove(self.save_filename)
+
+
+def _mock_download_result(tmpdir, name):
+    tmpdir.join(name).write("x" * 10)
+    tmpdir.join(f"{name}.json").write("{}")
+    return {
+        "tarball_stage": _MockStage(str(tmpdir.join(name))),
+        "specfile_stage": _MockStage(str(tmpdir.join(f"{name}.json"))),
+    }
+
+
+def _wait_for_prefetches(processes):
+    while processes.running:
+        processes.poll()
+        time.sleep(0.01)
+
+
+def test_binary_prefetcher(install_mockery, monkeypatch, tmpdir):
+    """Tests that tarballs are prefetched in child processes in queue order, handed over
+    once, and that the ones never handed over are cleaned up."""
+
+    def _download(spec, unsigned=False, mirrors_for_spec=None):
+        assert os.getpid() != parent
+        if spec.name == "c":
+            return None
+        return _mock_download_result(tmpdir, spec.name)
+
+    parent = os.getpid()
+    monkeypatch.setattr(
+        spack.binary_distribution, "get_mirrors_for_spec", lambda spec, index_only: ["mirror"]
+    )
+    monkeypatch.setattr(spack.binary_distribution, "download_tarball", _download)
+    monkeypatch.setattr(spack.binary_distribution, "verify_download", _noop)
+
+    specs = {name: spack.spec.Spec(name).concretized() for name in ("a", "b", "c")}
+    tasks = [create_build_task(specs[name].package) for name in ("c", "b", "a")]
+
+    prefetcher = inst.BinaryPrefetcher(jobs=4, max_bytes=1024)
+    prefetcher.schedule(tasks)
+    assert all(s.dag_hash() in prefetcher.downloads for s in specs.values())
+
+    # A failed download falls back to a regular install
+    assert prefetcher.take(specs["c"]) is None
+
+    result = prefetcher.take(specs["b"])
+    assert result["tarball_stage"].save_filename == str(tmpdir.join("b"))
+    assert prefetcher.take(specs["b"]) is None
+
+    prefetcher.close()
+    assert not tmpdir.join("a").exists() and not tmpdir.join("a.json").exists()
+    assert tmpdir.join("b").exists() and tmpdir.join("b.json").exists()
+
+
+def test_binary_prefetcher_staging_budget(install_mockery, monkeypatch, tmpdir):
+    """Tests that no more downloads are started once the staging budget is used."""
+    monkeypatch.setattr(
+        spack.binary_distribution, "get_mirrors_for_spec", lambda spec, index_only: ["mirror"]
+    )
+    monkeypatch.setattr(
+        spack.binary_distribution,
+        "download_tarball",
+        lambda spec, *args: _mock_download_result(tmpdir, spec.name),
+    )
+    monkeypatch.setattr(spack.binary_distribution, "verify_download", _noop)
+
+    specs = [spack.spec.Spec(name).concretized() for name in ("a", "b")]
+    prefetcher = inst.BinaryPrefetcher(jobs=1, max_bytes=5)
+    try:
+        prefetcher.schedule(create_build_task(s.package) for s in specs)
+        _wait_for_prefetches(prefetcher.downloads)
+        prefetcher.schedule(create_build_task(s.package) for s in specs)
+        assert list(prefetcher.downloads.done) == [specs[0].dag_hash()]
+        assert specs[1].dag_hash() not in prefetcher.downloads
+        assert not prefetcher.has_capacity()
+    finally:
+        prefetcher.close()
+
+
+def test_binary_prefetcher_counts_downloads_in_progress(install_mockery, monkeypatch, tmpdir):
+    """Tests that downloads in progress are counted against the staging budget."""
+    done = tmpdir.join("done")
+
+    def _download(spec, *args):
+        while spec.name != "a" and not done.exists():
+            time.sleep(0.01)
+        return _mock_download_result(tmpdir, spec.name)
+
+    monkeypatch.setattr(
+        spack.binary_distribution, "get_mirrors_for_spec", lambda spec, index_only: ["mirror"]
+    )
+    monkeypatch.setattr(spack.binary_distribution, "download_tarball", _download)
+    monkeypatch.setattr(spack.binary_distribution, "verify_download", _noop)
+
+    specs = [spack.spec.Spec(name).concretized() for name in ("a", "b", "c")]
+    prefetcher = inst.BinaryPrefetcher(jobs=4, max_bytes=25)
+    try:
+        prefetcher.schedule([create_build_task(specs[0].package)])
+        _wait_for_prefetches(prefetcher.downloads)
+
+        # The download of b is expected to stage 10 more bytes, so c would not fit
+        prefetcher.schedule(create_build_task(s.package) for s in specs)
+        assert list(prefetcher.downloads.running) == [specs[1].dag_hash()]
+        assert specs[2].dag_hash() not in prefetcher.downloads
+        assert not prefetcher.has_capacity()
+    finally:
+        done.write("")
+        prefetcher.close()
+
+
 def test_try_install_from_binary_cache(install_mockery, mock_packages, monkeypatch):
     """Test return false when no match exists in the mirror"""
     spec = spack.spec.Spec("mpich")
@@ -728,6 +872,52 @@ def test_prepare_for_install_on_installed(install_mockery, monkeypatch):
     installer._prepare_for_install(task)
 
 
+def test_init_queue_skips_installed_deps(install_mockery, monkeypatch):
+    """Test that installed dependencies are flagged as installed without a build task."""
+    dep = spack.spec.Spec("dependency-install").concretized()
+    create_installer([dep], {"fake": True}).install()
+
+    installer = create_installer(["dependent-install"], {})
+    dep_id = inst.package_id(dep)
+
+    # The installation status of the DAG is resolved with a single bulk lookup
+    calls = []
+    query = spack.database.Database.query_by_spec_hashes
+
+    def _query(db, hash_keys):
+        calls.append(list(hash_keys))
+        return query(db, hash_keys)
+
+    monkeypatch.setattr(spack.database.Database, "query_by_spec_hashes", _query)
+    installer._init_queue()
+
+    assert len(calls) == 1
+    assert dep.dag_hash() in installer.satisfied
+    assert dep_id in installer.installed
+    assert dep_id not in installer.build_tasks
+
+    task = installer.build_tasks[installer.build_requests[0].pkg_id]
+    assert not task.uninstalled_deps
+    assert installer.locks[dep_id][0] == "read"
+    installer._cleanup_all_tasks()
+
+
+def test_init_queue_explicit_installed_dep(install_mockery):
+    """Test that installed dependencies requested explicitly still get a build task."""
+    dep = spack.spec.Spec("dependency-install").concretized()
+    create_installer([dep], {"fake": True}).install()
+
+    dependent = spack.spec.Spec("dependent-install").concretized()
+    installer = create_installer(
+        [dependent, dependent["dependency-install"]],
+        {"explicit": [dependent.dag_hash(), dep.dag_hash()]},
+    )
+    installer._init_queue()
+
+    assert not installer.satisfied
+    assert inst.package_id(dep) in installer.build_tasks
+
+
 def test_installer_init_requests(install_mockery):
     """Test of installer initial requests."""
     spec_name = "dependent-install"
@@ -1359,3 +1549,275 @@ def test_print_install_test_log_failures(
     spack.installer.print_install_test_log(pkg)
     out = capfd.readouterr()[0]
     assert "See test results at" in out
+
+
+def test_install_concurrent_packages(install_mockery, mock_fetch):
+    """Test that independent packages are built in the background at the same time."""
+    installer = create_installer(
+        ["dependent-install", "trivial-install-test-package"], {"concurrent_packages": 2}
+    )
+    assert installer.max_active_builds == 2
+
+    installer.install()
+
+    assert not installer.active_builds
+    for request in installer.build_requests:
+        assert request.pkg_id in installer.installed
+        assert request.spec.installed
+
+
+@pytest.mark.not_on_windows("Build process servers are POSIX only")
+@pytest.mark.parametrize("concurrent_packages", [1, 2])
+def test_install_warm_build_processes(
+    install_mockery, mock_fetch, monkeypatch, concurrent_packages
+):
+    """Test that builds are forked by a build process server, when enabled."""
+    servers = []
+    server_class = spack.build_environment.BuildProcessServer
+
+    def _server():
+        servers.append(server_class())
+        return servers[-1]
+
+    monkeypatch.setattr(spack.build_environment, "BuildProcessServer", _server)
+
+    with spack.config.override("config:warm_build_processes", True):
+        installer = create_installer(
+            ["dependent-install", "trivial-install-test-package"],
+            {"concurrent_packages": concurrent_packages},
+        )
+        installer.install()
+
+    assert len(servers) == 1 and servers[0].process.exitcode == 0
+    assert installer.build_process_server is None
+    for request in installer.build_requests:
+        assert request.spec.installed
+
+
+def test_install_fetch_ahead(install_mockery, mock_fetch, monkeypatch, capfd, tmpdir):
+    """Test that the sources of the packages to build are fetched ahead of their builds,
+    in child processes."""
+    fetched = tmpdir.join("fetched")
+    fetch = inst.SourcePrefetcher._fetch
+
+    def _fetch(pkg):
+        fetched.write(f"{pkg.name} {os.getpid()}\n", mode="a")
+        return fetch(pkg)
+
+    monkeypatch.setattr(inst.SourcePrefetcher, "_fetch", staticmethod(_fetch))
+
+    installer = create_installer(["dependent-install"], {"fetch_ahead": 2})
+    installer.install()
+
+    lines = [line.split() for line in fetched.read().splitlines()]
+    assert sorted(name for name, _ in lines) == ["dependency-install", "dependent-install"]
+    assert all(int(pid) != os.getpid() for _, pid in lines)
+    assert installer.source_prefetcher is None
+    assert installer.build_requests[0].spec.installed
+
+    out = capfd.readouterr()[0]
+    assert "Fetched the sources of 2 packages ahead of their builds" in out
+
+
+@pytest.mark.disable_clean_stage_check
+def test_install_concurrent_packages_failure(install_mockery, mock_fetch, capfd):
+    """Test that a failed background build skips its dependents but not other builds."""
+    installer = create_installer(
+        ["failing-build", "trivial-install-test-package"], {"concurrent_packages": 2}
+    )
+
+    with pytest.raises(inst.InstallError, match="Installation request failed"):
+        installer.install()
+
+    failing, trivial = (request.pkg_id for request in installer.build_requests)
+    assert not installer.active_builds
+    assert failing in installer.failed
+    assert trivial in installer.installed
+
+
+def test_install_concurrent_binaries(install_mockery, monkeypatch):
+    """Test that packages are extracted from binary caches in child processes, and
+    added to the database by the installer."""
+
+    def _extract(pkg, explicit, unsigned=None, register=True, **kwargs):
+        assert not register
+        spack.store.STORE.layout.create_install_directory(pkg.spec)
+        with open(os.path.join(pkg.prefix, "pid"), "w") as f:
+            f.write(str(os.getpid()))
+        return True
+
+    monkeypatch.setattr(inst, "_try_install_from_binary_cache", _extract)
+    installer = create_installer(
+        ["dependent-install", "trivial-install-test-package"], {"concurrent_packages": 2}
+    )
+
+    installer.install()
+
+    assert not installer.active_builds and not installer.active_extractions
+    for spec in (request.spec for request in installer.build_requests):
+        for s in spec.traverse():
+            assert s.installed
+            with open(os.path.join(s.prefix, "pid")) as f:
+                assert int(f.read()) != os.getpid()
+    assert all(task.pkg.installed_from_binary_cache for task in installer.build_tasks.values())
+
+
+def test_install_concurrent_binaries_fallback(install_mockery, mock_fetch, monkeypatch):
+    """Test that packages without binaries are built from sources after a background
+    extraction attempt."""
+    monkeypatch.setattr(inst, "_try_install_from_binary_cache", _none)
+    installer = create_installer(["dependent-install"], {"concurrent_packages": 2})
+
+    installer.install()
+
+    spec = installer.build_requests[0].spec
+    assert all(s.installed for s in spec.traverse())
+    assert not any(task.pkg.installed_from_binary_cache for task in installer.build_tasks.values())
+
+
+def test_install_concurrent_binaries_cache_only(install_mockery, monkeypatch):
+    """Test that packages without binaries fail when only binaries are allowed, without
+    writing the database."""
+    monkeypatch.setattr(inst, "_try_install_from_binary_cache", _none)
+    installer = create_installer(
+        ["trivial-install-test-package"], {"concurrent_packages": 2, "package_cache_only": True}
+    )
+    writes = []
+    monkeypatch.setattr(spack.database.Database, "_write", lambda db, *args: writes.append(args))
+
+    with pytest.raises(inst.InstallError, match="No binary found when cache-only"):
+        installer.install()
+
+    assert installer.build_requests[0].pkg_id in installer.failed
+    assert not writes
+
+
+@pytest.mark.not_on_windows("Jobservers are POSIX only")
+def test_concurrent_builds_take_jobserver_tokens(install_mockery):
+    """Test that every concurrent build beyond the first one takes a jobserver token."""
+    installer = create_installer(["trivial-install-test-package"], {"concurrent_packages": 4})
+    installer.jobserver = spack.util.jobserver.JobServer(2)
+    try:
+        # The first build runs on the implicit job, the second one takes the only token
+        assert installer._can_start_build() and installer.jobserver_tokens == 0
+        installer.active_builds["first"] = None
+        assert installer._can_start_build() and installer.jobserver_tokens == 1
+        installer.active_builds["second"] = None
+        assert not installer._can_start_build()
+
+        installer.active_builds.clear()
+        installer._release_jobserver_tokens()
+        assert installer.jobserver_tokens == 0
+    finally:
+        installer.jobserver.close()
+
+
+def test_cooperative_install(install_mockery, mock_fetch, monkeypatch):
+    """Test that a cooperative installer defers the specs claimed by another
+    installer, and reports on the ones it installs."""
+    installer = create_installer(
+        ["dependent-install", "trivial-install-test-package"], {"cooperative": True}
+    )
+    queue = installer.work_queue
+    assert queue is spack.store.STORE.work_queue
+
+    # Another installer claims a spec, and abandons it once it is deferred
+    trivial = installer.build_requests[1].spec
+    other = spack.database.WorkQueue(spack.store.STORE.root, spack.store.STORE.prefix_locker, None)
+    other.worker = "other-node:1"
+    assert other.claim(trivial)
+
+    deferred = []
+    defer_claimed_task = installer._defer_claimed_task
+
+    def _defer(task, install_status):
+        deferred.append(task.pkg_id)
+        monkeypatch.setattr(queue, "grace", 0)
+        defer_claimed_task(task, install_status)
+
+    monkeypatch.setattr(installer, "_defer_claimed_task", _defer)
+
+    installer.install()
+
+    assert deferred == [installer.build_requests[1].pkg_id]
+    for request in installer.build_requests:
+        for s in request.spec.traverse():
+            assert s.installed
+
+    # The claims are dropped once the specs are installed
+    assert not queue.entries()
+    assert not queue.claimed
+
+
+def test_install_events(install_mockery, mock_fetch, tmpdir):
+    """Test that the installer and the build processes emit events to the stream."""
+    path = str(tmpdir.join("events.jsonl"))
+    installer = create_installer(["dependent-install"], {"events": path})
+
+    installer.install()
+
+    with open(path) as f:
+        events = [json.loads(line) for line in f]
+
+    pkg_id = installer.build_requests[0].pkg_id
+    mine = [e for e in events if e.get("package") == pkg_id]
+    kinds = [e["event"] for e in mine]
+    assert kinds[0] == "task_queued"
+    assert kinds.index("lock_acquired") < kinds.index("cache_miss") < kinds.index("installed")
+
+    # Build phases are reported by the build process
+    phases = [e for e in mine if e["event"] == "phase_end"]
+    assert {"stage", "install"} <= {e["phase"] for e in phases}
+    assert all(e["pid"] != os.getpid() for e in phases)
+    assert [e["time"] for e in events] == sorted(e["time"] for e in events)
+
+
+def test_critical_path_priority(install_mockery, mock_packages, tmpdir):
+    """Test that among ready tasks, the one at the start of the longest chain goes first."""
+    installer = create_installer(["a"], {})
+    installer.build_times = spack.build_times.BuildTimes(
+        spack.util.file_cache.FileCache(str(tmpdir))
+    )
+    for spec in installer.build_requests[0].spec.traverse():
+        installer.build_times.record(spec, 1000.0 if spec.name == "b" else 1.0)
+    installer.build_times.save()
+
+    installer._init_queue()
+
+    tasks = installer.build_tasks
+    ids = {task.pkg.name: pkg_id for pkg_id, task in tasks.items()}
+    assert tasks[ids["a"]].critical_path == 1.0
+    assert tasks[ids["b"]].critical_path == 1001.0
+
+    # The ETA is bound by the critical path
+    install_status = inst.InstallStatus(len(tasks), installer.estimates)
+    assert install_status.eta() >= 1001.0
+    assert "ETA" in install_status.get_progress()
+
+    # b is popped first, even though it was not necessarily queued first
+    assert installer._pop_task().pkg.name == "b"
+
+
+def test_estimate_duration_of_binaries(install_mockery, mock_packages, tmpdir, monkeypatch):
+    """Tasks trying the cache use the binary estimate when the spec is in the index."""
+    installer = create_installer(["a"], {})
+    installer.build_times = spack.build_times.BuildTimes(
+        spack.util.file_cache.FileCache(str(tmpdir))
+    )
+    spec = installer.build_requests[0].spec
+    installer.build_times.record(spec, 100.0)
+    installer.build_times.record(spec, 1.0, cache=True)
+    installer.build_times.save()
+    installer._init_queue()
+    task = next(t for t in installer.build_tasks.values() if t.pkg.name == "a")
+
+    # The spec is not in the binary index
+    assert installer._estimate_duration(task) == 100.0
+
+    monkeypatch.setattr(
+        spack.binary_distribution, "get_mirrors_for_spec", lambda spec, **kwargs: [spec]
+    )
+    assert installer._estimate_duration(task) == 1.0
+
+    task.use_cache = False
+    assert installer._estimate_duration(task) == 100.0
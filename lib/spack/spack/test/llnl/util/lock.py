@@ -47,6 +47,7 @@
 import getpass
 import glob
 import os
+import random
 import shutil
 import socket
 import stat
@@ -54,7 +55,7 @@
 import tempfile
 import traceback
 from contextlib import contextmanager
-from multiprocessing import Process, Queue
+from multiprocessing import Event, Process, Queue
 
 import pytest
 
@@ -230,6 +231,30 @@ def test_poll_interval_generator():
     assert intervals == [1] * 20 + [2] * 40 + [3] * 40
 
 
+def test_adaptive_poll_interval_generator():
+    interval_iter = iter(
+        lk.Lock._adaptive_poll_interval_generator(_bounds=(1, 50), _random=random.Random(0))
+    )
+    intervals = list(next(interval_iter) for i in range(100))
+    assert all(1 <= interval <= 50 for interval in intervals)
+    assert all(b <= 3 * a for a, b in zip(intervals, intervals[1:]))
+    assert max(intervals) == 50
+
+
+def test_set_polling(lock_path, monkeypatch):
+    monkeypatch.setattr(lk, "_polling", "fixed")
+    lk.set_polling("adaptive")
+    assert lk._polling == "adaptive"
+
+    # acquisitions work the same with either scheme
+    lock = lk.Lock(lock_path)
+    with lk.WriteTransaction(lock):
+        pass
+
+    with pytest.raises(ValueError, match="unknown lock polling scheme"):
+        lk.set_polling("random")
+
+
 def local_multiproc_test(*functions, **kwargs):
     """Order some processes using simple barrier synchronization."""
     b = mp.Barrier(len(functions), timeout=barrier_timeout)
@@ -1379,3 +1404,57 @@ def test_upgrade_read_fails(tmpdir):
         with pytest.raises(lk.LockUpgradeError, match=msg):
             lock.upgrade_read_to_write()
         lock.release_write()
+
+
+@pytest.fixture()
+def lock_statistics():
+    statistics = lk.enable_statistics()
+    yield statistics
+    lk.disable_statistics()
+
+
+def test_lock_statistics(lock_path, lock_statistics):
+    lock = lk.Lock(lock_path, desc="test")
+    with lk.ReadTransaction(lock):
+        lock.upgrade_read_to_write()
+        lock.downgrade_write_to_read()
+
+    record = lock_statistics.locks[(lock_path, 0, 0)]
+    assert record.desc == "test"
+    assert (record.acquired, record.attempts, record.contended) == (3, 3, 0)
+    assert record.hold_time == record.max_hold_time > 0
+    assert not record.holders
+
+    report = lock_statistics.report()
+    assert report[0] == f"{lock_path}[0:0] (test)"
+    assert "acquired 3 times, 0 contended" in report[1]
+
+
+def _hold_write_lock(lock_path, locked, done):
+    lock = lk.Lock(lock_path)
+    with lk.WriteTransaction(lock):
+        locked.set()
+        done.wait(barrier_timeout)
+
+
+def test_lock_statistics_record_holders(lock_path, lock_statistics):
+    """Contended acquisitions record the pid and host of the process holding the lock."""
+    locked, done = Event(), Event()
+    holder = Process(target=_hold_write_lock, args=(lock_path, locked, done))
+    holder.start()
+    try:
+        assert locked.wait(barrier_timeout)
+        lock = lk.Lock(lock_path)
+        with pytest.raises(lk.LockTimeoutError):
+            lock.acquire_read(timeout=0.2)
+    finally:
+        done.set()
+        holder.join()
+
+    with lk.ReadTransaction(lock):
+        pass
+
+    record = lock_statistics.locks[(lock_path, 0, 0)]
+    assert (record.acquired, record.contended, record.timeouts) == (1, 1, 1)
+    assert record.attempts > 2 and record.wait_time >= 0.2
+    assert record.holders == {f"{holder.pid}@{socket.gethostname()}": 1}
@@ -0,0 +1,87 @@
+# Copyright 2013-2024 Lawrence Livermore National Security, LLC and other
+# Spack Project Developers. See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+import pytest
+
+import spack.caches
+import spack.config
+import spack.spec
+import spack.util.file_cache
+from spack.solver import asp, fact_cache
+
+pytestmark = pytest.mark.usefixtures("mutable_config", "mock_packages")
+
+
+@pytest.fixture()
+def package_facts(tmpdir, monkeypatch):
+    cache = spack.util.file_cache.FileCache(str(tmpdir.join("cache")))
+    monkeypatch.setattr(spack.caches, "MISC_CACHE", cache)
+    spack.config.set("concretizer:cache_package_facts", True)
+    return cache
+
+
+def test_fact_block_ids_are_relative():
+    base = fact_cache.ID_BASE
+    text = (
+        f"pkg_fact(a,condition({base})).\n"
+        f'condition_reason({base},"version 2000000001 of a").\n'
+        f'pkg_fact(a,conflict({base + 1},{base},"a")).\n'
+    )
+    block = fact_cache.FactBlock.from_text(
+        text,
+        count=2,
+        version_constraints=[],
+        target_constraints=[],
+        compiler_version_constraints=[],
+        variant_values=[],
+    )
+    assert block.ids == [0, 0, 1, 0]
+    assert block.text(base) == text
+    assert block.text(7) == (
+        "pkg_fact(a,condition(7)).\n"
+        'condition_reason(7,"version 2000000001 of a").\n'
+        'pkg_fact(a,conflict(8,7,"a")).\n'
+    )
+
+
+def _setup(specs, tests=False):
+    driver = asp.SpackSolverSetup(tests=tests)
+    program = driver.setup([spack.spec.Spec(s) for s in specs])
+    return driver, program
+
+
+@pytest.mark.only_clingo("Original concretizer does not set up facts")
+@pytest.mark.parametrize("specs", [["mpileaks"], ["conflict%clang", "dt-diamond"]])
+def test_cached_package_facts_give_same_solutions(specs, package_facts):
+    with spack.config.override("concretizer:cache_package_facts", False):
+        result = asp.Solver().solve([spack.spec.Spec(x) for x in specs])
+        expected = [s.dag_hash() for s in result.specs]
+
+    # The first setup generates the facts, the second one reads them from the cache
+    driver, first = _setup(specs)
+    assert driver.package_facts.hits == 0 and driver.package_facts.misses > 0
+    driver, second = _setup(specs)
+    assert driver.package_facts.hits > 0 and driver.package_facts.misses == 0
+    assert first == second
+
+    solver = asp.Solver()
+    result = solver.solve([spack.spec.Spec(x) for x in specs])
+    assert [s.dag_hash() for s in result.specs] == expected
+
+
+@pytest.mark.only_clingo("Original concretizer does not set up facts")
+def test_cached_package_facts_are_invalidated(package_facts, monkeypatch):
+    driver, _ = _setup(["mpileaks"])
+    misses = driver.package_facts.misses
+
+    # Test dependencies change the facts of every package
+    driver, _ = _setup(["mpileaks"], tests=True)
+    assert driver.package_facts.hits == 0 and driver.package_facts.misses == misses
+
+    # Only the package whose class changed is generated again
+    monkeypatch.setattr(asp, "class_digest", lambda cls: cls.name)
+    _setup(["mpileaks"])
+    monkeypatch.setattr(asp, "class_digest", lambda cls: cls.name.replace("callpath", "changed"))
+    driver, _ = _setup(["mpileaks"])
+    assert driver.package_facts.hits == misses - 1 and driver.package_facts.misses == 1
@@ -0,0 +1,60 @@
+# Copyright 2013-2024 Lawrence Livermore National Security, LLC and other
+# Spack Project Developers. See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+import pytest
+
+import spack.spec
+from spack.solver import asp
+
+pytestmark = [
+    pytest.mark.usefixtures("mutable_config", "mock_packages"),
+    pytest.mark.only_clingo("Original concretizer does not support multi-shot solves"),
+]
+
+
+@pytest.mark.parametrize(
+    "specs",
+    [
+        ["mpileaks", "mpileaks ^mpich", "mpileaks ^zmpi", "mpileaks+debug"],
+        ["callpath ^mpich", "callpath ^zmpi", "callpath"],
+    ],
+)
+def test_solve_separately_gives_same_solutions(specs):
+    expected = [asp.Solver().solve([spack.spec.Spec(x)]).specs[0].dag_hash() for x in specs]
+    results = list(asp.Solver().solve_separately([spack.spec.Spec(x) for x in specs]))
+    assert all(result is not None for result in results)
+    assert [result.specs[0].dag_hash() for result in results] == expected
+
+
+def test_solve_separately_groups_specs_by_problem():
+    specs = ["mpileaks ^mpich", "libelf", "mpileaks ^zmpi", "dt-diamond", "mpileaks%clang"]
+    keys = [asp.shared_problem_key(spack.spec.Spec(x)) for x in specs]
+    assert keys[0] == keys[2] and len(set(keys)) == 4
+
+    # Only the specs leading to the same problem are solved together
+    results = list(asp.Solver().solve_separately([spack.spec.Spec(x) for x in specs]))
+    assert [result is not None for result in results] == [True, False, True, False, False]
+    for x, result in zip(specs, results):
+        if result is not None:
+            expected = asp.Solver().solve([spack.spec.Spec(x)]).specs[0]
+            assert result.specs[0].dag_hash() == expected.dag_hash()
+
+    # Specs with concrete nodes cannot share a problem
+    concrete = spack.spec.Spec("libelf").concretized()
+    assert asp.shared_problem_key(spack.spec.Spec(f"libdwarf ^/{concrete.dag_hash()}")) is None
+    assert asp.shared_problem_key(concrete) is None
+
+
+def test_solve_separately_falls_back():
+    # A single spec is not worth a shared problem
+    assert list(asp.Solver().solve_separately([spack.spec.Spec("libelf")])) == [None]
+
+    # Ad hoc versions are known to every solve of the shared problem
+    specs = [spack.spec.Spec("libelf@=0.8.100"), spack.spec.Spec("libelf")]
+    assert list(asp.Solver().solve_separately(specs)) == [None, None]
+
+    # Unsatisfiable specs are left to a solve on their own, for its error messages
+    specs = [spack.spec.Spec("conflict%clang+foo"), spack.spec.Spec("conflict%clang")]
+    results = list(asp.Solver().solve_separately(specs))
+    assert results[0] is None and results[1].specs[0].satisfies("conflict%clang")
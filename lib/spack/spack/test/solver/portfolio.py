@@ -0,0 +1,56 @@
+# Copyright 2013-2024 Lawrence Livermore National Security, LLC and other
+# Spack Project Developers. See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+import pytest
+
+import spack.config
+import spack.spec
+from spack.solver import asp
+
+pytestmark = [
+    pytest.mark.usefixtures("mutable_config", "mock_packages"),
+    pytest.mark.only_clingo("Original concretizer does not support a solver portfolio"),
+]
+
+
+@pytest.mark.parametrize(
+    "portfolio,expected",
+    [
+        (False, {}),
+        (True, asp.DEFAULT_PORTFOLIO),
+        ({"bb": "--opt-strategy=bb,hier"}, {"bb": "--opt-strategy=bb,hier"}),
+    ],
+)
+def test_portfolio_from_config(portfolio, expected):
+    spack.config.set("concretizer:portfolio", portfolio)
+    assert asp.portfolio_from_config() == expected
+
+
+def test_portfolio_clingo_control():
+    control = asp.portfolio_clingo_control(asp.DEFAULT_PORTFOLIO)
+    solvers = control.configuration.solver
+    assert len(solvers) == len(asp.DEFAULT_PORTFOLIO)
+    assert [solvers[i].opt_strategy for i in range(len(solvers))] == [
+        "usc,one",
+        "bb,hier",
+        "usc,one",
+        "bb,hier",
+    ]
+
+    with pytest.raises(spack.config.ConfigError, match="invalid solver portfolio"):
+        asp.portfolio_clingo_control({"bad": "--no-such-option"})
+
+
+@pytest.mark.parametrize("spec_str", ["mpileaks", "dt-diamond", "conflict-parent%clang"])
+def test_portfolio_gives_optimal_solutions(spec_str):
+    """Configurations may break ties between optimal solutions differently, so only the
+    criteria of the solutions are compared."""
+    expected = asp.Solver().solve([spack.spec.Spec(spec_str)])
+    assert expected.portfolio_winner is None
+
+    spack.config.set("concretizer:portfolio", True)
+    result = asp.Solver().solve([spack.spec.Spec(spec_str)])
+    assert result.portfolio_winner in asp.DEFAULT_PORTFOLIO
+    assert result.criteria == expected.criteria
+    assert result.specs[0].satisfies(spec_str)
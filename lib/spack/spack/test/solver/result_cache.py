@@ -0,0 +1,108 @@
+# Copyright 2013-2024 Lawrence Livermore National Security, LLC and other
+# Spack Project Developers. See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+import os
+import shutil
+
+import pytest
+
+import spack.caches
+import spack.config
+import spack.repo
+import spack.spec
+import spack.util.file_cache
+from spack.solver import asp, result_cache
+
+pytestmark = [
+    pytest.mark.usefixtures("mutable_config", "mock_packages"),
+    pytest.mark.only_clingo("Original concretizer does not cache results"),
+]
+
+
+@pytest.fixture()
+def results(tmpdir, monkeypatch):
+    cache = spack.util.file_cache.FileCache(str(tmpdir.join("cache")))
+    monkeypatch.setattr(spack.caches, "MISC_CACHE", cache)
+    spack.config.set("concretizer:result_cache", True)
+    return cache
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("the problem must not be solved again")
+
+
+@pytest.mark.parametrize("specs", [["mpileaks"], ["mpileaks ^zmpi", "dt-diamond"], ["mpi"]])
+def test_cached_results_are_returned(specs, results, monkeypatch):
+    solver = asp.Solver()
+    expected = solver.solve([spack.spec.Spec(x) for x in specs])
+    assert solver.results.misses == 1
+
+    solver = asp.Solver()
+    monkeypatch.setattr(solver.driver, "solve", _fail)
+    result = solver.solve([spack.spec.Spec(x) for x in specs])
+    assert solver.results.hits == 1
+    assert [s.dag_hash() for s in result.specs] == [s.dag_hash() for s in expected.specs]
+    assert result.criteria == expected.criteria
+    assert all(s.concrete for s in result.specs)
+
+
+def test_result_key_changes():
+    specs = [spack.spec.Spec("mpileaks")]
+    key = result_cache.result_key(specs, [])
+    assert result_cache.result_key([spack.spec.Spec("mpileaks")], []) == key
+    assert result_cache.result_key(specs, [], tests=True) != key
+    assert result_cache.result_key(specs, [], allow_deprecated=True) != key
+    assert result_cache.result_key([spack.spec.Spec("mpileaks ^builtin.mock.mpich")], []) != (
+        result_cache.result_key([spack.spec.Spec("mpileaks ^mpich")], [])
+    )
+
+    reusable = spack.spec.Spec("libelf").concretized()
+    assert result_cache.result_key(specs, [reusable]) != key
+
+    spack.config.set("packages:all:providers:mpi", ["zmpi"])
+    assert result_cache.result_key(specs, []) != key
+
+
+def test_editing_a_patch_misses_the_cache(results, tmpdir, mock_repo_path):
+    """Patches are part of concrete specs, so editing one invalidates the results."""
+    repo_dir = tmpdir.join("repo")
+    repo_dir.join("repo.yaml").write("repo:\n  namespace: patched\n", ensure=True)
+    shutil.copytree(
+        os.path.join(mock_repo_path.root, "packages", "patch"),
+        str(repo_dir.join("packages", "patch")),
+    )
+    specs = [spack.spec.Spec("patched.patch")]
+
+    with spack.repo.use_repositories(str(repo_dir), mock_repo_path.root):
+        asp.Solver().solve(specs)
+        cache = result_cache.ResultCache()
+        assert cache.get(result_cache.result_key(specs, [])) is not None
+
+        repo_dir.join("packages", "patch", "foo.patch").write("edited\n", mode="a")
+        assert cache.get(result_cache.result_key(specs, [])) is None
+
+
+def test_code_digest_covers_directives_and_build_systems(monkeypatch):
+    files = []
+    monkeypatch.setattr(
+        result_cache, "file_digest", lambda path: files.append(os.path.basename(path)) or ""
+    )
+    result_cache.code_digest()
+    assert {"asp.py", "concretize.lp", "directives.py", "variant.py", "autotools.py"} <= set(files)
+
+
+def test_least_recently_used_results_are_removed(results):
+    cache = result_cache.ResultCache(size=2)
+    for i, key in enumerate(("a", "b", "c")):
+        cache.put(key, {"specs": [key]})
+        os.utime(cache._path(key), (i, i))
+    assert cache.get("a") is None
+    assert cache.get("b") == {"specs": ["b"]}
+
+    # Reading "b" makes "c" the least recently used result
+    os.utime(cache._path("c"), (10, 10))
+    os.utime(cache._path("b"), (20, 20))
+    cache.put("d", {"specs": ["d"]})
+    assert cache.get("c") is None
+    assert cache.get("b") is not None and cache.get("d") is not None
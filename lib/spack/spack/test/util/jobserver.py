@@ -0,0 +1,86 @@
+# Copyright 2013-2024 Lawrence Livermore National Security, LLC and other
+# Spack Project Developers. See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+
+import os
+import sys
+
+import pytest
+
+import spack.build_environment
+import spack.util.executable
+import spack.util.jobserver
+
+pytestmark = pytest.mark.not_on_windows("Jobservers are POSIX only")
+
+
+def test_jobserver_tokens():
+    server = spack.util.jobserver.JobServer(3)
+    try:
+        # One job is implicit, so only two tokens can be taken
+        assert server.acquire()
+        assert server.acquire()
+        assert not server.acquire()
+
+        server.release()
+        assert server.acquire()
+    finally:
+        server.close()
+
+    assert not os.path.exists(server.path)
+
+
+def test_jobserver_needs_one_job():
+    with pytest.raises(ValueError):
+        spack.util.jobserver.JobServer(0)
+
+
+def test_jobserver_makeflags(monkeypatch):
+    monkeypatch.setenv("MAKEFLAGS", "-k")
+
+    with spack.util.jobserver.jobserver(4) as server:
+        assert spack.build_environment.jobserver_enabled()
+        assert os.environ["MAKEFLAGS"].startswith("-k")
+        assert f"--jobserver-auth={server.r},{server.w}" in os.environ["MAKEFLAGS"]
+        assert os.get_inheritable(server.r) and os.get_inheritable(server.w)
+
+    assert os.environ["MAKEFLAGS"] == "-k"
+
+
+def test_jobserver_clients_get_blocking_read_end():
+    """Clients block on the read end they are handed over, while acquire() does not."""
+    server = spack.util.jobserver.JobServer(1)
+    try:
+        assert os.get_blocking(server.r)
+        assert not server.acquire()
+    finally:
+        server.close()
+
+
+def test_jobserver_inherited(monkeypatch):
+    monkeypatch.setenv("MAKEFLAGS", "--jobserver-auth=3,4")
+
+    with spack.util.jobserver.jobserver(4) as server:
+        assert server is None
+        assert os.environ["MAKEFLAGS"] == "--jobserver-auth=3,4"
+
+
+@pytest.mark.skipif(sys.platform == "darwin", reason="GNU make is not guaranteed on macOS")
+def test_jobserver_limits_make_jobs(tmpdir):
+    """Two make processes sharing the jobserver never run more jobs than its budget."""
+    make = spack.util.executable.which("make")
+    if not make:
+        pytest.skip("GNU make is required")
+
+    makefile = tmpdir.join("Makefile")
+    makefile.write("all: a b c d\na b c d:\n\t@echo start >> log; sleep 0.2; echo stop >> log\n")
+
+    with tmpdir.as_cwd(), spack.util.jobserver.jobserver(2):
+        make("-s", "-f", str(makefile), output=str, error=str)
+
+    running, most = 0, 0
+    for line in tmpdir.join("log").read().split():
+        running += 1 if line == "start" else -1
+        most = max(running, most)
+    assert most == 2
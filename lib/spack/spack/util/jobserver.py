@@ -0,0 +1,115 @@
+# Copyright 2013-2024 Lawrence Livermore National Security, LLC and other
+# Spack Project Developers. See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: (Apache-2.0 OR MIT)
+"""POSIX jobserver owned by Spack, to share a budget of jobs among concurrent builds.
+
+A jobserver is a pipe holding one byte (a "token") per job that may run in
+addition to the one every client is implicitly allowed to run. GNU make and
+other jobserver clients read a token before starting an extra job, and write
+it back when the job is done. Clients find the jobserver through ``MAKEFLAGS``.
+
+Spack backs the pipe with a named FIFO, so that any process, and not only the
+children of Spack, can open it, and hands it over to build processes as a pair
+of inherited file descriptors. GNU make understands this form since 3.78, as
+``--jobserver-fds`` before 4.2 and as ``--jobserver-auth`` since then. GNU make 4.4
+and later still accept it, although the jobservers they create are ``fifo:`` based.
+"""
+import contextlib
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+import llnl.util.tty as tty
+
+#: Byte written to, and read from, the jobserver for each token
+TOKEN = b"+"
+
+
+class JobServer:
+    """A FIFO-based jobserver handing out ``num_jobs - 1`` tokens.
+
+    Since every client of the jobserver can always run one job without a token,
+    the owner of the jobserver must take a token itself for every client it runs
+    beyond the first one, to keep the total number of jobs within ``num_jobs``.
+    """
+
+    def __init__(self, num_jobs: int):
+        if num_jobs < 1:
+            raise ValueError(f"a jobserver needs at least one job, not {num_jobs}")
+
+        self.num_jobs = num_jobs
+        self._tmpdir = tempfile.mkdtemp(prefix="spack-jobserver-")
+        self.path = os.path.join(self._tmpdir, "fifo")
+        os.mkfifo(self.path, 0o600)
+
+        # Open a non-blocking read end first, so that opening does not wait for a
+        # writer, then the write end. The non-blocking read end is only used by
+        # acquire() in this process: clients expect a blocking read end, so they
+        # are handed over another one, opened once the FIFO has a writer.
+        self._nonblocking_r = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
+        self.w = os.open(self.path, os.O_WRONLY)
+        self.r = os.open(self.path, os.O_RDONLY)
+        os.set_inheritable(self.r, True)
+        os.set_inheritable(self.w, True)
+
+        os.write(self.w, TOKEN * (num_jobs - 1))
+        tty.debug(f"Started a jobserver with {num_jobs} jobs at {self.path}")
+
+    @property
+    def makeflags(self) -> str:
+        """Value of ``MAKEFLAGS`` pointing jobserver clients to this jobserver."""
+        # --jobserver-fds is understood by GNU make < 4.2, --jobserver-auth by later versions
+        return f" -j --jobserver-fds={self.r},{self.w} --jobserver-auth={self.r},{self.w}"
+
+    def acquire(self) -> bool:
+        """Take a token without blocking.
+
+        Returns:
+            ``True`` if a token was taken, ``False`` if none is available
+        """
+        try:
+            return len(os.read(self._nonblocking_r, 1)) == 1
+        except BlockingIOError:
+            return False
+
+    def release(self) -> None:
+        """Return a token previously taken with :meth:`acquire`."""
+        os.write(self.w, TOKEN)
+
+    def close(self) -> None:
+        """Close all the ends of the jobserver and remove the FIFO."""
+        for fd in (self._nonblocking_r, self.r, self.w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def jobserver(num_jobs: int):
+    """Context manager running a jobserver, advertised to child processes through
+    ``MAKEFLAGS`` while the context is active.
+
+    Yields:
+        the jobserver, or ``None`` if a jobserver was inherited from a parent process
+        (e.g. from ``make`` when installing through ``spack env depfile``), which then
+        keeps being the one shared by the builds
+    """
+    if "MAKEFLAGS" in os.environ and "--jobserver" in os.environ["MAKEFLAGS"]:
+        yield None
+        return
+
+    server = JobServer(num_jobs)
+    old_makeflags: Optional[str] = os.environ.get("MAKEFLAGS")
+    os.environ["MAKEFLAGS"] = (old_makeflags or "") + server.makeflags
+    try:
+        yield server
+    finally:
+        if old_makeflags is None:
+            os.environ.pop("MAKEFLAGS", None)
+        else:
+            os.environ["MAKEFLAGS"] = old_makeflags
+        server.close()
@@ -4,12 +4,14 @@
 # SPDX-License-Identifier: (Apache-2.0 OR MIT)
 
 """Wrapper for ``llnl.util.lock`` allows locking to be enabled/disabled."""
+import atexit
 import os
 import stat
 import sys
 from typing import Optional, Tuple
 
 import llnl.util.lock
+import llnl.util.tty as tty
 
 # import some llnl.util.lock names as though they're part of spack.util.lock
 from llnl.util.lock import LockError  # noqa: F401
@@ -17,6 +19,7 @@
 from llnl.util.lock import LockUpgradeError  # noqa: F401
 from llnl.util.lock import ReadTransaction  # noqa: F401
 from llnl.util.lock import WriteTransaction  # noqa: F401
+from llnl.util.lock import set_polling  # noqa: F401
 
 import spack.error
 import spack.paths
@@ -101,3 +104,17 @@ def check_lock_safety(path: str) -> None:
                 f"restrict permissions on {path} or enable locks."
             )
             raise spack.error.SpackError(msg, long_msg)
+
+
+def report_statistics_at_exit() -> None:
+    """Record statistics on the locks taken by this process, and print them to stderr
+    when it exits."""
+    statistics = llnl.util.lock.enable_statistics()
+    atexit.register(_print_statistics, statistics, os.getpid())
+
+
+def _print_statistics(statistics: llnl.util.lock.LockStatistics, pid: int) -> None:
+    # forked processes inherit the statistics of their parent
+    if os.getpid() != pid or not statistics.locks:
+        return
+    tty.info(f"Lock statistics of process {pid}", *statistics.report(), stream=sys.stderr)